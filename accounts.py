@@ -0,0 +1,69 @@
+import os, re, json, multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import store
+import metrics
+import manifest
+
+# ========= Mehrere Konten / Sub-Accounts =========
+# MEXC_ACCOUNTS (JSON) oder MEXC_ACCOUNTS_FILE (Pfad zu derselben JSON-Datei):
+#   [{"name": "main", "key": "...", "secret": "..."}, ...]
+# Jedes Konto läuft in einem eigenen Prozess mit eigenem Store (data/trades_<name>.sqlite);
+# Markets- und OHLCV-Cache werden geteilt. Die Wandzeit liegt so beim langsamsten Konto
+# statt bei der Summe. Ohne Liste gilt wie bisher das einzelne Key-Paar.
+ACCOUNT_WORKERS = int(os.getenv("ACCOUNT_WORKERS", "0"))   # 0 = ein Prozess je Konto
+
+def _name(raw, i):
+    name = re.sub(r"[^A-Za-z0-9_-]+", "_", str(raw or "")).strip("_")
+    return name or f"acc{i}"
+
+def load(default_key="", default_secret=""):
+    """Konten aus MEXC_ACCOUNTS/MEXC_ACCOUNTS_FILE; sonst das Einzel-Paar (oder leer)."""
+    raw = os.getenv("MEXC_ACCOUNTS", "").strip()
+    path = os.getenv("MEXC_ACCOUNTS_FILE", "")
+    if not raw and path:
+        with open(path, encoding="utf-8") as f:
+            raw = f.read()
+    if not raw:
+        if default_key and default_secret:
+            return [{"name": "main", "key": default_key, "secret": default_secret}]
+        return []
+    out, seen = [], set()
+    for i, a in enumerate(json.loads(raw)):
+        if not a.get("key") or not a.get("secret"):
+            raise ValueError(f"Konto {i}: 'key' und 'secret' fehlen")
+        name = _name(a.get("name"), i)
+        if name in seen:
+            raise ValueError(f"Konto-Name doppelt: {name}")
+        seen.add(name)
+        out.append({"name": name, "key": a["key"], "secret": a["secret"]})
+    return out
+
+def store_path(name):
+    """Eigener Trade-Store je Konto neben dem Standard-Store."""
+    return os.path.join(os.path.dirname(store.STORE_PATH), f"trades_{name}.sqlite")
+
+def manifest_path(name):
+    """Eigenes Ausgabe-Manifest je Konto (Kindprozesse schreiben parallel)."""
+    return os.path.join(os.path.dirname(manifest.MANIFEST_PATH), f"manifest_{name}.json")
+
+def fan_out(fn, accounts, *args, workers=None):
+    """fn(konto, *args) je Konto in einem Prozess-Pool -> {Name: Ergebnis}.
+
+    Fehler eines Kontos brechen die anderen nicht ab (gezählt in metrics.json).
+    Unter Linux per fork: Kindprozesse erben bereits geladene Märkte und Module.
+    """
+    if not accounts:
+        return {}
+    workers = min(workers or ACCOUNT_WORKERS or len(accounts), len(accounts))
+    ctx = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        futures = {a["name"]: pool.submit(fn, a, *args) for a in accounts}
+        for name, fut in futures.items():
+            try:
+                results[name] = fut.result()
+            except Exception as e:
+                metrics.add_error(e)
+                print(f"Konto {name} fehlgeschlagen: {type(e).__name__}: {e}")
+    return results
@@ -0,0 +1,77 @@
+"""Mehrere Konten: nacheinander vs. parallel (accounts.fan_out) gegen die MEXC-Attrappe.
+
+Jedes Konto bekommt ein eigenes synthetisches Konto (bench/fake_exchange.py) mit
+simulierter Latenz; gemessen wird die Wandzeit der Pipeline je Konto
+und die des Prozess-Pools inklusive Gesamtansicht.
+
+    python bench/bench_accounts.py
+    BENCH_ACCOUNTS=8 BENCH_LATENCY_MS=50 python bench/bench_accounts.py
+"""
+import os, sys, time, tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+N_ACCOUNTS   = int(os.getenv("BENCH_ACCOUNTS", "4"))
+N_SYMBOLS    = int(os.getenv("BENCH_SYMBOLS", "100"))
+BENCH_DAYS   = int(os.getenv("BENCH_DAYS", "14"))
+LATENCY_MS   = float(os.getenv("BENCH_LATENCY_MS", "30"))
+
+TMP = tempfile.mkdtemp(prefix="bench_accounts_")
+os.environ["OUTDIR"] = os.path.join(TMP, "site")
+os.environ["OHLCV_DIR"] = os.path.join(TMP, "ohlcv")
+os.environ["STORE_PATH"] = os.path.join(TMP, "trades.sqlite")
+os.environ.setdefault("DAYS", str(BENCH_DAYS))
+# EUR-Kurse aus dem EUR/USDT-Paar der Attrappe (fx.py, Quelle "exchange")
+os.environ["FX_PATH"] = os.path.join(TMP, "fx_eur.json")
+os.environ["FX_SOURCES"] = "exchange"
+os.environ["MANIFEST_PATH"] = os.path.join(TMP, "manifest.json")
+
+import accounts
+import exchange
+import fetch_async
+import pipeline
+from fake_exchange import FakeMexcSync, generate_book
+
+END_MS = int(time.time() * 1000)
+# ein Konto je Key; der Seed macht die Konten verschieden, aber reproduzierbar
+FAKES = {}
+for i in range(N_ACCOUNTS):
+    book, balance, prices = generate_book(N_SYMBOLS, 20, BENCH_DAYS, end_ms=END_MS, seed=i)
+    prices["EUR/USDT"] = 1.08
+    FAKES[f"key{i}"] = FakeMexcSync(book, latency=LATENCY_MS / 1000, balance=balance, prices=prices)
+
+exchange.get_exchange = lambda default_type="spot", api_key="", secret="": FAKES.get(api_key, FAKES["key0"])
+fetch_async.make_async_ex = lambda ex: ex.aio
+
+def fresh():
+    """Stores und Manifeste leeren, damit jeder Durchgang alle Fills holt und alles schreibt."""
+    for a in ACCOUNTS:
+        for path in (accounts.store_path(a["name"]), accounts.manifest_path(a["name"])):
+            if os.path.exists(path):
+                os.remove(path)
+
+TARGETS = ("csv", "html")
+ACCOUNTS = [{"name": f"acc{i}", "key": f"key{i}", "secret": "s"} for i in range(N_ACCOUNTS)]
+
+def main():
+    fresh()
+    t0 = time.perf_counter()
+    single = []
+    for a in ACCOUNTS:
+        t1 = time.perf_counter()
+        pipeline._account_job(a, TARGETS, pipeline.OUTDIR, 0.92, True)
+        single.append(time.perf_counter() - t1)
+    seq = time.perf_counter() - t0
+
+    fresh()
+    t0 = time.perf_counter()
+    pipeline.run_multi(ACCOUNTS, TARGETS)
+    par = time.perf_counter() - t0
+
+    print(f"Konten={N_ACCOUNTS} Symbole={N_SYMBOLS} Latenz={LATENCY_MS:.0f}ms")
+    print(f"nacheinander   {seq:7.2f}s  (langsamstes Konto {max(single):.2f}s)")
+    print(f"parallel       {par:7.2f}s  -> {pipeline.OUTDIR}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""df_from_trades: alte Dict-je-Trade-Version vs. spaltenweiser Aufbau (Zeit + Speicher).
+
+    python bench/bench_df.py             # 500k synthetische ccxt-Trades
+    BENCH_TRADES=100000 python bench/bench_df.py
+"""
+import os, sys, time, random, tracemalloc, datetime as dt
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from normalize import df_from_trades
+
+N_TRADES = int(os.getenv("BENCH_TRADES", "500000"))
+
+def synth_ccxt_trades(n, n_symbols=300, copy_share=0.2, seed=0):
+    """n ccxt-Trade-Dicts mit realistischem 'info' (ein Teil mit Copytrade-Feldern)."""
+    rnd = random.Random(seed)
+    start = 1_700_000_000_000
+    out = []
+    for i in range(n):
+        price = rnd.uniform(0.01, 50000.0)
+        amount = rnd.uniform(0.001, 10.0)
+        info = {"symbol": "X", "id": str(i), "orderId": str(i), "price": str(price), "qty": str(amount),
+                "commission": "0.1", "commissionAsset": "USDT", "time": start + i, "isBuyer": True,
+                "isMaker": False, "isBestMatch": None, "isSelfTrade": None, "clientOrderId": None}
+        if rnd.random() < copy_share:
+            info["traderId"] = rnd.randrange(50)
+        out.append({
+            "id": str(i), "order": str(i), "info": info,
+            "timestamp": start + i * 60000, "datetime": None,
+            "symbol": f"C{rnd.randrange(n_symbols)}/USDT", "type": None,
+            "side": "buy" if rnd.random() < 0.5 else "sell", "takerOrMaker": "taker",
+            "price": price, "amount": amount, "cost": price * amount,
+            "fee": {"cost": price * amount * 0.001, "currency": "USDT"}, "fees": [],
+        })
+    return out
+
+def legacy_df_from_trades(trades):
+    """Bisherige Implementierung (ein Dict pro Trade, wiederholte 'in'-Prüfungen)."""
+    rows = []
+    for t in trades:
+        ts = t.get("timestamp")
+        dat = dt.datetime.utcfromtimestamp(ts/1000).date().isoformat() if ts else None
+        fee = t.get("fee") or {}
+        info = t.get("info") or {}
+        is_copy = False
+        copy_trader = None
+        for k in ("copy", "isCopy", "copyFlag", "strategyId", "traderId", "leaderId", "followerId", "followId"):
+            if k in info:
+                is_copy = True
+        for k in ("traderId","leaderId","strategyId","strategyName","leaderName","traderName"):
+            if k in info:
+                copy_trader = str(info.get(k))
+                break
+        rows.append({
+            "date": dat, "symbol": t.get("symbol"), "side": (t.get("side") or "").lower(),
+            "price": float(t.get("price") or 0.0), "amount": float(t.get("amount") or 0.0),
+            "cost": float(t.get("cost") or 0.0), "fee_cost": float((fee.get("cost") or 0.0)),
+            "fee_ccy": (fee.get("currency") or "").upper(), "is_copy": is_copy, "copy_trader": copy_trader,
+        })
+    return pd.DataFrame(rows)
+
+def measure(fn, trades):
+    t0 = time.perf_counter()
+    df = fn(trades)
+    secs = time.perf_counter() - t0
+    tracemalloc.start()
+    fn(trades)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, secs, peak, df.memory_usage(deep=True).sum()
+
+if __name__ == "__main__":
+    trades = synth_ccxt_trades(N_TRADES)
+    old, t_old, p_old, m_old = measure(legacy_df_from_trades, trades)
+    new, t_new, p_new, m_new = measure(df_from_trades, trades)
+    assert (old["date"].values == new["date"].astype(object).values).all()
+    assert old["is_copy"].sum() == new["is_copy"].sum()
+
+    print(f"trades: {N_TRADES:,}")
+    print(f"{'':10} {'Zeit':>8} {'trades/s':>12} {'Peak (MB)':>10} {'DataFrame (MB)':>15}")
+    for name, t, p, m in (("alt", t_old, p_old, m_old), ("spalten", t_new, p_new, m_new)):
+        print(f"{name:10} {t:7.2f}s {N_TRADES / t:12,.0f} {p / 2**20:10.1f} {m / 2**20:15.1f}")
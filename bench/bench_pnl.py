@@ -0,0 +1,74 @@
+"""Durchsatz der PnL-Berechnung: alte iterrows-Schleife vs. vektorisierte Version + FIFO-Engine.
+
+    python bench/bench_pnl.py            # 1M synthetische Trades
+    BENCH_TRADES=200000 python bench/bench_pnl.py
+"""
+import os, sys, time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pnl
+import positions
+
+N_TRADES = int(os.getenv("BENCH_TRADES", "1000000"))
+# die alte Schleife ist ~1000x langsamer -> nur auf einer Stichprobe messen und hochrechnen
+N_LEGACY = int(os.getenv("BENCH_LEGACY_TRADES", "20000"))
+
+def synth_frame(n, n_symbols=300, days=365, seed=0):
+    """DataFrame im Format von df_from_trades mit n zufälligen Fills."""
+    rng = np.random.default_rng(seed)
+    start = 1_700_000_000_000
+    ts = np.sort(rng.integers(start, start + days * 86400000, n))
+    price = rng.uniform(0.01, 50000.0, n)
+    amount = rng.uniform(0.001, 10.0, n)
+    cost = price * amount
+    return pd.DataFrame({
+        "date": pd.to_datetime(ts, unit="ms").strftime("%Y-%m-%d"),
+        "timestamp": ts,
+        "symbol": pd.Categorical.from_codes(rng.integers(0, n_symbols, n),
+                                            [f"C{i}/USDT" for i in range(n_symbols)]),
+        "side": np.where(rng.random(n) < 0.5, "buy", "sell"),
+        "price": price,
+        "amount": amount,
+        "cost": cost,
+        "fee_cost": cost * 0.001,
+        "fee_ccy": np.where(rng.random(n) < 0.9, "USDT", "MX"),
+        "is_copy": rng.random(n) < 0.2,
+        "copy_trader": np.where(rng.random(n) < 0.2, rng.integers(0, 50, n).astype(str), None),
+    })
+
+def legacy_pnl_daily(df):
+    """Bisherige Implementierung aus dashboard.py (Referenz)."""
+    cf = []
+    for _, r in df.iterrows():
+        cash = r["cost"] if r["side"] == "sell" else -r["cost"]
+        if r["fee_ccy"] in ("USDT", "USD"):
+            cash -= r["fee_cost"]
+        cf.append({"date": r["date"], "pnl_usdt": cash})
+    return pd.DataFrame(cf).groupby("date", as_index=False).sum().sort_values("date")
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    res = fn(*args)
+    return res, time.perf_counter() - t0
+
+if __name__ == "__main__":
+    df = synth_frame(N_TRADES)
+    sample = df.iloc[:N_LEGACY]
+
+    ref, t_old = timed(legacy_pnl_daily, sample)
+    new, _ = timed(pnl.pnl_by, sample, ("date",))
+    assert np.allclose(ref["pnl_usdt"].to_numpy(), new["pnl_usdt"].to_numpy()), "Ergebnis weicht ab"
+
+    _, t_daily = timed(pnl.pnl_by, df, ("date",))
+    _, t_all = timed(pnl.pnl_rollups, df)
+    _, t_fifo = timed(positions.realize, df, None, "fifo")
+    _, t_avg = timed(positions.realize, df, None, "avg")
+
+    print(f"trades:              {N_TRADES:,}")
+    print(f"legacy iterrows:     {N_LEGACY / t_old:>14,.0f} trades/s  (Stichprobe {N_LEGACY:,})")
+    print(f"vektorisiert daily:  {N_TRADES / t_daily:>14,.0f} trades/s  ({t_daily:.3f}s)")
+    print(f"alle Rollups:        {N_TRADES / t_all:>14,.0f} trades/s  ({t_all:.3f}s, daily/hourly/symbol/copy_trader)")
+    print(f"realisiert FIFO:     {N_TRADES / t_fifo:>14,.0f} trades/s  ({t_fifo:.3f}s)")
+    print(f"realisiert Ø-Kosten: {N_TRADES / t_avg:>14,.0f} trades/s  ({t_avg:.3f}s)")
@@ -0,0 +1,276 @@
+"""Lokaler MEXC-Stand-in – Offline-Tests und Benchmarks ohne API-Keys.
+
+FakeMexcSync / FakeMexc (async) teilen sich einen Zustand: Märkte, Trades je Symbol,
+Balances und Preise (fetch_ohlcv liefert synthetische Kerzen darum). fetch_my_trades paginiert wie MEXC (since/limit, höchstens
+MAX_PAGE Fills, Fensterende über params 'until' / 'endTime' / 'end_time'), jede Anfrage
+kostet simulierte Latenz und zählt gegen ein Rate-Limit (-> ccxt.RateLimitExceeded).
+
+    MEXC_SPOT_WEIGHT_PER_SEC=5000 python bench/fake_exchange.py
+
+(ohne Override begrenzt der echte MEXC-Token-Bucket, nicht die Latenz)
+"""
+import os, sys, math, time, bisect, random, asyncio
+from collections import Counter, deque
+import ccxt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fetch_async
+
+MAX_PAGE = 100   # wie Spot myTrades / Kontrakt order_deals
+
+def synth_trades(symbol, n, start_ms, step_ms=60000, seed=0, price0=100.0):
+    """n ccxt-artige Fills für 'symbol' ab 'start_ms' im Abstand 'step_ms' (Random Walk)."""
+    rnd = random.Random(f"{seed}:{symbol}")
+    out = []
+    price = price0
+    for i in range(n):
+        price *= 1 + rnd.uniform(-0.005, 0.005)
+        amount = round(rnd.uniform(0.01, 2.0), 4)
+        out.append({
+            "id": f"{symbol}-{i}",
+            "order": f"{symbol}-o{i}",
+            "symbol": symbol,
+            "timestamp": start_ms + i * step_ms,
+            "side": "buy" if rnd.random() < 0.5 else "sell",
+            "price": price,
+            "amount": amount,
+            "cost": price * amount,
+            "fee": {"cost": price * amount * 0.001, "currency": "USDT"},
+            "info": {"traderId": rnd.randrange(5)} if rnd.random() < 0.2 else {},
+        })
+    return out
+
+def generate_book(n_symbols=200, fills_per_day=50, days=30, active_share=0.2, swap_share=0.25,
+                  end_ms=None, seed=0):
+    """Synthetisches Konto: 'n_symbols' Märkte, davon 'active_share' mit Fills.
+
+    Rückgabe: (trades_by_symbol, balance, prices). Ein Teil der Märkte sind lineare
+    Swaps ('XYZ/USDT:USDT'); inaktive Märkte haben leere Trade-Listen.
+    """
+    rnd = random.Random(seed)
+    end_ms = end_ms or int(time.time() * 1000)
+    start = end_ms - days * 86400000
+    n_fills = max(1, fills_per_day * days)
+    step = max(1, (end_ms - start) // n_fills)
+    book, prices, balance = {}, {}, {"USDT": 10000.0}
+    for i in range(n_symbols):
+        base = f"C{i}"
+        sym = f"{base}/USDT:USDT" if rnd.random() < swap_share else f"{base}/USDT"
+        price0 = 10 ** rnd.uniform(-2, 4)
+        active = rnd.random() < active_share
+        book[sym] = synth_trades(sym, n_fills, start, step, seed, price0) if active else []
+        prices[f"{base}/USDT"] = book[sym][-1]["price"] if book[sym] else price0
+        if active and ":" not in sym:
+            balance[base] = round(rnd.uniform(0, 5), 4)
+    return book, balance, prices
+
+class _Core:
+    """Gemeinsamer Zustand + Rate-Limit der Attrappen."""
+
+    def __init__(self, trades_by_symbol, balance=None, prices=None, latency=0.0, rate_limit=None):
+        self.trades = trades_by_symbol          # Listen je Symbol, nach Zeit sortiert (werden nicht kopiert)
+        self.balance = balance or {"USDT": 1000.0}
+        self.prices = prices or {}
+        self.latency = latency
+        self.rate_limit = rate_limit            # Requests pro Sekunde (None = unbegrenzt)
+        self.window = deque()
+        self.calls = Counter()
+        self.throttled = 0
+        self.markets = {}
+        for s in list(trades_by_symbol) + list(self.prices):
+            base = s.split("/")[0]
+            swap = ":" in s
+            self.markets[s] = {"id": s.split(":")[0].replace("/", "") + ("_SWAP" if swap else ""),
+                               "symbol": s, "base": base, "quote": "USDT", "settle": "USDT" if swap else None,
+                               "spot": not swap, "swap": swap, "linear": swap if swap else None,
+                               "type": "swap" if swap else "spot", "active": True}
+        self.markets_by_id = {m["id"]: [m] for m in self.markets.values()}
+
+    def hit(self, method):
+        self.calls[method] += 1
+        if self.rate_limit:
+            now = time.monotonic()
+            while self.window and now - self.window[0] > 1.0:
+                self.window.popleft()
+            if len(self.window) >= self.rate_limit:
+                self.throttled += 1
+                raise ccxt.RateLimitExceeded(f"fake mexc: > {self.rate_limit} req/s")
+            self.window.append(now)
+
+    def my_trades(self, symbol, since=None, limit=None, params={}):
+        until = params.get("until", params.get("endTime", params.get("end_time")))
+        rows = self.trades.get(symbol, [])
+        lo = bisect.bisect_left(rows, since or 0, key=lambda t: t["timestamp"])
+        hi = len(rows) if until is None else bisect.bisect_right(rows, until, key=lambda t: t["timestamp"])
+        return rows[lo:min(hi, lo + min(limit or MAX_PAGE, MAX_PAGE))]
+
+    def ohlcv(self, symbol, timeframe="1h", since=None, limit=None):
+        """Deterministische Kerzen um den aktuellen Preis (Sinus je Symbol) bis jetzt."""
+        p0 = self.prices.get(symbol)
+        if p0 is None:
+            raise ccxt.BadSymbol(symbol)
+        step = {"1m": 60000, "1h": 3600000, "1d": 86400000}[timeframe]
+        now = int(time.time() * 1000)
+        start = (since if since is not None else now - MAX_PAGE * step) // step * step
+        phase = sum(map(ord, symbol)) % 97
+        out = []
+        for ts in range(start, now + 1, step)[:min(limit or MAX_PAGE, 1000)]:
+            o = p0 * (1 + 0.02 * math.sin(ts / 86400000 + phase))
+            c = p0 * (1 + 0.02 * math.sin((ts + step) / 86400000 + phase))
+            out.append([ts, o, max(o, c), min(o, c), c, 1.0])
+        return out
+
+    def swap_positions(self):
+        """Offene Positionen: Netto-Menge je Swap aus den Fills, bewertet zum aktuellen Preis."""
+        out = []
+        for sym, rows in self.trades.items():
+            if ":" not in sym or not rows:
+                continue
+            qty = sum(t["amount"] if t["side"] == "buy" else -t["amount"] for t in rows)
+            cost = sum(t["cost"] if t["side"] == "buy" else -t["cost"] for t in rows)
+            if abs(qty) < 1e-9:
+                continue
+            mark = self.prices.get(sym.split(":")[0], rows[-1]["price"])
+            out.append({"symbol": sym, "side": "long" if qty > 0 else "short", "contracts": abs(qty),
+                        "entryPrice": cost / qty, "markPrice": mark, "unrealizedPnl": qty * mark - cost})
+        return out
+
+    def swap_history(self, page=1, size=MAX_PAGE):
+        """Geschlossene Positionen: je Swap eine Position pro 20 Fills, neueste zuerst, seitenweise (ohne 'since' wie MEXC)."""
+        if not hasattr(self, "_history"):
+            rows = [{"symbol": sym, "timestamp": rows[min(i + 19, len(rows) - 1)]["timestamp"],
+                     "info": {"symbol": self.markets[sym]["id"]}}
+                    for sym, rows in self.trades.items() if ":" in sym for i in range(0, len(rows), 20)]
+            self._history = sorted(rows, key=lambda p: -p["timestamp"])
+        return self._history[(page - 1) * size:page * size]
+
+    def funding(self, since=None, page=1, size=MAX_PAGE):
+        """Funding alle 8 h je Swap mit Fills (erster bis letzter Fill), neueste zuerst, seitenweise."""
+        if not hasattr(self, "_funding"):
+            rows = []
+            for sym, trades in self.trades.items():
+                if ":" not in sym or not trades:
+                    continue
+                t0 = trades[0]["timestamp"] // 28800000 * 28800000 + 28800000
+                for k, ts in enumerate(range(t0, trades[-1]["timestamp"], 28800000)):
+                    # wie ccxt ohne Symbol-Filter: 'symbol' None, Kontrakt nur in info
+                    rows.append({"id": f"{sym}-f{k}", "symbol": None, "code": "USDT", "timestamp": ts,
+                                 "amount": round(0.05 * math.sin(ts / 28800000 + len(sym)), 6),
+                                 "info": {"symbol": self.markets[sym]["id"]}})
+            self._funding = sorted(rows, key=lambda f: -f["timestamp"])
+        rows = [f for f in self._funding if f["timestamp"] >= (since or 0)]
+        return rows[(page - 1) * size:page * size]
+
+    def ticker(self, symbol):
+        p = self.prices.get(symbol)
+        if p is None:
+            raise ccxt.BadSymbol(symbol)
+        return {"symbol": symbol, "last": p, "close": p, "bid": p, "ask": p}
+
+class FakeMexcSync:
+    """ccxt-kompatible synchrone Attrappe (für pipeline.py, discovery, Bewertung)."""
+    rateLimit = 0
+
+    def __init__(self, trades_by_symbol=None, latency=0.0, balance=None, prices=None, rate_limit=None, core=None):
+        self.core = core or _Core(trades_by_symbol or {}, balance, prices, latency, rate_limit)
+        self.markets = self.core.markets
+        self.markets_by_id = self.core.markets_by_id
+        self.options = {}
+        self.aio = FakeMexc(core=self.core)
+
+    def _call(self, method):
+        self.core.hit(method)
+        if self.core.latency:
+            time.sleep(self.core.latency)
+
+    def load_markets(self, reload=False, params={}):
+        self._call("load_markets")
+        return self.markets
+
+    def fetch_my_trades(self, symbol=None, since=None, limit=None, params={}):
+        self._call("fetch_my_trades")
+        return self.core.my_trades(symbol, since, limit, params)
+
+    def fetch_balance(self, params={}):
+        self._call("fetch_balance")
+        return {"total": dict(self.core.balance)}
+
+    def fetch_ticker(self, symbol, params={}):
+        self._call("fetch_ticker")
+        return self.core.ticker(symbol)
+
+    def fetch_tickers(self, symbols=None, params={}):
+        self._call("fetch_tickers")
+        return {s: self.core.ticker(s) for s in (symbols or self.core.prices)}
+
+    def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=None, params={}):
+        self._call("fetch_ohlcv")
+        return self.core.ohlcv(symbol, timeframe, since, limit)
+
+    def fetch_open_orders(self, symbol=None, since=None, limit=None, params={}):
+        self._call("fetch_open_orders")
+        return []
+
+    def safe_market(self, market_id, market=None, delimiter=None, market_type=None):
+        for m in self.markets_by_id.get(market_id, []):
+            if market_type is None or m["type"] == market_type:
+                return m
+        return {"id": market_id, "symbol": market_id}
+
+    def fetch_positions(self, symbols=None, params={}):
+        self._call("fetch_positions")
+        return self.core.swap_positions()
+
+    def fetch_positions_history(self, symbols=None, since=None, limit=None, params={}):
+        self._call("fetch_positions_history")
+        return self.core.swap_history(params.get("page_num", 1), params.get("page_size", limit or MAX_PAGE))
+
+    def fetch_funding_history(self, symbol=None, since=None, limit=None, params={}):
+        self._call("fetch_funding_history")
+        return self.core.funding(since, params.get("page_num", 1), params.get("page_size", MAX_PAGE))
+
+class FakeMexc:
+    """Async-Variante (ccxt.async_support-Schnittstelle) auf demselben Zustand."""
+
+    def __init__(self, trades_by_symbol=None, latency=0.0, balance=None, prices=None, rate_limit=None, core=None):
+        self.core = core or _Core(trades_by_symbol or {}, balance, prices, latency, rate_limit)
+        self.markets = self.core.markets
+        self.markets_by_id = self.core.markets_by_id
+
+    @property
+    def calls(self):
+        return sum(self.core.calls.values())
+
+    async def _call(self, method):
+        self.core.hit(method)
+        if self.core.latency:
+            await asyncio.sleep(self.core.latency)
+
+    async def fetch_my_trades(self, symbol=None, since=None, limit=None, params={}):
+        await self._call("fetch_my_trades")
+        return self.core.my_trades(symbol, since, limit, params)
+
+    async def fetch_balance(self, params={}):
+        await self._call("fetch_balance")
+        return {"total": dict(self.core.balance)}
+
+    async def fetch_tickers(self, symbols=None, params={}):
+        await self._call("fetch_tickers")
+        return {s: self.core.ticker(s) for s in (symbols or self.core.prices)}
+
+    async def close(self):
+        pass
+
+if __name__ == "__main__":
+    n_sym = int(os.getenv("BENCH_SYMBOLS", "200"))
+    start = int(time.time() * 1000) - 14 * 86400000
+    book = {f"C{i}/USDT": synth_trades(f"C{i}/USDT", 5 if i % 10 == 0 else 0, start) for i in range(n_sym)}
+    expected = [t for s in book for t in book[s]]
+
+    for conc in (1, fetch_async.CONCURRENCY):
+        fake = FakeMexc(book, latency=0.02)
+        t0 = time.perf_counter()
+        got = asyncio.run(fetch_async.fetch_symbols_async(fake, "spot", list(book), start, concurrency=conc))
+        dt_s = time.perf_counter() - t0
+        assert got == expected, "Trade-Liste weicht ab"
+        print(f"concurrency={conc:<3} calls={fake.calls:<5} trades={len(got):<6} {dt_s:.2f}s")
@@ -0,0 +1,84 @@
+"""Lokaler Fake des MEXC-User-Data-WebSockets – Offline-Test von scripts/stream_mexc.py.
+
+Der Server pusht Deal-Nachrichten im MEXC-Format, trennt die Verbindung regelmäßig und
+erzeugt währenddessen Fills, die nur per REST (FakeMexc) sichtbar sind. Am Ende müssen
+alle Fills im Store liegen.
+
+    python bench/fake_ws.py
+"""
+import os, sys, json, time, random, asyncio, tempfile
+import websockets
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+import store
+from fake_exchange import FakeMexc
+from stream_mexc import Streamer
+
+DURATION = float(os.getenv("BENCH_STREAM_SEC", "6"))
+
+class FakeUserStream:
+    """Pusht Fills für 'symbol' und trennt nach 'drop_after' Nachrichten."""
+
+    def __init__(self, book, symbol="FAKE/USDT", interval=0.05, drop_after=20, missed_per_drop=5):
+        self.book = book                # gemeinsames "REST"-Orderbuch (Symbol -> Trades)
+        self.symbol = symbol
+        self.interval = interval
+        self.drop_after = drop_after
+        self.missed_per_drop = missed_per_drop
+        self.seq = 0
+        self.rnd = random.Random(0)
+
+    def _fill(self):
+        self.seq += 1
+        price = 100.0 + self.rnd.uniform(-1, 1)
+        amount = round(self.rnd.uniform(0.01, 1.0), 4)
+        ts = int(time.time() * 1000)
+        side = 1 if self.rnd.random() < 0.5 else 2
+        d = {"p": str(price), "v": str(amount), "a": str(price * amount), "S": side, "T": ts,
+             "t": f"fake-{self.seq}", "i": f"order-{self.seq}", "m": 0,
+             "n": str(price * amount * 0.001), "N": "USDT"}
+        self.book[self.symbol].append({
+            "id": d["t"], "order": d["i"], "symbol": self.symbol, "timestamp": ts,
+            "side": "buy" if side == 1 else "sell", "price": price, "amount": amount,
+            "cost": price * amount, "fee": {"cost": price * amount * 0.001, "currency": "USDT"}, "info": d,
+        })
+        return {"c": "spot@private.deals.v3.api", "d": d, "s": self.symbol.replace("/", ""), "t": ts}
+
+    async def handler(self, ws):
+        sub = json.loads(await ws.recv())
+        await ws.send(json.dumps({"id": 0, "code": 0, "msg": ",".join(sub.get("params", []))}))
+        for _ in range(self.drop_after):
+            await ws.send(json.dumps(self._fill()))
+            await asyncio.sleep(self.interval)
+        # Verbindungsabbruch; bis zum Reconnect passieren weitere Fills (nur per REST sichtbar)
+        for _ in range(self.missed_per_drop):
+            self._fill()
+        await ws.close(code=1011)
+
+async def demo():
+    book = {"FAKE/USDT": []}
+    fake = FakeUserStream(book)
+    tmp = tempfile.mkdtemp(prefix="fake_ws_")
+    con = store.open_store(os.path.join(tmp, "trades.sqlite"))
+    async with websockets.serve(fake.handler, "127.0.0.1", 0) as srv:
+        port = list(srv.sockets)[0].getsockname()[1]
+        s = Streamer(con, FakeMexc(book), ws_url=f"ws://127.0.0.1:{port}", outdir=tmp, flush_sec=1)
+        task = asyncio.gather(s.run(max_backoff=1), s.flusher())
+        await asyncio.sleep(DURATION)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    # letzte Lücke schließen wie bei einem Reconnect
+    await s.gap_fill()
+    s.flush()
+    stored = con.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+    total = len(book["FAKE/USDT"])
+    print(f"connects={s.connects} via_ws={s.fills} stored={stored} total={total} out={tmp}")
+    assert stored == total, "Fills fehlen im Store"
+
+if __name__ == "__main__":
+    asyncio.run(demo())
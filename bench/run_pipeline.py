@@ -0,0 +1,161 @@
+"""Offline-Benchmark der ganzen Dashboard-Pipeline gegen die MEXC-Attrappe.
+
+Synthetisches Konto (bench/fake_exchange.py) -> pipeline.Run mit der Attrappe als
+Exchange (fetch -> normalize -> aggregate -> csv/html/latest) auf einem temporären Store.
+Je Run-Stufe werden Zeit und Requests gemessen, dazu die Teilstufen aus metrics.py
+("substages"); der JSON-Report lässt sich mit --baseline gegen einen früheren vergleichen
+(Exit-Code 1 bei Regression).
+
+    python bench/run_pipeline.py
+    BENCH_SYMBOLS=1000 BENCH_DAYS=90 python bench/run_pipeline.py --report big.json
+    python bench/run_pipeline.py --baseline bench_report.json --tolerance 0.25
+"""
+import os, sys, json, time, argparse, tempfile, datetime as dt
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# ========= Parameter =========
+N_SYMBOLS     = int(os.getenv("BENCH_SYMBOLS", "200"))
+ACTIVE_SHARE  = float(os.getenv("BENCH_ACTIVE", "0.2"))
+FILLS_PER_DAY = int(os.getenv("BENCH_FILLS_PER_DAY", "50"))
+BENCH_DAYS    = int(os.getenv("BENCH_DAYS", "30"))
+LATENCY_MS    = float(os.getenv("BENCH_LATENCY_MS", "20"))
+RATE_PER_SEC  = float(os.getenv("BENCH_RATE_PER_SEC", "200"))   # Requests/s der Attrappe
+BUCKET_SHARE  = float(os.getenv("BENCH_BUCKET_SHARE", "1.0"))   # Token-Bucket relativ zum Limit
+REPORT        = os.getenv("BENCH_REPORT", "bench_report.json")
+
+# Ausgaben, Caches und Manifest der Pipeline in ein Temp-Verzeichnis (werden beim Import gelesen);
+# EUR-Kurse kommen aus dem EUR/USDT-Paar der Attrappe (fx.py, Quelle "exchange")
+TMP = tempfile.mkdtemp(prefix="bench_pipeline_")
+os.environ["OUTDIR"] = os.path.join(TMP, "site")
+os.environ["LATEST_PATH"] = os.path.join(TMP, "latest.json")
+os.environ.setdefault("DAYS", str(BENCH_DAYS))
+os.environ["OHLCV_DIR"] = os.path.join(TMP, "ohlcv")
+os.environ["FX_PATH"] = os.path.join(TMP, "fx_eur.json")
+os.environ["FX_SOURCES"] = "exchange"
+os.environ["MANIFEST_PATH"] = os.path.join(TMP, "manifest.json")
+os.environ["FETCH_MAX_AGE_MIN"] = "0"
+
+import store
+import metrics
+import fetch_async
+import pipeline
+import equity
+import ohlcv
+from fake_exchange import FakeMexcSync, generate_book
+
+class Stages:
+    """Stoppuhr + Request-Zähler je Pipeline-Stufe."""
+
+    def __init__(self, core):
+        self.core = core
+        self.rows = {}
+
+    def run(self, name, fn, *args, **kw):
+        calls = Counter(self.core.calls)
+        t0 = time.perf_counter()
+        res = fn(*args, **kw)
+        secs = time.perf_counter() - t0
+        self.rows[name] = {"seconds": round(secs, 4),
+                           "requests": sum((self.core.calls - calls).values())}
+        print(f"{name:<14} {secs:8.3f}s  requests={self.rows[name]['requests']}")
+        return res
+
+def run_once(con, fake, since_ms, st):
+    """Ein pipeline.Run (Ausgaben csv, html, latest) mit der Attrappe als Spot- und Swap-Exchange."""
+    r = pipeline.Run(con=con, since_ms=since_ms, exchanges={"spot": fake, "swap": fake})
+    st.run("fetch", r.fetch)
+    # Snapshot-Historie: ein Snapshot je Stunde über den Zeitraum (Wert pendelt um die aktuelle Equity)
+    ts_now, eq_now = equity.latest(con)
+    pos = equity.assets_at(con, ts_now)
+    hist = pos.rename(columns={"market_type": "type"}).assign(value_usdt=pos["value_usdt"] * 0.98)
+    for ts in range(since_ms, ts_now - 3600000, 3600000):
+        equity.record(con, hist, eq_now * (0.95 + 0.1 * ((ts // 3600000) % 24) / 24), ts)
+    st.run("normalize", r.normalize)
+    st.run("aggregate", r.aggregate)
+    # zweiter Aufruf: alles im Cache bzw. Zeitraum abgedeckt -> keine Requests
+    st.run("ohlcv_incr", r.hist.ensure, fake, ohlcv.assets(r.df), since_ms)
+    st.run("fx_incr", r.fx.ensure, since_ms, fake)
+    st.run("write_csv", r.write_csv)
+    st.run("write_html", r.write_html)
+    st.run("write_latest", r.write_latest)
+    r.manifest.save()
+    return len(r.df)
+
+def compare(report, baseline, tolerance):
+    """Stufen, die mehr als 'tolerance' langsamer sind (mit 50 ms Rauschgrenze)."""
+    worse = []
+    for key in ("stages", "substages"):
+        for name, row in report.get(key, {}).items():
+            old = baseline.get(key, {}).get(name)
+            if old and row["seconds"] > old["seconds"] * (1 + tolerance) + 0.05:
+                worse.append(f"{name}: {old['seconds']:.3f}s -> {row['seconds']:.3f}s")
+    return worse
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--report", default=REPORT)
+    ap.add_argument("--baseline", help="früherer Report zum Vergleich")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="erlaubte Verlangsamung je Stufe (0.2 = 20%%)")
+    args = ap.parse_args()
+
+    end_ms = int(time.time() * 1000)
+    book, balance, prices = generate_book(N_SYMBOLS, FILLS_PER_DAY, BENCH_DAYS, ACTIVE_SHARE, end_ms=end_ms)
+    prices["EUR/USDT"] = 1.08
+    fake = FakeMexcSync(book, latency=LATENCY_MS / 1000, balance=balance, prices=prices,
+                        rate_limit=RATE_PER_SEC or None)
+    # Async-Engine direkt auf die Attrappe; Token-Bucket am vollen Limit (Fenster der
+    # Attrappe = 1 s) – Drosselungen fängt der adaptive Bucket (retry.py) ab
+    fetch_async.make_async_ex = lambda ex: ex.aio
+    if RATE_PER_SEC:
+        for typ, w in fetch_async.TRADES_WEIGHT.items():
+            fetch_async.WEIGHT_PER_SEC[typ] = RATE_PER_SEC * BUCKET_SHARE * w
+            fetch_async.BURST_SEC[typ] = 1.0
+
+    con = store.open_store(os.path.join(TMP, "trades.sqlite"))
+    since_ms = end_ms - BENCH_DAYS * 86400000
+    st = Stages(fake.core)
+    metrics.reset()
+    t0 = time.perf_counter()
+    n_trades = run_once(con, fake, since_ms, st)
+    total = time.perf_counter() - t0
+    substages = metrics.snapshot()["stages"]
+
+    # zweiter Lauf: nur Cursor-Fetch (inkrementell, Store ist gefüllt)
+    st.run("fetch_incr", lambda: (pipeline.fetch_all_trades_spot(fake, since_ms, con),
+                                  pipeline.fetch_all_trades_swap(fake, since_ms, con)))
+
+    report = {
+        "generated": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "params": {"symbols": N_SYMBOLS, "active_share": ACTIVE_SHARE, "fills_per_day": FILLS_PER_DAY,
+                   "days": BENCH_DAYS, "latency_ms": LATENCY_MS, "rate_per_sec": RATE_PER_SEC,
+                   "bucket_share": BUCKET_SHARE,
+                   "concurrency": fetch_async.CONCURRENCY},
+        "trades_generated": sum(len(v) for v in book.values()),
+        "trades_loaded": n_trades,
+        "total_seconds": round(total, 4),
+        "stages": st.rows,
+        "substages": substages,
+        "requests": dict(fake.core.calls),
+        "throttled": fake.core.throttled,
+        "outdir": TMP,
+    }
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"gesamt {total:.2f}s, {n_trades} Trades, throttled={fake.core.throttled} -> {args.report}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            base = json.load(f)
+        if base.get("params") != report["params"]:
+            print("Achtung: Baseline mit anderen Parametern erstellt", base.get("params"))
+        worse = compare(report, base, args.tolerance)
+        if worse:
+            print("Regression:\n  " + "\n  ".join(worse))
+            sys.exit(1)
+        print("keine Regression gegenüber", args.baseline)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import os, json
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.feather as feather
+
+from normalize import df_from_trades
+
+# ========= Spaltenexport (Parquet / Arrow IPC) =========
+# Alle Trades des Stores als Tagespartitionen 'date=YYYY-MM-DD/trades.<ext>' mit festen Typen:
+# Kategorien als Dictionary, Zeitstempel int64 (ms), Preise float64. Pro Lauf werden nur
+# Tage neu geschrieben, deren Zeilenzahl im Store sich geändert hat (gelesen wird je Tag).
+# "parquet" = klein (zstd), "arrow" = unkomprimiertes Arrow-IPC zum Memory-Mappen.
+FORMAT = os.getenv("EXPORT_COLUMNAR", "parquet")
+
+TRADES_SCHEMA = pa.schema([
+    ("date",        pa.string()),
+    ("timestamp",   pa.int64()),
+    ("id",          pa.string()),
+    ("symbol",      pa.dictionary(pa.int32(), pa.string())),
+    ("side",        pa.dictionary(pa.int8(), pa.string())),
+    ("price",       pa.float64()),
+    ("amount",      pa.float64()),
+    ("cost",        pa.float64()),
+    ("fee_cost",    pa.float64()),
+    ("fee_ccy",     pa.dictionary(pa.int16(), pa.string())),
+    ("is_copy",     pa.bool_()),
+    ("copy_trader", pa.dictionary(pa.int32(), pa.string())),
+])
+
+def _ext(fmt):
+    return "arrow" if fmt == "arrow" else "parquet"
+
+def _write(table, path, fmt):
+    tmp = path + ".tmp"
+    if fmt == "arrow":
+        feather.write_feather(table, tmp, compression="uncompressed")
+    else:
+        pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, path)
+
+def _num_rows(path, fmt):
+    if not os.path.exists(path):
+        return None
+    if fmt == "arrow":
+        with pa.memory_map(path) as src:
+            return pa.ipc.open_file(src).read_all().num_rows
+    return pq.read_metadata(path).num_rows
+
+def to_table(df):
+    """DataFrame aus df_from_trades -> Arrow-Table mit TRADES_SCHEMA."""
+    cols = {}
+    for f in TRADES_SCHEMA:
+        s = df[f.name] if f.name in df.columns else pd.Series([None] * len(df))
+        if pa.types.is_dictionary(f.type):
+            arr = pa.array(s.astype(object).where(s.notna(), None), type=pa.string()).dictionary_encode()
+            cols[f.name] = arr.cast(f.type)
+        else:
+            cols[f.name] = pa.array(s, type=f.type, from_pandas=True)
+    return pa.table(cols, schema=TRADES_SCHEMA)
+
+def _part_path(root, day, fmt):
+    return os.path.join(root, f"date={day}", f"trades.{_ext(fmt)}")
+
+def _write_day(g, path, fmt):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _write(to_table(g.sort_values("timestamp", kind="stable")), path, fmt)
+
+def export_trades(df, root, fmt=None):
+    """Tagespartitionen eines DataFrames unter 'root' schreiben; gibt die Zahl neu geschriebener Tage zurück.
+
+    Nur für vollständige Tage – ein angeschnittener Tag würde die Partition auf der Platte kürzen.
+    """
+    fmt = fmt or FORMAT
+    written = 0
+    if df.empty:
+        return written
+    for day, g in df.groupby("date", sort=True):
+        path = _part_path(root, day, fmt)
+        if _num_rows(path, fmt) == len(g):
+            continue  # Tag unverändert (Store ist append-only)
+        _write_day(g, path, fmt)
+        written += 1
+    return written
+
+def export_store(con, root, fmt=None):
+    """Alle Trades aus dem Store (nicht nur das DAYS-Fenster) als Tagespartitionen unter 'root'.
+
+    Vergleicht je Tag die Zeilenzahl im Store mit der Datei und liest nur geänderte Tage
+    -> Speicher ~ ein Tag, unabhängig von der Historie. Gibt die Zahl geschriebener Tage zurück.
+    """
+    fmt = fmt or FORMAT
+    written = 0
+    days = con.execute("SELECT date(timestamp / 1000, 'unixepoch') AS day, COUNT(*) FROM trades "
+                       "GROUP BY day ORDER BY day").fetchall()
+    for day, n in days:
+        path = _part_path(root, day, fmt)
+        if _num_rows(path, fmt) == n:
+            continue
+        start = int(pd.Timestamp(day, tz="UTC").timestamp() * 1000)
+        rows = con.execute("SELECT raw FROM trades WHERE timestamp >= ? AND timestamp < ?",
+                           (start, start + 86400000))
+        _write_day(df_from_trades([json.loads(r[0]) for r in rows]), path, fmt)
+        written += 1
+    return written
+
+def export_frame(df, path, fmt=None):
+    """Kleine Tabellen (daily_pnl, equity_curve) als eine Datei."""
+    fmt = fmt or FORMAT
+    _write(pa.Table.from_pandas(df, preserve_index=False), f"{path}.{_ext(fmt)}", fmt)
+
+def load_trades(root, since_date=None, fmt=None):
+    """Partitionen wieder einlesen (Arrow: memory-mapped) -> DataFrame wie df_from_trades."""
+    fmt = fmt or FORMAT
+    if not os.path.isdir(root):
+        return to_table(pd.DataFrame()).to_pandas()
+    tables = []
+    for name in sorted(os.listdir(root)):
+        if not name.startswith("date=") or (since_date and name[5:] < since_date):
+            continue
+        path = os.path.join(root, name, f"trades.{_ext(fmt)}")
+        if not os.path.exists(path):
+            continue
+        if fmt == "arrow":
+            tables.append(pa.ipc.open_file(pa.memory_map(path)).read_all())
+        else:
+            tables.append(pq.ParquetFile(path, memory_map=True).read())
+    if not tables:
+        return to_table(pd.DataFrame()).to_pandas()
+    # Dictionaries der Tage vereinheitlichen -> pandas-Categoricals
+    return pa.concat_tables(tables).unify_dictionaries().to_pandas()
@@ -0,0 +1,90 @@
+import os, time
+
+import store
+import retry
+import metrics
+from pricing import STABLES
+
+# ========= Aktive Symbole =========
+# Statt hunderte leere Märkte abzufragen, nur Symbole mit Bestand, offenen Orders/Positionen
+# oder Trades in letzter Zeit. Ab und zu ein vollständiger Durchlauf über alle Märkte.
+ACTIVE_TTL_DAYS  = float(os.getenv("ACTIVE_TTL_DAYS", "30"))     # ohne Aktivität -> raus aus dem Index
+FULL_SWEEP_HOURS = float(os.getenv("FULL_SWEEP_HOURS", "24"))    # 0 = immer alle Märkte
+
+def _failed(exc):
+    """Quelle fällt aus -> nur weniger Hinweise (Aktiv-Index + Voll-Durchlauf bleiben); Auth-Fehler abbrechen."""
+    if retry.classify(exc) == "fatal":
+        raise exc
+    metrics.add_error(exc)
+
+def _balance_symbols(ex, market_type, candidates):
+    """Spot: Bestände -> 'XYZ/USDT'. Swap: Bestände sind Margin, relevant sind Positionen."""
+    out = set()
+    if market_type == "spot":
+        try:
+            totals = retry.call(ex.fetch_balance, ex=ex).get("total") or {}
+        except Exception as e:
+            _failed(e)
+            return out
+        for ccy, qty in totals.items():
+            sym = f"{ccy}/USDT"
+            if float(qty or 0.0) > 0 and ccy.upper() not in STABLES and sym in candidates:
+                out.add(sym)
+    else:
+        try:
+            for p in retry.call(ex.fetch_positions, ex=ex):
+                if float(p.get("contracts") or 0.0) != 0 and p.get("symbol") in candidates:
+                    out.add(p["symbol"])
+        except Exception as e:
+            _failed(e)
+    return out
+
+def _open_order_symbols(ex, candidates):
+    try:
+        orders = retry.call(ex.fetch_open_orders, ex=ex)
+    except Exception as e:
+        _failed(e)
+        return set()
+    return {o.get("symbol") for o in orders if o.get("symbol") in candidates}
+
+def discover(ex, con, market_type, candidates, now_ms=None, known=None):
+    """Symbole, die in diesem Lauf abgefragt werden sollen (Teilmenge von 'candidates').
+
+    Quellen: aktuelle Bestände bzw. Positionen, offene Orders und der persistente
+    Aktiv-Index (Symbole mit Trades in den letzten ACTIVE_TTL_DAYS). Ist der letzte
+    Voll-Durchlauf älter als FULL_SWEEP_HOURS, werden alle Kandidaten geliefert; als
+    erledigt gilt er erst, wenn der Aufrufer finish_sweep nach vollständigem Abruf meldet.
+    'known': schon über Bulk-Endpunkte ermittelte Symbole (swap.ingest) – ersetzt
+    Bestände/Positionen und den Voll-Durchlauf.
+    """
+    now_ms = now_ms or int(time.time() * 1000)
+    candidates = list(candidates)
+    last_sweep = int(store.get_meta(con, f"last_full_sweep:{market_type}", 0))
+    if known is None and now_ms - last_sweep >= FULL_SWEEP_HOURS * 3600000:
+        store.set_meta(con, f"pending_full_sweep:{market_type}", now_ms)
+        return candidates
+
+    cand = set(candidates)
+    found = (set(known) & cand if known is not None else _balance_symbols(ex, market_type, cand))
+    found |= _open_order_symbols(ex, cand)
+    with con:
+        # Bestände/Orders zählen als Aktivität -> bleiben im Index, auch ohne neue Fills
+        store.touch_active(con, market_type, found, now_ms)
+    found |= store.active_symbols(con, market_type, now_ms - ACTIVE_TTL_DAYS * 86400000) & cand
+    # Reihenfolge wie in 'candidates'
+    return [s for s in candidates if s in found]
+
+def finish_sweep(con, market_type, complete):
+    """Nach dem Abruf: ein von discover gelieferter Voll-Durchlauf zählt nur, wenn nichts fehlte.
+
+    Bricht er ab (Drosselung, Netzwerk), bleibt der alte Zeitpunkt stehen -> nächster Lauf
+    wieder voll, statt bis FULL_SWEEP_HOURS nur den Aktiv-Index abzufragen.
+    """
+    key = f"pending_full_sweep:{market_type}"
+    started = int(store.get_meta(con, key, 0))
+    if not started:
+        return False
+    if complete:
+        store.set_meta(con, f"last_full_sweep:{market_type}", started)
+    store.set_meta(con, key, 0)
+    return complete
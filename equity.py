@@ -0,0 +1,98 @@
+import os, math, time
+import numpy as np
+import pandas as pd
+
+# ========= Equity-Zeitreihe aus Balance-Snapshots =========
+# Jeder Lauf legt einen bewerteten Snapshot (je Asset Menge, Preis, Wert) im Store ab.
+# Equity-Kurve, Drawdown und ROI kommen aus diesen Snapshots statt aus
+# "Equity jetzt - Summe PnL" – korrekt auch bei gehaltenen Assets, Aufwand O(Snapshots).
+MAX_POINTS = int(os.getenv("EQUITY_MAX_POINTS", "1000"))   # Downsampling für lange Zeiträume
+
+def record(con, details, equity_usdt, ts_ms=None):
+    """Snapshot aus current_equity_usdt()-Details speichern; ohne Details (Abruf fehlgeschlagen) nichts."""
+    if details is None or len(details) == 0:
+        return None
+    ts_ms = int(ts_ms or time.time() * 1000)
+    rows = [(ts_ms, r["type"], r["asset"], float(r["qty"]),
+             None if r["price_usdt"] is None or math.isnan(r["price_usdt"]) else float(r["price_usdt"]),
+             float(r["value_usdt"]))
+            for r in details.to_dict(orient="records")]
+    unpriced = sum(1 for r in details.to_dict(orient="records") if not r.get("priced", True))
+    with con:
+        con.execute("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)", (ts_ms, float(equity_usdt), unpriced))
+        con.execute("DELETE FROM snapshot_assets WHERE ts = ?", (ts_ms,))
+        con.executemany("INSERT INTO snapshot_assets VALUES (?, ?, ?, ?, ?, ?)", rows)
+    return ts_ms
+
+def curve(con, since_ms=None, max_points=None):
+    """Equity-Kurve [date, equity_usdt, drawdown_pct] ab 'since_ms'.
+
+    Mehr als 'max_points' Snapshots werden in gleich breite Zeit-Buckets verdichtet
+    (je Bucket der letzte Snapshot) – direkt in SQLite, es kommen nur die Punkte zurück.
+    """
+    max_points = max_points or MAX_POINTS
+    since_ms = int(since_ms or 0)
+    lo, hi, n = con.execute("SELECT MIN(ts), MAX(ts), COUNT(*) FROM snapshots WHERE ts >= ?",
+                            (since_ms,)).fetchone()
+    if not n:
+        return pd.DataFrame(columns=["date", "equity_usdt", "drawdown_pct"])
+    if n <= max_points:
+        rows = con.execute("SELECT ts, equity_usdt FROM snapshots WHERE ts >= ? ORDER BY ts",
+                           (since_ms,)).fetchall()
+    else:
+        step = (hi - lo) // max_points + 1
+        # SQLite: bei MAX() stammen die übrigen Spalten aus derselben Zeile
+        rows = con.execute("SELECT MAX(ts), equity_usdt FROM snapshots WHERE ts >= ? "
+                           "GROUP BY (ts - ?) / ? ORDER BY 1", (since_ms, lo, step)).fetchall()
+    ts = np.array([r[0] for r in rows], dtype=np.int64)
+    eq = np.array([r[1] for r in rows], dtype=np.float64)
+    return pd.DataFrame({
+        "date": pd.to_datetime(ts, unit="ms", utc=True).strftime("%Y-%m-%d %H:%M"),
+        "equity_usdt": eq,
+        "drawdown_pct": _drawdown(eq),
+    })
+
+def _drawdown(eq):
+    peak = np.maximum.accumulate(eq)
+    return np.where(peak > 0, 100.0 * (eq / np.where(peak > 0, peak, 1.0) - 1.0), 0.0)
+
+def combine(curves):
+    """Summe mehrerer Kurven (z. B. je Konto) auf dem gemeinsamen Zeitraster.
+
+    Jede Kurve gilt bis zu ihrem nächsten Punkt weiter; vor ihrem ersten Punkt zählt ihr
+    erster Wert. Drawdown wird für die Summe neu berechnet.
+    """
+    curves = [c for c in curves if len(c)]
+    if not curves:
+        return pd.DataFrame(columns=["date", "equity_usdt", "drawdown_pct"])
+    wide = pd.concat([c.groupby("date")["equity_usdt"].last() for c in curves], axis=1).sort_index()
+    eq = wide.ffill().bfill().sum(axis=1).to_numpy(dtype=np.float64)
+    return pd.DataFrame({"date": wide.index.to_numpy(), "equity_usdt": eq, "drawdown_pct": _drawdown(eq)})
+
+def max_drawdown(df_eq):
+    """Größter Rückgang vom Hoch in % (negativ) – NaN ohne Daten."""
+    if df_eq.empty or "drawdown_pct" not in df_eq:
+        return float("nan")
+    return float(df_eq["drawdown_pct"].min())
+
+def roi(df_eq):
+    """ROI über den Zeitraum: letzter / erster Snapshot (Ein-/Auszahlungen sind nicht bereinigt)."""
+    if len(df_eq) < 2:
+        return float("nan")
+    first, last = float(df_eq["equity_usdt"].iloc[0]), float(df_eq["equity_usdt"].iloc[-1])
+    if first <= 0:
+        return float("nan")
+    return 100.0 * (last / first - 1.0)
+
+def latest(con):
+    """Letzter Snapshot als (ts_ms, equity_usdt) – ohne Snapshot (None, NaN)."""
+    row = con.execute("SELECT ts, equity_usdt FROM snapshots ORDER BY ts DESC LIMIT 1").fetchone()
+    return (row[0], float(row[1])) if row else (None, float("nan"))
+
+def assets_at(con, ts_ms):
+    """Bestand des letzten Snapshots bis 'ts_ms' (market_type, asset, qty, price_usdt, value_usdt)."""
+    row = con.execute("SELECT MAX(ts) FROM snapshots WHERE ts <= ?", (int(ts_ms),)).fetchone()
+    if not row or row[0] is None:
+        return pd.DataFrame(columns=["market_type", "asset", "qty", "price_usdt", "value_usdt"])
+    return pd.read_sql_query("SELECT market_type, asset, qty, price_usdt, value_usdt FROM snapshot_assets "
+                             "WHERE ts = ? ORDER BY value_usdt DESC", con, params=(row[0],))
@@ -0,0 +1,119 @@
+import os, json, time, hashlib, threading
+import ccxt
+
+import metrics
+
+# ========= Gemeinsame Exchange-Instanzen + Markets-Cache =========
+# Eine ccxt-Instanz je Markt-Typ (und API-Key) für den ganzen Prozess, alle mit derselben
+# Marktliste. Sie kommt aus einer JSON-Datei; ist diese älter als MARKETS_TTL_HOURS, wird sie sofort
+# trotzdem benutzt und im Hintergrund neu geladen (nur bei Änderung neu geschrieben).
+MARKETS_CACHE = os.getenv("MARKETS_CACHE", "data/markets_mexc.json")
+MARKETS_TTL_HOURS = float(os.getenv("MARKETS_TTL_HOURS", "24"))
+
+_instances = {}
+_lock = threading.Lock()
+_refresh = None
+
+def _read_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _digest(markets, currencies):
+    raw = json.dumps([markets, currencies], sort_keys=True, default=str).encode()
+    return hashlib.sha256(raw).hexdigest()
+
+def _write_cache(path, markets, currencies, old=None):
+    """Cache schreiben; unveränderte Märkte (gleicher Hash) -> nur Zeitstempel erneuern."""
+    digest = _digest(markets, currencies)
+    if old and old.get("hash") == digest:
+        old["fetched_at"] = time.time()
+        data = old
+    else:
+        data = {"fetched_at": time.time(), "hash": digest, "markets": markets, "currencies": currencies}
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    # tmp je Prozess: mehrere Konten (accounts.fan_out) können gleichzeitig schreiben
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, default=str)
+    os.replace(tmp, path)
+    return data
+
+def _fetch_markets(config):
+    """Marktliste frisch von MEXC laden (eigene Instanz -> threadsicher)."""
+    e = ccxt.mexc(dict(config))
+    e.load_markets()
+    return e.markets, e.currencies
+
+def _refresh_in_background(config, path, old):
+    global _refresh
+    def run():
+        try:
+            markets, currencies = _fetch_markets(config)
+            _write_cache(path, markets, currencies, old)
+        except Exception as e:
+            # alter Cache bleibt gültig, nächster Lauf versucht es erneut
+            metrics.add_error(e)
+            print(f"Märkte-Aktualisierung fehlgeschlagen (Cache bleibt): {type(e).__name__}: {e}")
+    # kein Daemon-Thread: der Cron-Lauf wartet am Ende, bis der Cache geschrieben ist
+    _refresh = threading.Thread(target=run, name="markets-refresh")
+    _refresh.start()
+
+def load_markets_cached(e, config, path=None, ttl_hours=None):
+    """Märkte aus dem Datei-Cache setzen; fehlend -> synchron laden, veraltet -> Hintergrund."""
+    path = path or MARKETS_CACHE
+    ttl = (MARKETS_TTL_HOURS if ttl_hours is None else ttl_hours) * 3600
+    cached = _read_cache(path)
+    if cached and cached.get("markets"):
+        e.set_markets(cached["markets"], cached.get("currencies"))
+        if time.time() - cached.get("fetched_at", 0) > ttl and _refresh is None:
+            _refresh_in_background(config, path, cached)
+        return e
+    e.load_markets()
+    _write_cache(path, e.markets, e.currencies)
+    return e
+
+def get_exchange(default_type="spot", api_key="", secret=""):
+    """Gemeinsame ccxt.mexc-Instanz für Markt-Typ + Key (Märkte aus dem Cache)."""
+    key = (default_type, api_key)
+    with _lock:
+        if key not in _instances:
+            config = {
+                "apiKey": api_key,
+                "secret": secret,
+                "enableRateLimit": True,
+                "options": {"defaultType": default_type},
+                "timeout": 20000,
+            }
+            # umhüllt für metrics.json (Aufrufe, Requests, Rate-Limit-Wartezeit)
+            e = metrics.instrument(ccxt.mexc(config))
+            # gleiche Börse: Märkte einer vorhandenen Instanz übernehmen (weitere Konten,
+            # per fork geerbte Instanzen) statt den Datei-Cache erneut zu lesen
+            other = next((i for i in _instances.values() if i.markets), None)
+            with metrics.stage("load_markets"):
+                if other is not None:
+                    e.set_markets(other.markets, other.currencies)
+                else:
+                    load_markets_cached(e, config)
+            _instances[key] = e
+        return _instances[key]
+
+def reload_markets(path=None):
+    """Marktliste neu laden (Dauerbetrieb, z. B. täglich) und an alle Instanzen verteilen.
+
+    Gibt True zurück, wenn sich die Märkte geändert haben; der Datei-Cache wird mitgeführt.
+    """
+    path = path or MARKETS_CACHE
+    with _lock:
+        insts = list(_instances.values())
+    markets, currencies = _fetch_markets({"enableRateLimit": True, "timeout": 20000})
+    old = _read_cache(path)
+    changed = not old or old.get("hash") != _digest(markets, currencies)
+    _write_cache(path, markets, currencies, old)
+    if changed:
+        for e in insts:
+            e.set_markets(markets, currencies)
+    return changed
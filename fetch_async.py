@@ -0,0 +1,185 @@
+import os, time, asyncio
+
+import store
+import retry
+import metrics
+
+# ========= Async-Fetch-Engine =========
+# Holt die Trades vieler Symbole parallel (ccxt.async_support) – begrenzt durch
+# einen gemeinsamen Token-Bucket je Markt-Typ statt Pause nach jedem Symbol.
+# Je Symbol adaptive Zeitfenster: volle Seiten werden halbiert, Lücken gemeldet.
+CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "8"))
+# Seitengröße = Maximum der Endpunkte (Spot myTrades 'limit', Kontrakt order_deals 'page_size')
+PAGE_LIMIT = {"spot": 100, "swap": 100}
+# größtes Zeitfenster je Anfrage (Spot: ein Monat, Kontrakte: 90 Tage wie ccxt maxTimeTillEnd)
+MAX_WINDOW_MS = {
+    "spot": int(float(os.getenv("MEXC_SPOT_WINDOW_DAYS", "30")) * 86400000),
+    "swap": int(float(os.getenv("MEXC_SWAP_WINDOW_DAYS", "90")) * 86400000),
+}
+END_PARAM = {"spot": "endTime", "swap": "end_time"}
+# Budget je Symbol (Anfragen); danach abbrechen, Rest als Lücke melden, nächster Lauf macht weiter
+MAX_PAGES_PER_SYMBOL = int(os.getenv("FETCH_MAX_PAGES_PER_SYMBOL", "500"))
+FILL_TARGET = 0.8   # angestrebter Füllgrad einer Seite beim Anpassen der Fenstergröße
+
+# MEXC-Limits: Spot 500 Gewicht / 10 s (myTrades = Gewicht 10),
+# Kontrakte 20 Requests / 2 s. Als Gewicht pro Sekunde + Gewicht pro Aufruf.
+WEIGHT_PER_SEC = {
+    "spot": float(os.getenv("MEXC_SPOT_WEIGHT_PER_SEC", "50")),
+    "swap": float(os.getenv("MEXC_SWAP_WEIGHT_PER_SEC", "10")),
+}
+TRADES_WEIGHT = {"spot": 10, "swap": 1}
+# Burst = ganzes Limit-Fenster (Spot 10 s, Kontrakte 2 s); Drosselung der Börse senkt die
+# Rate (halbieren), jede erfolgreiche Anfrage hebt sie wieder ein Stück Richtung Maximum
+BURST_SEC = {"spot": 10.0, "swap": 2.0}
+THROTTLE_FACTOR = 0.5
+RECOVER_STEP = 0.02      # Anteil der Maximalrate je erfolgreicher Anfrage
+MIN_RATE_SHARE = 0.1     # nie unter 10 % der Maximalrate
+
+class TokenBucket:
+    """Token-Bucket für asyncio: 'rate' Gewicht/s, Burst bis 'capacity'.
+
+    Adaptiv (AIMD): throttled() halbiert die Rate und pausiert den Bucket,
+    succeeded() nähert sie wieder der konfigurierten Maximalrate an.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.max_rate = self.rate = float(rate)
+        self.min_rate = self.max_rate * MIN_RATE_SHARE
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.waited = 0.0
+        self.throttles = 0
+        self._lock = asyncio.Lock()
+
+    def throttled(self, pause=0.0):
+        """Börse hat gedrosselt: Rate senken, Burst verwerfen und 'pause' Sekunden nichts ausgeben."""
+        self.throttles += 1
+        self.rate = max(self.min_rate, self.rate * THROTTLE_FACTOR)
+        self.tokens = min(self.tokens, 0.0) - pause * self.rate
+
+    def succeeded(self):
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVER_STEP)
+
+    async def acquire(self, weight=1):
+        # Lock während des Wartens halten -> Anfragen werden in Reihenfolge bedient
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                wait = (weight - self.tokens) / self.rate
+                self.waited += wait
+                await asyncio.sleep(wait)
+
+def make_async_ex(ex):
+    """Async-Pendant zu einer synchronen ccxt-Instanz (gleiche Keys/Optionen, Märkte übernommen)."""
+    import ccxt.async_support as ccxt_async
+    aex = ccxt_async.mexc({
+        "apiKey": ex.apiKey,
+        "secret": ex.secret,
+        # Drosselung übernimmt der Token-Bucket
+        "enableRateLimit": False,
+        "options": dict(ex.options),
+        "timeout": ex.timeout,
+    })
+    aex.set_markets(ex.markets, ex.currencies)
+    return metrics.instrument(aex)
+
+async def _fetch_symbol(ex, bucket, sem, market_type, sym, since_ms, until_ms=None):
+    """Scannt ein Symbol in Zeitfenstern von 'since_ms' bis jetzt.
+
+    Ein Fenster ist vollständig, wenn die Seite nicht voll ist. Volle Seiten halbieren das
+    Fenster (Bisektion, gleicher Start), danach folgt die Fenstergröße der beobachteten
+    Dichte. MEXC kennt bei myTrades kein fromId, daher nur über die Zeit.
+    Rückgabe: (trades, vollständig bis ms, Lücken [(von, bis, Grund)]).
+    """
+    limit = PAGE_LIMIT.get(market_type, 100)
+    max_win = MAX_WINDOW_MS.get(market_type, MAX_WINDOW_MS["spot"])
+    end = until_ms or int(time.time() * 1000)
+    lo, win = since_ms, max_win
+    out, gaps, pages = [], [], 0
+    weight = TRADES_WEIGHT.get(market_type, 1)
+
+    async def gate():
+        await bucket.acquire(weight)
+
+    async with sem:
+        while lo <= end:
+            if pages >= MAX_PAGES_PER_SYMBOL:
+                gaps.append((lo, end, "budget"))
+                return out, lo, gaps
+            hi = min(lo + win - 1, end)
+            pages += 1
+            try:
+                # Timeouts/429 werden wiederholt (Backoff, Bucket gedrosselt); Auth-Fehler brechen ab
+                batch = await retry.acall(ex.fetch_my_trades, sym, since=lo, limit=limit,
+                                          params={END_PARAM.get(market_type, "endTime"): hi},
+                                          ex=ex, gate=gate, on_throttle=bucket.throttled)
+            except Exception as e:
+                if retry.classify(e) == "fatal":
+                    raise
+                metrics.add_error(e)
+                gaps.append((lo, end, type(e).__name__))
+                return out, lo, gaps
+            bucket.succeeded()
+            if len(batch) >= limit:
+                if hi > lo:
+                    # mindestens 'limit' Fills im Zeitraum der Seite -> Fenster auf diese Dichte
+                    # schätzen, höchstens aber halbieren (dann gilt die Bisektion)
+                    ts = [t.get("timestamp") or lo for t in batch]
+                    dense = int((max(ts) - min(ts) + 1) * FILL_TARGET)
+                    win = max(1, min((hi - lo + 1) // 2, dense))
+                    continue
+                # mehr als 'limit' Fills in einer Millisekunde – ohne fromId nicht teilbar
+                gaps.append((lo, lo, "saturated_ms"))
+            # falls der Endpunkt das Fensterende ignoriert: nichts doppelt übernehmen
+            out += [t for t in batch if (t.get("timestamp") or lo) <= hi]
+            span = hi - lo + 1
+            win = min(max_win, max(1, int(span * FILL_TARGET * limit / len(batch)) if batch else span * 2))
+            lo = hi + 1
+    return out, end, gaps
+
+async def fetch_symbols_async(ex, market_type, symbols, since_ms, con=None, concurrency=None):
+    """Alle 'symbols' parallel holen; mit Store ab Cursor und direkt gespeichert."""
+    sem = asyncio.Semaphore(concurrency or CONCURRENCY)
+    rate = WEIGHT_PER_SEC.get(market_type, 10)
+    bucket = TokenBucket(rate, rate * BURST_SEC.get(market_type, 1.0))
+    truncated = []
+
+    async def one(sym):
+        since = store.get_cursor(con, market_type, sym, since_ms) if con else since_ms
+        got, scanned_until, gaps = await _fetch_symbol(ex, bucket, sem, market_type, sym, since)
+        for lo, hi, reason in gaps:
+            metrics.add_truncated(market_type, sym, lo, hi, reason)
+            truncated.append(sym)
+        if con:
+            # läuft im selben Thread wie die Event-Loop -> SQLite-Zugriff ist unkritisch
+            store.add_trades(con, market_type, sym, got, scanned_until)
+        return got
+
+    out = []
+    # Reihenfolge der Symbole bleibt erhalten (wie beim sequentiellen Durchlauf)
+    for got in await asyncio.gather(*(one(s) for s in symbols)):
+        out += got
+    metrics.add_wait(bucket.waited)
+    if bucket.throttles:
+        print(f"Gedrosselt ({market_type}): {bucket.throttles}x, Rate zuletzt {bucket.rate:.1f}/{bucket.max_rate:.0f} Gewicht/s")
+    if truncated:
+        print(f"Unvollständig ({market_type}):", ", ".join(sorted(set(truncated))))
+    return out
+
+def fetch_symbols(ex, market_type, symbols, since_ms, con=None, async_ex=None):
+    """Synchroner Einstieg: baut (falls nötig) die Async-Instanz und wartet auf das Ergebnis."""
+    async def run():
+        aex = async_ex or make_async_ex(ex)
+        try:
+            return await fetch_symbols_async(aex, market_type, symbols, since_ms, con)
+        finally:
+            if async_ex is None:
+                await aex.close()
+    return asyncio.run(run())
@@ -0,0 +1,154 @@
+import os, json, time, datetime as dt
+import numpy as np
+import pandas as pd
+import requests
+
+import ohlcv
+import metrics
+
+# ========= EUR-Kurse (Tages-Cache) =========
+# EUR je USDT pro Tag in data/fx_eur.json; dazu der schon abgefragte Zeitraum, damit
+# nur fehlende Tage (Anfang/Ende) nachgeholt werden – im Normalfall höchstens einmal am
+# Tag ein Request, sonst keiner. Quellen der Reihe nach (FX_SOURCES), die erste mit Daten gilt:
+#   file      lokale CSV (FX_FILE: date,eur_per_usdt)
+#   exchange  EUR-Paar der Börse als Tageskerzen über den OHLCV-Cache
+#   ecb       EZB-Referenzkurse EUR/USD (frankfurter.app), USDT ~ USD
+# Lookup "as-of": Kurs des Tages oder des letzten Tages davor (Wochenenden, Feiertage).
+FX_PATH = os.getenv("FX_PATH", "data/fx_eur.json")
+FX_SOURCES = tuple(s.strip() for s in os.getenv("FX_SOURCES", "file,exchange,ecb").split(",") if s.strip())
+FX_FILE = os.getenv("FX_FILE", "")
+FX_FALLBACK = float(os.getenv("FX_FALLBACK", "0.92"))     # nur ohne jeden Kurs im Cache
+FX_RETRY_HOURS = float(os.getenv("FX_RETRY_HOURS", "6"))  # nach Fehlschlag so lange nicht erneut versuchen
+ECB_URL = "https://api.frankfurter.app/{start}..{end}?from=USD&to=EUR"
+# Börsen-Paare: (Symbol, invers) – invers: Kurs ist USDT je EUR; EURC als Euro-Stablecoin
+EXCHANGE_PAIRS = (("EUR/USDT", True), ("USDT/EUR", False), ("EURC/USDT", True))
+
+def _day(d):
+    return d.isoformat()
+
+def _ms(day):
+    return int(dt.datetime.fromisoformat(day).replace(tzinfo=dt.timezone.utc).timestamp() * 1000)
+
+# ---- Quellen: (erster Tag, letzter Tag, Exchange) -> {Tag: EUR je USDT} --------
+
+def _from_file(start, end, ex=None):
+    if not FX_FILE or not os.path.exists(FX_FILE):
+        return {}
+    df = pd.read_csv(FX_FILE, dtype={"date": str})
+    df = df[(df["date"] >= start) & (df["date"] <= end)]
+    return dict(zip(df["date"], df.iloc[:, 1].astype(float)))
+
+def _from_exchange(start, end, ex=None):
+    if ex is None:
+        return {}
+    for sym, inverse in EXCHANGE_PAIRS:
+        if sym in (ex.markets or {}):
+            ohlcv.update(ex, sym, "1d", _ms(start), _ms(end) + 86400000)
+            arr = ohlcv.load(sym, "1d")
+            days = pd.to_datetime(arr["ts"], unit="ms", utc=True).strftime("%Y-%m-%d")
+            close = np.asarray(arr["close"], dtype=np.float64)
+            rates = 1.0 / close if inverse else close
+            return {d: float(r) for d, r in zip(days, rates) if start <= d <= end and r > 0}
+    return {}
+
+def _from_ecb(start, end, ex=None):
+    r = requests.get(ECB_URL.format(start=start, end=end), timeout=10)
+    r.raise_for_status()
+    return {d: float(v["EUR"]) for d, v in (r.json().get("rates") or {}).items() if start <= d <= end}
+
+SOURCES = {"file": _from_file, "exchange": _from_exchange, "ecb": _from_ecb}
+
+class Rates:
+    """EUR je USDT pro Tag aus dem Cache; ensure() holt fehlende Tage."""
+
+    def __init__(self, path=None, sources=None):
+        self.path = path or FX_PATH
+        self.sources = tuple(sources or FX_SOURCES)
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.cache = json.load(f)
+        except (OSError, ValueError):
+            self.cache = {}
+        self.rates = self.cache.setdefault("rates", {})
+        self._keys = None
+
+    def _save(self):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.cache, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def _fetch(self, start, end, ex):
+        for name in self.sources:
+            try:
+                got = SOURCES[name](start, end, ex)
+            except Exception as e:
+                metrics.add_error(e)
+                continue
+            if got:
+                return got
+        return None
+
+    def ensure(self, since_ms, ex=None, now_ms=None):
+        """Zeitraum ab 'since_ms' bis gestern abdecken (heute ist noch kein Tageskurs fest).
+
+        Gibt die Zahl neuer Tageskurse zurück; ohne Lücke kein Request.
+        """
+        now_ms = now_ms or int(time.time() * 1000)
+        want_from = _day(dt.datetime.fromtimestamp(since_ms / 1000, dt.timezone.utc).date())
+        want_to = _day(dt.datetime.fromtimestamp(now_ms / 1000, dt.timezone.utc).date() - dt.timedelta(days=1))
+        have_from, have_to = self.cache.get("from"), self.cache.get("to")
+        if have_from is None:
+            gaps = [(want_from, want_to)]
+        else:
+            gaps = []
+            if want_from < have_from:
+                gaps.append((want_from, _day(dt.date.fromisoformat(have_from) - dt.timedelta(days=1))))
+            if have_to < want_to:
+                gaps.append((_day(dt.date.fromisoformat(have_to) + dt.timedelta(days=1)), want_to))
+        gaps = [(a, b) for a, b in gaps if a <= b]
+        if not gaps or now_ms / 1000 - self.cache.get("failed_at", 0) < FX_RETRY_HOURS * 3600:
+            return 0
+        added = 0
+        for start, end in gaps:
+            got = self._fetch(start, end, ex)
+            if got is None:
+                self.cache["failed_at"] = now_ms / 1000
+                break
+            self.rates.update(got)
+            added += len(got)
+            self.cache["from"] = min(start, have_from or start)
+            self.cache["to"] = max(end, have_to or end)
+            have_from, have_to = self.cache["from"], self.cache["to"]
+        else:
+            self.cache.pop("failed_at", None)
+        self._keys = None
+        self._save()
+        return added
+
+    def asof(self, dates):
+        """EUR je USDT für 'dates' ('YYYY-MM-DD…', Array) – letzter Kurs am oder vor dem Tag."""
+        days = np.asarray([str(d)[:10] for d in dates], dtype=object)
+        if not self.rates:
+            return np.full(len(days), FX_FALLBACK)
+        if self._keys is None:
+            self._keys = np.array(sorted(self.rates), dtype=object)
+            self._vals = np.array([self.rates[k] for k in self._keys], dtype=np.float64)
+        i = np.searchsorted(self._keys, days, side="right") - 1
+        # vor dem ersten bekannten Tag: erster Kurs
+        return self._vals[np.maximum(i, 0)]
+
+    def latest(self):
+        """Jüngster bekannter Kurs (für aktuelle Bestände)."""
+        if not self.rates:
+            return FX_FALLBACK
+        return float(self.rates[max(self.rates)])
+
+def to_eur(df, col, rates, date_col="date", out=None):
+    """Spalte 'col' (USDT) je Zeile mit dem Kurs ihres Tages in EUR umrechnen."""
+    out = out or col.replace("_usdt", "_eur")
+    if df.empty:
+        return df.assign(**{out: pd.Series(dtype=np.float64)})
+    return df.assign(**{out: df[col].to_numpy(dtype=np.float64) * rates.asof(df[date_col].to_numpy())})
@@ -0,0 +1,88 @@
+import os, json, gzip
+
+try:
+    import orjson       # optional: schneller, kompakter, versteht numpy
+except ImportError:
+    orjson = None
+
+# ========= Kompakte, gestreamte JSON-Ausgabe =========
+# Große Listen (Einzel-Trades, Copytrades) werden nicht als Ganzes materialisiert: Zeilen
+# kommen in Blöcken (DataFrame-Slices, Store-Cursor), werden einzeln kodiert und zu Seiten
+# mit Zeilen- und Byte-Budget gebündelt (index.json + pNNNNN.json). Speicher ~ eine Seite,
+# unabhängig von der Länge der Historie.
+JSON_BACKEND = os.getenv("JSON_BACKEND", "auto")            # auto (orjson, falls installiert) | json
+PAGE_ROWS = int(os.getenv("JSON_PAGE_ROWS", "500"))
+PAGE_BYTES = int(os.getenv("JSON_PAGE_BYTES", str(512 * 1024)))
+# vorkomprimierte Kopien neben jeder Ausgabe ("gz", "br"; br braucht das Paket brotli) –
+# für Hosts, die sie ausliefern (GitHub Pages komprimiert selbst)
+PRECOMPRESS = tuple(s.strip() for s in os.getenv("PRECOMPRESS", "").split(",") if s.strip())
+
+def _default(o):
+    if hasattr(o, "item"):      # numpy-Skalare
+        return o.item()
+    return str(o)
+
+def dumps(obj):
+    """Kompaktes JSON als Bytes (orjson, sonst json)."""
+    if orjson is not None and JSON_BACKEND != "json":
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+def precompress(path, data):
+    """'.gz'/'.br'-Kopien nach PRECOMPRESS (deterministisch: gleicher Inhalt -> gleiche Datei)."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    for kind in PRECOMPRESS:
+        if kind == "gz":
+            write_atomic(path + ".gz", gzip.compress(data, 9, mtime=0))
+        elif kind == "br":
+            import brotli  # nur in diesem Modus
+            write_atomic(path + ".br", brotli.compress(data))
+
+def write_atomic(path, data):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data.encode("utf-8") if isinstance(data, str) else data)
+    os.replace(tmp, path)
+
+def write_file(path, data):
+    write_atomic(path, data)
+    precompress(path, data)
+
+def write_pages(root, chunks, columns, writer=None, page_rows=None, page_bytes=None):
+    """Zeilen (Iterable von Zeilen-Blöcken) als root/pNNNNN.json + root/index.json; gibt den Index zurück.
+
+    Eine Seite endet bei 'page_rows' Zeilen oder 'page_bytes' Bytes; jede Seite ist
+    {'columns': [...], 'rows': [[...], ...]}. Alte, überzählige Seiten werden gelöscht.
+    'writer(path, bytes)' ersetzt das Schreiben (z. B. Manifest.write).
+    """
+    writer = writer or write_file
+    page_rows = page_rows or PAGE_ROWS
+    page_bytes = page_bytes or PAGE_BYTES
+    os.makedirs(root, exist_ok=True)
+    head = b'{"columns":' + dumps(columns) + b',"rows":['
+    counts, buf, size, total = [], [], 0, 0
+
+    def flush(buf):
+        writer(os.path.join(root, f"p{len(counts):05d}.json"), head + b",".join(buf) + b"]}")
+        counts.append(len(buf))
+
+    for chunk in chunks:
+        for row in chunk:
+            b = dumps(row)
+            if buf and (len(buf) >= page_rows or size + len(b) > page_bytes):
+                flush(buf)
+                buf, size = [], 0
+            buf.append(b)
+            size += len(b) + 1
+            total += 1
+    if buf or not counts:
+        flush(buf)
+    for name in os.listdir(root):
+        if name.startswith("p") and name[1:6].isdigit() and name[6:].startswith(".json") and int(name[1:6]) >= len(counts):
+            os.remove(os.path.join(root, name))
+    index = {"total": total, "page_size": page_rows, "pages": len(counts), "rows": counts, "columns": columns}
+    writer(os.path.join(root, "index.json"), dumps(index))
+    return index
@@ -0,0 +1,99 @@
+import os, json, time, hashlib
+
+import jsonout
+
+# ========= Ausgabe-Manifest (Änderungserkennung) =========
+# data/manifest.json merkt sich je Ausgabedatei den Hash ihres *inhaltlichen* Stands
+# (ohne flüchtige Felder wie updated_at) und je Ausgabe-Satz ("scope") den Datenstand
+# des letzten Veröffentlichens. Dateien werden nur bei geändertem Hash (oder wenn sie
+# fehlen) geschrieben – atomar über eine Temp-Datei, ggf. mit .gz/.br (jsonout.PRECOMPRESS).
+# Bleibt der Datenstand gleich, entfallen Ausgaben, Commit und Pages-Deploy ganz
+# (siehe pipeline.main, $GITHUB_OUTPUT).
+MANIFEST_PATH = os.getenv("MANIFEST_PATH", "data/manifest.json")
+# spätestens nach so vielen Stunden trotzdem veröffentlichen (Bewertung ändert sich mit den Kursen)
+PUBLISH_MAX_AGE_H = float(os.getenv("PUBLISH_MAX_AGE_H", "24"))
+VOLATILE_KEYS = ("updated_at",)
+
+def digest(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+class Manifest:
+    """Hashes der Ausgaben + Datenstand je Scope; save() schreibt das Manifest zurück."""
+
+    def __init__(self, path=None):
+        self.path = path or MANIFEST_PATH
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+        self.files = self.data.setdefault("files", {})
+        self.scopes = self.data.setdefault("scopes", {})
+        self.changed, self.skipped = [], []
+
+    def write(self, path, data, semantic=None):
+        """'data' (str/bytes) nach 'path', wenn sich der Hash von 'semantic' (sonst 'data') geändert hat.
+
+        Gibt True zurück, wenn sich der Inhalt geändert hat. Fehlt die Datei bei gleichem
+        Hash (frischer Checkout), wird sie geschrieben, zählt aber nicht als Änderung.
+        """
+        key = os.path.normpath(path)
+        h = digest(data if semantic is None else semantic)
+        same = self.files.get(key) == h
+        if same and os.path.exists(path):
+            self.skipped.append(key)
+            return False
+        jsonout.write_file(path, data)
+        if not same:
+            self.files[key] = h
+            self.changed.append(key)
+        return not same
+
+    def write_json(self, path, obj, volatile=VOLATILE_KEYS):
+        """Kompaktes JSON (jsonout.dumps); flüchtige Schlüssel der obersten Ebene zählen nicht zum Hash."""
+        semantic = None
+        if isinstance(obj, dict) and any(k in obj for k in volatile):
+            semantic = jsonout.dumps({k: v for k, v in obj.items() if k not in volatile})
+        return self.write(path, jsonout.dumps(obj), semantic)
+
+    def write_csv(self, path, df):
+        """Wie write(), aber gestreamt: df.to_csv in eine Temp-Datei, Hash blockweise darüber
+        (trades_all.csv muss nicht als ein String in den Speicher)."""
+        key = os.path.normpath(path)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        df.to_csv(tmp, index=False)
+        h = hashlib.sha256()
+        with open(tmp, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        h = h.hexdigest()
+        same = self.files.get(key) == h
+        if same and os.path.exists(path):
+            os.remove(tmp)
+            self.skipped.append(key)
+            return False
+        os.replace(tmp, path)
+        if jsonout.PRECOMPRESS:
+            with open(path, "rb") as f:
+                jsonout.precompress(path, f.read())
+        if not same:
+            self.files[key] = h
+            self.changed.append(key)
+        return not same
+
+    def unchanged(self, scope, state, now=None):
+        """True, wenn 'scope' mit demselben Datenstand zuletzt vor weniger als PUBLISH_MAX_AGE_H
+        veröffentlicht wurde."""
+        s = self.scopes.get(scope) or {}
+        now = now or time.time()
+        return s.get("state") == state and now - s.get("published_at", 0) < PUBLISH_MAX_AGE_H * 3600
+
+    def published(self, scope, state, now=None):
+        self.scopes[scope] = {"state": state, "published_at": now or time.time()}
+
+    def save(self):
+        jsonout.write_atomic(self.path, json.dumps(self.data, separators=(",", ":"), sort_keys=True))
@@ -0,0 +1,256 @@
+import os, json, time, inspect, threading, contextvars
+from collections import defaultdict
+from contextlib import contextmanager
+
+# ========= Laufzeit-Metriken =========
+# Ein prozessweiter Sammler: Wandzeit je Stufe, ccxt-Aufrufe je Methode + Symbol,
+# HTTP-Requests/Bytes, Wartezeit im Rate-Limit, Retries und Fehler. Exchanges werden
+# per instrument() umhüllt (gleiches Verhalten, nur gezählt); write() legt metrics.json
+# (und mit METRICS_PROM=1 zusätzlich metrics.prom im Prometheus-Textformat) ab.
+METRICS_PROM = os.getenv("METRICS_PROM", "") not in ("", "0")
+
+# Methoden, die wir zählen (alles, was die Skripte an ccxt aufrufen)
+METHODS = ("load_markets", "fetch_my_trades", "fetch_balance", "fetch_ticker", "fetch_tickers",
+           "fetch_open_orders", "fetch_positions", "fetch_positions_history", "fetch_funding_history",
+           "fetch_ohlcv")
+
+_lock = threading.Lock()
+# verschachtelte Aufrufe (z. B. load_markets in fetch_my_trades) nicht doppelt zählen
+_depth = contextvars.ContextVar("metrics_depth", default=0)
+
+def _empty():
+    return {
+        "started_at": time.time(),
+        "stages": {},                                       # Name -> {seconds, runs}
+        "methods": defaultdict(lambda: {"calls": 0, "errors": 0, "seconds": 0.0}),
+        "symbols": defaultdict(lambda: defaultdict(int)),   # Methode -> Symbol -> Aufrufe
+        "http": {"requests": 0, "bytes": 0},
+        "rate_limit_wait_s": 0.0,
+        "retries": 0,
+        "errors": defaultdict(int),                         # Exception-Klasse -> Anzahl
+        "truncated": [],                                    # nicht vollständig geholte Zeitfenster
+        "incomplete": [],                                   # fehlende Teile (Balance, Ticker) nach allen Retries
+    }
+
+_m = _empty()
+
+def reset():
+    global _m
+    with _lock:
+        _m = _empty()
+
+@contextmanager
+def stage(name):
+    """Wandzeit eines Abschnitts messen (mehrfach aufrufbar, Zeiten werden addiert)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        secs = time.perf_counter() - t0
+        with _lock:
+            row = _m["stages"].setdefault(name, {"seconds": 0.0, "runs": 0})
+            row["seconds"] += secs
+            row["runs"] += 1
+
+def add_wait(seconds):
+    with _lock:
+        _m["rate_limit_wait_s"] += seconds
+
+def add_retry(n=1):
+    with _lock:
+        _m["retries"] += n
+
+def add_error(exc):
+    """Auch abgefangene Fehler ('except Exception: pass') sichtbar machen."""
+    with _lock:
+        _m["errors"][type(exc).__name__] += 1
+
+def add_truncated(market_type, symbol, since_ms, until_ms, reason):
+    with _lock:
+        _m["truncated"].append({"market_type": market_type, "symbol": symbol,
+                                "from": since_ms, "to": until_ms, "reason": reason})
+
+def add_incomplete(market_type, what, reason):
+    with _lock:
+        _m["incomplete"].append({"market_type": market_type, "symbol": what, "reason": reason})
+
+def mark():
+    """Stand der Lücken-Listen; incomplete_since(mark()) liefert nur, was danach dazukam."""
+    with _lock:
+        return len(_m["truncated"]), len(_m["incomplete"])
+
+def trim(start):
+    """Lücken vor 'start' (mark()) und die Symbol-Zähler verwerfen – für langlebige Prozesse
+    (scripts/daemon_mexc.py); gibt den Mark zurück, der danach auf 'start' zeigt."""
+    with _lock:
+        del _m["truncated"][:start[0]]
+        del _m["incomplete"][:start[1]]
+        _m["symbols"].clear()
+    return 0, 0
+
+def incomplete_since(start=(0, 0)):
+    """Unvollständige Symbole/Teile seit 'start' (je Markt-Typ + Symbol einmal, Gründe gesammelt)."""
+    with _lock:
+        rows = _m["truncated"][start[0]:] + _m["incomplete"][start[1]:]
+    out = {}
+    for r in rows:
+        row = out.setdefault((r["market_type"], r["symbol"]),
+                             {"market_type": r["market_type"], "symbol": r["symbol"], "reasons": []})
+        if r["reason"] not in row["reasons"]:
+            row["reasons"].append(r["reason"])
+    return list(out.values())
+
+def _record(method, symbol, secs, exc):
+    with _lock:
+        row = _m["methods"][method]
+        row["calls"] += 1
+        row["seconds"] += secs
+        if exc is not None:
+            row["errors"] += 1
+            _m["errors"][type(exc).__name__] += 1
+        if symbol:
+            _m["symbols"][method][symbol] += 1
+
+def _symbol(args, kw):
+    sym = kw.get("symbol", args[0] if args else None)
+    return sym if isinstance(sym, str) else None
+
+def _wrap_method(name, fn):
+    def sync_wrapper(*args, **kw):
+        outer = _depth.get() == 0
+        tok = _depth.set(_depth.get() + 1)
+        t0, exc = time.perf_counter(), None
+        try:
+            return fn(*args, **kw)
+        except Exception as e:
+            exc = e
+            raise
+        finally:
+            _depth.reset(tok)
+            if outer:
+                _record(name, _symbol(args, kw), time.perf_counter() - t0, exc)
+
+    async def async_wrapper(*args, **kw):
+        outer = _depth.get() == 0
+        tok = _depth.set(_depth.get() + 1)
+        t0, exc = time.perf_counter(), None
+        try:
+            return await fn(*args, **kw)
+        except Exception as e:
+            exc = e
+            raise
+        finally:
+            _depth.reset(tok)
+            if outer:
+                _record(name, _symbol(args, kw), time.perf_counter() - t0, exc)
+
+    return async_wrapper if inspect.iscoroutinefunction(fn) else sync_wrapper
+
+def _wrap_fetch(ex, fn, is_async):
+    """ccxt-HTTP-Ebene: jeder Request + Antwortgröße."""
+    def count():
+        with _lock:
+            _m["http"]["requests"] += 1
+            _m["http"]["bytes"] += len(getattr(ex, "last_http_response", None) or "")
+
+    if is_async:
+        async def afetch(*args, **kw):
+            try:
+                return await fn(*args, **kw)
+            finally:
+                count()
+        return afetch
+
+    def fetch(*args, **kw):
+        try:
+            return fn(*args, **kw)
+        finally:
+            count()
+    return fetch
+
+def _wrap_throttle(fn, is_async):
+    """ccxt-eigener Rate-Limiter (enableRateLimit): Schlafzeit mitschreiben."""
+    if is_async:
+        async def athrottle(*args, **kw):
+            t0 = time.perf_counter()
+            try:
+                return await fn(*args, **kw)
+            finally:
+                add_wait(time.perf_counter() - t0)
+        return athrottle
+
+    def throttle(*args, **kw):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kw)
+        finally:
+            add_wait(time.perf_counter() - t0)
+    return throttle
+
+def instrument(ex):
+    """Exchange-Instanz (sync oder async) in-place umhüllen; mehrfacher Aufruf ist harmlos."""
+    if getattr(ex, "_metrics_wrapped", False):
+        return ex
+    for name in METHODS:
+        fn = getattr(ex, name, None)
+        if callable(fn):
+            setattr(ex, name, _wrap_method(name, fn))
+    fetch = getattr(ex, "fetch", None)
+    if callable(fetch):
+        ex.fetch = _wrap_fetch(ex, fetch, inspect.iscoroutinefunction(fetch))
+    throttle = getattr(ex, "throttle", None)
+    if callable(throttle):
+        ex.throttle = _wrap_throttle(throttle, inspect.iscoroutinefunction(throttle))
+    ex._metrics_wrapped = True
+    return ex
+
+def snapshot():
+    """Aktueller Stand als JSON-fähiges Dict."""
+    with _lock:
+        return {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(_m["started_at"])),
+            "wall_s": round(time.time() - _m["started_at"], 3),
+            "stages": {k: {"seconds": round(v["seconds"], 4), "runs": v["runs"]}
+                       for k, v in _m["stages"].items()},
+            "methods": {k: {"calls": v["calls"], "errors": v["errors"], "seconds": round(v["seconds"], 4)}
+                        for k, v in _m["methods"].items()},
+            "symbols": {k: dict(v) for k, v in _m["symbols"].items()},
+            "http": dict(_m["http"]),
+            "rate_limit_wait_s": round(_m["rate_limit_wait_s"], 4),
+            "retries": _m["retries"],
+            "errors": dict(_m["errors"]),
+            "truncated": list(_m["truncated"]),
+            "incomplete": list(_m["incomplete"]),
+        }
+
+def to_prometheus(snap=None):
+    """Prometheus-Textformat (ohne Symbol-Aufschlüsselung – zu viele Labels)."""
+    s = snap or snapshot()
+    lines = ["# TYPE mexc_stage_seconds gauge"]
+    lines += [f'mexc_stage_seconds{{stage="{k}"}} {v["seconds"]}' for k, v in s["stages"].items()]
+    lines.append("# TYPE mexc_ccxt_calls_total counter")
+    lines += [f'mexc_ccxt_calls_total{{method="{k}"}} {v["calls"]}' for k, v in s["methods"].items()]
+    lines.append("# TYPE mexc_ccxt_errors_total counter")
+    lines += [f'mexc_ccxt_errors_total{{method="{k}"}} {v["errors"]}' for k, v in s["methods"].items()]
+    lines.append("# TYPE mexc_ccxt_seconds_total counter")
+    lines += [f'mexc_ccxt_seconds_total{{method="{k}"}} {v["seconds"]}' for k, v in s["methods"].items()]
+    lines += ["# TYPE mexc_http_requests_total counter", f'mexc_http_requests_total {s["http"]["requests"]}',
+              "# TYPE mexc_http_bytes_total counter", f'mexc_http_bytes_total {s["http"]["bytes"]}',
+              "# TYPE mexc_rate_limit_wait_seconds_total counter", f'mexc_rate_limit_wait_seconds_total {s["rate_limit_wait_s"]}',
+              "# TYPE mexc_retries_total counter", f'mexc_retries_total {s["retries"]}',
+              "# TYPE mexc_truncated_windows gauge", f'mexc_truncated_windows {len(s["truncated"])}',
+              "# TYPE mexc_incomplete_parts gauge", f'mexc_incomplete_parts {len(s["incomplete"])}',
+              "# TYPE mexc_run_seconds gauge", f'mexc_run_seconds {s["wall_s"]}']
+    return "\n".join(lines) + "\n"
+
+def write(outdir, prom=None):
+    """metrics.json (+ optional metrics.prom) nach 'outdir' schreiben; gibt den Pfad zurück."""
+    snap = snapshot()
+    os.makedirs(outdir, exist_ok=True)
+    path = os.path.join(outdir, "metrics.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snap, f, ensure_ascii=False, indent=1)
+    if METRICS_PROM if prom is None else prom:
+        with open(os.path.join(outdir, "metrics.prom"), "w", encoding="utf-8") as f:
+            f.write(to_prometheus(snap))
+    return path
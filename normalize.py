@@ -0,0 +1,77 @@
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+import store
+
+COLUMNS = ["date","timestamp","id","symbol","side","price","amount","cost","fee_cost","fee_ccy",
+           "is_copy","copy_trader"]
+CATEGORICAL = ("symbol","side","fee_ccy","copy_trader")
+
+# Heuristik: MEXC liefert für Copytrades je nach Segment Felder im 'info'
+COPY_FLAG_KEYS = frozenset(("copy","isCopy","copyFlag","strategyId","traderId","leaderId","followerId","followId"))
+# Häufige Felder für Trader/Strategy IDs (Reihenfolge = Priorität)
+TRADER_KEYS = ("traderId","leaderId","strategyId","strategyName","leaderName","traderName")
+COPY_KEYS = COPY_FLAG_KEYS | frozenset(TRADER_KEYS)
+
+def _dates(ts):
+    """ms-Zeitstempel -> 'YYYY-MM-DD' (einmal je Tag formatiert statt je Trade); 0 -> None."""
+    days, inv = np.unique(ts // 86400000, return_inverse=True)
+    labels = np.array([(dt.date(1970, 1, 1) + dt.timedelta(days=int(d))).isoformat() for d in days], dtype=object)
+    out = labels[inv]
+    out[ts == 0] = None
+    return out
+
+def df_from_trades(trades):
+    """Normiert ccxt-Trades in ein DataFrame + versucht Copytrade-Metadaten zu erkennen.
+
+    Spaltenweise aufgebaut (typisierte Arrays statt Dict je Trade); symbol, side, fee_ccy
+    und copy_trader sind Categoricals.
+    """
+    n = len(trades)
+    # vorallokierte Spaltenlisten (schneller als Element-Zuweisung in NumPy-Arrays),
+    # am Ende einmal in typisierte Arrays umgewandelt
+    ts, price, amount, cost, fee_cost = [0]*n, [0.0]*n, [0.0]*n, [0.0]*n, [0.0]*n
+    is_copy = [False]*n
+    ids, symbol, side, fee_ccy, copy_trader = [None]*n, [None]*n, [None]*n, [None]*n, [None]*n
+
+    for i, t in enumerate(trades):
+        ts[i] = t.get("timestamp") or 0
+        tid = t.get("id")
+        ids[i] = str(tid) if tid else store.trade_key(t)
+        symbol[i] = t.get("symbol")
+        side[i] = (t.get("side") or "").lower()
+        price[i] = t.get("price") or 0.0
+        amount[i] = t.get("amount") or 0.0
+        cost[i] = t.get("cost") or 0.0
+        fee = t.get("fee") or {}
+        fee_cost[i] = fee.get("cost") or 0.0
+        fee_ccy[i] = (fee.get("currency") or "").upper()
+        info = t.get("info") or {}
+        # ein Schnitt mit allen Copy-Keys; nur bei Treffer wird genauer geschaut
+        hits = COPY_KEYS.intersection(info) if info else None
+        if hits:
+            is_copy[i] = not COPY_FLAG_KEYS.isdisjoint(hits)
+            for k in TRADER_KEYS:
+                if k in hits:
+                    copy_trader[i] = str(info[k])
+                    break
+
+    ts = np.array(ts, dtype=np.int64)
+    df = pd.DataFrame({
+        "date": _dates(ts) if n else np.array([], dtype=object),
+        "timestamp": ts,
+        "id": ids,
+        "symbol": symbol,
+        "side": side,
+        "price": np.array(price, dtype=np.float64),
+        "amount": np.array(amount, dtype=np.float64),
+        "cost": np.array(cost, dtype=np.float64),
+        "fee_cost": np.array(fee_cost, dtype=np.float64),
+        "fee_ccy": fee_ccy,
+        "is_copy": np.array(is_copy, dtype=bool),
+        "copy_trader": copy_trader,
+    }, columns=COLUMNS)
+    for c in CATEGORICAL:
+        df[c] = df[c].astype("category")
+    return df
@@ -0,0 +1,265 @@
+import os, json, math, time, fcntl
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+import pnl
+import retry
+import metrics
+from pricing import STABLES, BRIDGES
+
+# ========= Historische Kurse (OHLCV-Cache) =========
+# Je Symbol und Zeitrahmen (1h, 1d) eine Datei mit festen Records (ts int64 + OHLCV
+# float64), nach Zeit sortiert, nur abgeschlossene Kerzen. Gelesen wird per np.memmap,
+# neue Kerzen werden angehängt; index.json merkt sich den schon abgefragten Zeitraum,
+# bekannte Kerzen (auch Lücken ohne Handel) werden nie erneut geholt.
+# Lookup "as-of": Schlusskurs der Kerze, die den Zeitpunkt enthält (searchsorted).
+# Schreiben läuft unter einer Dateisperre (mehrere Konten-Prozesse teilen den Cache).
+OHLCV_DIR = os.getenv("OHLCV_DIR", "data/ohlcv")
+OHLCV_LIMIT = int(os.getenv("OHLCV_LIMIT", "1000"))   # Kerzen je Anfrage (MEXC-Maximum)
+# Reihenfolge = Priorität beim Lookup (fein vor grob)
+TIMEFRAMES = {"1h": 3600000, "1d": 86400000}
+
+DTYPE = np.dtype([("ts", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"),
+                  ("close", "<f8"), ("volume", "<f8")])
+_EMPTY = np.zeros(0, dtype=DTYPE)
+
+def _path(root, symbol, tf):
+    return os.path.join(root, tf, symbol.replace("/", "_").replace(":", "-") + ".bin")
+
+def _read_index(root):
+    try:
+        with open(os.path.join(root, "index.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_index(root, index):
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, "index.json")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, sort_keys=True)
+    os.replace(tmp, path)
+
+@contextmanager
+def _locked(root):
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, ".lock"), "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+def load(symbol, tf, root=None):
+    """Gecachte Kerzen als strukturiertes Array (memory-mapped, read-only)."""
+    path = _path(root or OHLCV_DIR, symbol, tf)
+    if not os.path.exists(path) or os.path.getsize(path) < DTYPE.itemsize:
+        return _EMPTY
+    return np.memmap(path, dtype=DTYPE, mode="r")
+
+def _to_records(candles):
+    arr = np.zeros(len(candles), dtype=DTYPE)
+    for i, c in enumerate(candles):
+        arr[i] = (int(c[0]), *(float(v or 0.0) for v in c[1:6]))
+    return arr
+
+def _fetch(ex, symbol, tf, since, until):
+    """Kerzen mit since <= ts < until seitenweise holen (ts aufsteigend)."""
+    step = TIMEFRAMES[tf]
+    out = []
+    while since < until:
+        raw = retry.call(ex.fetch_ohlcv, symbol, tf, since=since, limit=OHLCV_LIMIT, ex=ex)
+        batch = [c for c in raw if since <= c[0] < until]
+        out += batch
+        if not batch or len(raw) < OHLCV_LIMIT:
+            break
+        since = batch[-1][0] + step
+    return out
+
+def update(ex, symbol, tf, since_ms, now_ms=None, root=None):
+    """Cache für Symbol/Zeitrahmen auf [since_ms, letzte abgeschlossene Kerze] erweitern.
+
+    Geholt werden nur die Ränder außerhalb des bereits abgefragten Zeitraums. Gibt die
+    Zahl neu gespeicherter Kerzen zurück.
+    """
+    root = root or OHLCV_DIR
+    step = TIMEFRAMES[tf]
+    closed = int(now_ms or time.time() * 1000) // step * step   # Start der laufenden Kerze
+    since = int(since_ms) // step * step
+    with _locked(root):
+        index = _read_index(root)
+        key = f"{tf}:{symbol}"
+        if key in index:
+            lo, hi = index[key]
+        else:
+            arr = load(symbol, tf, root)
+            # Datei ohne Index-Eintrag: Umfang aus den vorhandenen Kerzen
+            lo, hi = (int(arr["ts"][0]), int(arr["ts"][-1]) + step) if len(arr) else (closed, closed)
+        head = _fetch(ex, symbol, tf, since, lo) if since < lo else []
+        tail = _fetch(ex, symbol, tf, hi, closed) if hi < closed else []
+        if not head and not tail and key in index and since >= lo and hi >= closed:
+            return 0
+
+        path = _path(root, symbol, tf)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if head:
+            # selten (Zeitraum nach vorn erweitert) -> Datei neu schreiben
+            arr = np.concatenate([_to_records(head), np.array(load(symbol, tf, root))])
+            tmp = path + ".tmp"
+            arr.tofile(tmp)
+            os.replace(tmp, path)
+        if tail:
+            with open(path, "ab") as f:
+                _to_records(tail).tofile(f)
+        index[key] = (min(since, lo), max(hi, closed))
+        _write_index(root, index)
+        return len(head) + len(tail)
+
+def asof(arr, ts):
+    """Schlusskurs der Kerze, die 'ts' enthält (ms, Array); vor der ersten Kerze NaN."""
+    ts = np.asarray(ts, dtype=np.int64)
+    if not len(arr):
+        return np.full(ts.shape, np.nan)
+    i = np.searchsorted(arr["ts"], ts, side="right") - 1
+    return np.where(i >= 0, arr["close"][np.maximum(i, 0)], np.nan)
+
+class PriceHistory:
+    """USDT-Kurse von Assets zu beliebigen Zeitpunkten aus dem OHLCV-Cache.
+
+    Routing wie pricing.usdt_price (direkt, invers, über BTC/ETH); je Asset wird das
+    erste verfügbare Paar gecacht. Ohne Kurs -> NaN.
+    """
+
+    def __init__(self, root=None, timeframes=None):
+        self.root = root or OHLCV_DIR
+        self.timeframes = tuple(timeframes or TIMEFRAMES)
+        self.routes = {}     # Asset -> [(Symbol, invers)], Produkt = USDT-Preis
+        self._arrays = {}
+
+    def _route(self, ccy, markets):
+        if f"{ccy}/USDT" in markets:
+            return [(f"{ccy}/USDT", False)]
+        if f"USDT/{ccy}" in markets:
+            return [(f"USDT/{ccy}", True)]
+        for b in BRIDGES:
+            if f"{ccy}/{b}" in markets and f"{b}/USDT" in markets:
+                return [(f"{ccy}/{b}", False), (f"{b}/USDT", False)]
+        return None
+
+    def ensure(self, ex, assets, since_ms, now_ms=None):
+        """Kerzen für alle 'assets' ab 'since_ms' in den Cache holen; gibt neue Kerzen zurück."""
+        fetched = 0
+        for ccy in sorted({str(a).upper() for a in assets if a} - set(STABLES)):
+            route = self.routes.get(ccy) or self._route(ccy, ex.markets)
+            if route is None:
+                continue
+            self.routes[ccy] = route
+            for sym, _ in route:
+                for tf in self.timeframes:
+                    try:
+                        fetched += update(ex, sym, tf, since_ms, now_ms, self.root)
+                    except Exception as e:
+                        # ohne Kerzen bleibt der Zeitraum offen -> nächster Lauf holt ihn
+                        metrics.add_error(e)
+                        metrics.add_incomplete("ohlcv", f"{sym}@{tf}", type(e).__name__)
+                    self._arrays.pop((sym, tf), None)
+        return fetched
+
+    def _candles(self, sym, tf):
+        key = (sym, tf)
+        if key not in self._arrays:
+            self._arrays[key] = load(sym, tf, self.root)
+        return self._arrays[key]
+
+    def usdt_prices(self, ccy, ts):
+        """USDT-Preis von 'ccy' zu den Zeitpunkten 'ts' (ms) als float64-Array."""
+        ts = np.asarray(ts, dtype=np.int64)
+        ccy = str(ccy).upper()
+        if ccy in STABLES:
+            return np.ones(ts.shape)
+        route = self.routes.get(ccy)
+        if route is None:
+            return np.full(ts.shape, np.nan)
+        out = np.ones(ts.shape)
+        for sym, inverse in route:
+            p = np.full(ts.shape, np.nan)
+            for tf in self.timeframes:
+                miss = np.isnan(p)
+                if not miss.any():
+                    break
+                p[miss] = asof(self._candles(sym, tf), ts[miss])
+            out *= 1.0 / p if inverse else p
+        return out
+
+    def usdt_price(self, ccy, ts_ms):
+        p = float(self.usdt_prices(ccy, [ts_ms])[0])
+        return None if math.isnan(p) else p
+
+def assets(df):
+    """Assets, für die Kurse gebraucht werden: Basis jedes Symbols + Fee-Währungen."""
+    if df.empty:
+        return set()
+    bases = {str(s).split("/")[0] for s in pd.unique(df["symbol"].dropna().astype(str))}
+    return bases | {str(c) for c in pd.unique(df["fee_ccy"].dropna().astype(str)) if c}
+
+def fee_usdt(df, hist):
+    """Fees je Fill in USDT (Kurs zum Fill-Zeitpunkt); nicht umrechenbar -> NaN."""
+    if df.empty:
+        return np.zeros(0)
+    fee = df["fee_cost"].to_numpy(dtype=np.float64)
+    ccy = df["fee_ccy"].astype(object).where(df["fee_ccy"].notna(), "").to_numpy()
+    ts = df["timestamp"].to_numpy(dtype=np.int64)
+    out = np.where(fee == 0, 0.0, np.nan)
+    for c in pd.unique(ccy):
+        if not c:
+            continue
+        m = (ccy == c) & (fee != 0)
+        if m.any():
+            out[m] = fee[m] * hist.usdt_prices(c, ts[m])
+    return out
+
+def mark_to_market(df, hist):
+    """Tägliche Bewertung der im Zeitraum gehandelten Bestände zum Tagesschluss.
+
+    Netto-Basismenge je Symbol (cost/price, deckt Kontraktgrößen ab) kumuliert bis
+    Tagesende, bewertet mit dem Kurs der Basis -> DataFrame [date, cash_usdt,
+    holdings_usdt, pnl_usdt, unpriced]. pnl_usdt = Cashflow + Veränderung der Bestände;
+    Bestände vor Zeitraumbeginn zählen nicht mit.
+    """
+    cols = ["date", "cash_usdt", "holdings_usdt", "pnl_usdt", "unpriced"]
+    if df.empty:
+        return pd.DataFrame(columns=cols)
+    ts = df["timestamp"].to_numpy(dtype=np.int64)
+    day = ts // 86400000
+    days = np.arange(day.min(), day.max() + 1)
+    d_idx = day - days[0]
+    cash = np.bincount(d_idx, weights=pnl.cashflow(df), minlength=len(days))
+
+    price = df["price"].to_numpy(dtype=np.float64)
+    cost = df["cost"].to_numpy(dtype=np.float64)
+    base = np.where(price > 0, cost / np.where(price > 0, price, 1.0), df["amount"].to_numpy(dtype=np.float64))
+    qty = np.where(df["side"].to_numpy() == "sell", -1.0, 1.0) * base
+    sym_codes, syms = pd.factorize(df["symbol"].astype(str))
+    # Menge je Tag x Symbol, kumuliert = Bestand am Tagesende
+    held = np.zeros((len(days), len(syms)))
+    np.add.at(held, (d_idx, sym_codes), qty)
+    held = np.cumsum(held, axis=0)
+
+    day_end = (days + 1) * 86400000 - 1
+    holdings = np.zeros(len(days))
+    unpriced = np.zeros(len(days), dtype=np.int64)
+    for j, sym in enumerate(syms):
+        p = hist.usdt_prices(sym.split("/")[0], day_end)
+        open_ = np.abs(held[:, j]) > 1e-12
+        holdings += np.where(open_ & ~np.isnan(p), held[:, j] * np.nan_to_num(p), 0.0)
+        unpriced += open_ & np.isnan(p)
+    total = np.cumsum(cash) + holdings
+    return pd.DataFrame({
+        "date": days.astype("datetime64[D]").astype(str),
+        "cash_usdt": cash,
+        "holdings_usdt": holdings,
+        "pnl_usdt": np.diff(total, prepend=0.0),
+        "unpriced": unpriced,
+    })
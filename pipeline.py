@@ -0,0 +1,599 @@
+import os, sys, json, math, time, argparse, hashlib, datetime as dt
+import numpy as np
+import pandas as pd
+
+import store
+import retry
+import metrics
+import exchange
+import fetch_async
+import discovery
+import pnl
+import positions
+import pricing
+import rollups
+import equity
+import traders
+import swap
+import ohlcv
+import fx
+import render
+import jsonout
+import manifest
+import accounts
+from normalize import df_from_trades
+
+# ========= Gemeinsame Pipeline =========
+# fetch -> normalize -> aggregate -> render für alle Einstiege: dashboard.py (HTML + CSVs),
+# report.py (docs/data/latest.json) und scripts/fetch_mexc.py (data/latest.json) wählen
+# nur noch ihre Ausgaben (TARGETS). Jede Stufe läuft je Lauf höchstens einmal; der Fetch
+# lässt sich abschalten (--no-fetch) oder überspringt sich, solange der letzte Fetch in
+# den Store jünger als FETCH_MAX_AGE_MIN ist. Ein Fetch speist so alle Ausgaben.
+DAYS = int(os.getenv("DAYS", "14"))        # Zeitraum für PnL
+OUTDIR = os.getenv("OUTDIR", "site")       # Ausgabeordner für CSVs + HTML (für GitHub Pages)
+LATEST_PATH = os.getenv("LATEST_PATH", "data/latest.json")
+LATEST_DAYS = 7                            # Tage in latest.json (pnl_daily/pnl_cum)
+# neueste Fills direkt in latest.json; alle Fills des Zeitraums seitenweise unter copytrades/
+LATEST_COPYTRADES = int(os.getenv("LATEST_COPYTRADES", "500"))
+COPYTRADE_COLUMNS = ["date", "symbol", "side", "amount", "price", "fee", "fee_ccy", "pnl_usdt", "roi_pct"]
+EXPORT_COLUMNAR = os.getenv("EXPORT_COLUMNAR", "")  # "parquet"/"arrow": zusätzlicher Spaltenexport (pyarrow nötig)
+FETCH_MAX_AGE_MIN = float(os.getenv("FETCH_MAX_AGE_MIN", "0"))   # 0 = immer holen
+TARGETS = ("csv", "html", "latest")
+EXIT_UNCHANGED = 3                         # --exit-unchanged: nichts Neues veröffentlicht
+
+# Secrets aus GitHub Actions – beide Namensschemata der bisherigen Workflows
+API_KEY    = (os.getenv("MEXC_KEY") or os.getenv("MEXC_API_KEY") or "").strip()
+API_SECRET = (os.getenv("MEXC_SECRET") or os.getenv("MEXC_API_SECRET") or "").strip()
+
+def now_utc():
+    return dt.datetime.utcnow().replace(tzinfo=dt.timezone.utc)
+
+def ts_ms(d: dt.datetime) -> int:
+    return int(d.timestamp() * 1000)
+
+def make_ex(default_type="spot", api_key=None, secret=None):
+    """Gemeinsame Instanz je Markt-Typ (und Konto) – Märkte aus dem Datei-Cache (exchange.py)."""
+    api_key = API_KEY if api_key is None else api_key
+    secret = API_SECRET if secret is None else secret
+    if not api_key or not secret:
+        raise RuntimeError("MEXC_KEY/MEXC_SECRET (oder MEXC_API_KEY/MEXC_API_SECRET) fehlen (als Repository Secrets setzen).")
+    return exchange.get_exchange(default_type, api_key, secret)
+
+def fetch_all_trades_spot(ex, since_ms, con=None):
+    """Spot-Trades (USDT-Quote) seit 'since_ms' paginiert über alle Symbole.
+
+    Mit Store ('con') startet jedes Symbol am gespeicherten Cursor statt bei 'since_ms';
+    neue Fills landen direkt im Store. Rückgabe: nur die in diesem Lauf geholten Trades.
+    """
+    symbols = [m["symbol"] for m in ex.markets.values()
+               if m.get("spot") and m.get("quote") == "USDT"]
+    if con:
+        # nur aktive Symbole (Bestand, Orders, letzte Trades) + periodischer Voll-Durchlauf
+        symbols = discovery.discover(ex, con, "spot", symbols)
+    # Symbole laufen parallel über die Async-Engine (FETCH_CONCURRENCY, Token-Bucket)
+    return _fetch_symbols(ex, "spot", symbols, since_ms, con)
+
+def fetch_all_trades_swap(ex, since_ms, con=None):
+    """USDT-M Perp/SWAP (linear) – über alle linearen USDT-Kontrakte.
+
+    Mit Store bestimmen Positionen, Positions-Historie und Funding (swap.ingest, je ein
+    Bulk-Call) die Kontrakte mit möglichen neuen Fills; Funding und unrealisierter PnL
+    landen dabei im Store.
+    """
+    symbols = [m["symbol"] for m in ex.markets.values()
+               if m.get("swap") and m.get("linear") and m.get("quote") == "USDT"]
+    if con:
+        symbols = swap.ingest(ex, con, symbols, since_ms)
+    return _fetch_symbols(ex, "swap", symbols, since_ms, con)
+
+def _fetch_symbols(ex, market_type, symbols, since_ms, con):
+    """fetch_async.fetch_symbols; ein Voll-Durchlauf gilt erst nach vollständigem Abruf als erledigt."""
+    mark = metrics.mark()
+    out = fetch_async.fetch_symbols(ex, market_type, symbols, since_ms, con)
+    if con:
+        discovery.finish_sweep(con, market_type, not any(
+            r["market_type"] == market_type for r in metrics.incomplete_since(mark)))
+    return out
+
+def pnl_daily(df):
+    """Cashflow-PnL: Sell=+cost, Buy=-cost, Fees in USDT (umgerechnet über 'fee_usdt') abziehen."""
+    return pnl.pnl_by(df, ("date",))
+
+def current_equity_usdt(spot=None, swap=None):
+    """Gesamte Equity (Spot + Swap) in USDT – mit Market-Preisen bewertet.
+
+    Alle Assets werden mit einem einzigen fetch_tickers()-Snapshot bewertet (Spot-Tickers,
+    Routing über BTC/ETH ohne direktes /USDT-Paar). Nicht bewertbare Assets stehen mit
+    priced=False in den Details und werden gemeldet.
+    """
+    exs = {"spot": spot or make_ex("spot"), "swap": swap or make_ex("swap")}
+    # Retries für Timeouts/429; was danach fehlt, steht als unvollständig in latest.json
+    try:
+        prices = pricing.price_map(retry.call(exs["spot"].fetch_tickers, ex=exs["spot"]))
+    except Exception as e:
+        if retry.classify(e) == "fatal":
+            raise
+        metrics.add_error(e)
+        metrics.add_incomplete("spot", "tickers", type(e).__name__)
+        prices = {}
+    total = 0.0
+    details, unpriced = [], []
+    for typ, ex in exs.items():
+        try:
+            totals = retry.call(ex.fetch_balance, ex=ex).get("total") or {}
+        except Exception as e:
+            if retry.classify(e) == "fatal":
+                raise
+            metrics.add_error(e)
+            metrics.add_incomplete(typ, "balance", type(e).__name__)
+            continue
+        val, det, miss = pricing.value_balance(typ, totals, prices)
+        total += val
+        details += det
+        unpriced += [f"{typ}:{c}" for c in miss]
+    if unpriced:
+        print("Ohne Preis (nicht bewertet):", ", ".join(unpriced))
+    return total, pd.DataFrame(details)
+
+def eur_rate(ex=None, since_ms=None):
+    """Aktueller EUR-Kurs je USDT aus dem Tages-Cache (fx.py) – fehlende Tage werden nachgeholt,
+    sonst kein Request."""
+    rates = fx.Rates()
+    rates.ensure(since_ms or ts_ms(now_utc() - dt.timedelta(days=DAYS)), ex)
+    return rates.latest()
+
+def equity_curve(pnl_df, eq_now):
+    """Equity(t) = StartEquity + CumSum(PnL); Start = eq_now - Sum(PnL).
+
+    Nur noch Rückfall, solange der Store weniger als zwei Snapshots hat (equity.curve).
+    """
+    if pnl_df.empty:
+        return pd.DataFrame(columns=["date","equity_usdt"])
+    s = pnl_df["pnl_usdt"].sum()
+    start_equity = eq_now - s if not math.isnan(eq_now) else 0.0
+    out = pnl_df.copy()
+    out["equity_usdt"] = start_equity + out["pnl_usdt"].cumsum()
+    return out[["date","equity_usdt"]]
+
+def now_iso():
+    return dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+def write_json(path, obj):
+    jsonout.write_file(path, jsonout.dumps(obj))
+
+def write_empty(path, reason, m=None):
+    """latest.json ohne Daten (keine Keys, Fehler) – das Frontend zeigt dann den Status.
+
+    Läuft über das Ausgabe-Manifest: bei gleichem Status bleibt die Datei trotz neuem
+    updated_at liegen. Gibt True zurück, wenn sich der Inhalt geändert hat.
+    """
+    out = {
+        "updated_at": now_iso(),
+        "status": reason,
+        "equity_usdt": None,
+        "equity_eur": None,
+        "eur_per_usdt": 0.92,  # Default – wird im Frontend überschrieben, wenn du einen Kurs eingibst
+        "pnl_daily": [],       # [{date: "...", pnl_usdt: x}]
+        "pnl_cum": [],         # [{date: "...", pnl_usdt: x}]
+        "copytrades": []       # wir befüllen das aus normalen Trades; echte Copy-API ist proprietär
+    }
+    m = m or manifest.Manifest()
+    changed = m.write_json(path, out)
+    m.save()
+    return changed
+
+def report_changed(changed):
+    """changed=true|false nach $GITHUB_OUTPUT (Commit/Verschlüsseln/Deploy nur bei Änderung)."""
+    if os.getenv("GITHUB_OUTPUT"):
+        with open(os.environ["GITHUB_OUTPUT"], "a", encoding="utf-8") as f:
+            f.write(f"changed={'true' if changed else 'false'}\n")
+
+def trades_to_rows(trades, realized=None):
+    """Fills für die Tabelle in latest.json; realized: (Symbol, Trade-Key) -> (pnl_usdt, basis_usdt)."""
+    realized = realized or {}
+    rows = []
+    for t in trades:
+        fee = t.get("fee") or {}
+        pnl_usdt, basis = realized.get((str(t.get("symbol")), store.trade_key(t)), (None, None))
+        rows.append({
+            "date": dt.datetime.utcfromtimestamp((t.get("timestamp") or 0) / 1000).strftime("%Y-%m-%d"),
+            "symbol": t.get("symbol"),
+            "side": t.get("side"),
+            "amount": t.get("amount"),
+            "price": t.get("price"),
+            "fee": fee.get("cost"),
+            "fee_ccy": fee.get("currency"),
+            # realisierter PnL je Fill; ROI bezogen auf den Einstand der geschlossenen Menge
+            "pnl_usdt": pnl_usdt,
+            "roi_pct": round(100.0 * pnl_usdt / basis, 4) if basis else None,
+        })
+    return rows
+
+def copytrade_chunks(con, since_ms, newest_first=False, limit=None):
+    """Fills des Zeitraums als trades_to_rows-Blöcke direkt aus dem Store (PnL je Block nachgeschlagen)."""
+    for chunk in store.iter_trades(con, since_ms, newest_first, limit=limit):
+        yield trades_to_rows(chunk, positions.realized_fills(
+            con, since_ms, [(str(t.get("symbol")), store.trade_key(t)) for t in chunk]))
+
+class Run:
+    """Ein Pipeline-Lauf für ein Konto; jede Stufe wird bei Bedarf genau einmal ausgeführt.
+
+    fetch:     neue Fills + bewerteter Balance-Snapshot in den Store (einzige Stufe mit API-Last)
+    normalize: Trades aus dem Store -> DataFrame, Fees über den OHLCV-Cache in USDT
+    aggregate: PnL, Tagesbewertung, realisierter PnL, Equity-Kurve, Rollups
+    Ausgaben:  write_csv, write_html, write_latest
+
+    Für den Dauerbetrieb (scripts/daemon_mexc.py): 'exchanges' = warme Instanzen je Markt-Typ,
+    'fetched' = Store hat der Aufrufer schon aktualisiert (OHLCV/FX laden trotzdem nach),
+    'mark' = metrics.mark() vor diesem Fetch – dessen Lücken landen sonst nicht in latest.json.
+    """
+
+    def __init__(self, api_key=None, secret=None, store_path=None, days=None, rate_eur=None, fetch=True,
+                 con=None, since_ms=None, manifest_path=None, exchanges=None, fetched=False, mark=None):
+        self.api_key = API_KEY if api_key is None else api_key
+        self.secret = API_SECRET if secret is None else secret
+        self.days = days or DAYS
+        self.since_ms = since_ms or ts_ms(now_utc() - dt.timedelta(days=self.days))
+        self.con = con or store.open_store(store_path)
+        self.rate_eur = rate_eur
+        self.fetch_enabled = fetch
+        # Lücken ab hier gehören zu diesem Lauf ('mark': Aufrufer hat schon vorher geholt)
+        self.mark = metrics.mark() if mark is None else mark
+        self.manifest = manifest.Manifest(manifest_path)
+        self._done = {"fetch"} if fetched else set()
+        self._ex = {} if exchanges is None else exchanges
+
+    def _once(self, name):
+        if name in self._done:
+            return False
+        self._done.add(name)
+        return True
+
+    def ex(self, market_type):
+        if market_type not in self._ex:
+            self._ex[market_type] = make_ex(market_type, self.api_key, self.secret)
+        return self._ex[market_type]
+
+    def fetch(self):
+        """Nur neue Fills (Cursor je Symbol) + Snapshot; übersprungen, wenn der Store frisch ist."""
+        if not self._once("fetch") or not self.fetch_enabled:
+            return
+        now = int(time.time() * 1000)
+        last = int(store.get_meta(self.con, "last_fetch", 0))
+        if FETCH_MAX_AGE_MIN and now - last < FETCH_MAX_AGE_MIN * 60000:
+            print(f"Fetch übersprungen: Store ist {(now - last) / 60000:.0f} min alt")
+            return
+        # Exchanges sind für metrics.json instrumentiert
+        with metrics.stage("fetch_spot"):
+            fetch_all_trades_spot(self.ex("spot"), self.since_ms, self.con)
+        with metrics.stage("fetch_swap"):
+            fetch_all_trades_swap(self.ex("swap"), self.since_ms, self.con)
+        # Bewerteter Snapshot in den Store, Kurve/Drawdown/ROI kommen aus den Snapshots
+        with metrics.stage("equity"):
+            eq_now, pos = current_equity_usdt(self.ex("spot"), self.ex("swap"))
+            equity.record(self.con, pos, eq_now)
+        store.set_meta(self.con, "last_fetch", now)
+
+    def state(self):
+        """Datenstand ohne Kurse: Trades (Anzahl, letzter Fill), Bestandsmengen des letzten
+        Snapshots, Tag und Zeitraum. Gleicher Stand -> gleiche Ausgaben bis auf die Bewertung."""
+        self.fetch()
+        n, last = self.con.execute("SELECT COUNT(*), MAX(timestamp) FROM trades").fetchone()
+        assets = self.con.execute(
+            "SELECT market_type, asset, ROUND(qty, 8) FROM snapshot_assets "
+            "WHERE ts = (SELECT MAX(ts) FROM snapshots) ORDER BY market_type, asset").fetchall()
+        raw = json.dumps([n, last, assets, now_utc().strftime("%Y-%m-%d"), self.days])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def normalize(self):
+        if not self._once("normalize"):
+            return
+        self.fetch()
+        with metrics.stage("load_store"):
+            trades = store.load_trades(self.con, self.since_ms)
+        with metrics.stage("normalize"):
+            # Rohdaten nicht behalten: latest.json liest die Fills blockweise aus dem Store
+            self.df = df_from_trades(trades)
+            del trades
+        # Historische Kurse (OHLCV-Cache, nur neue Kerzen): Fees in Fremdwährung umrechnen
+        with metrics.stage("ohlcv"):
+            self.hist = ohlcv.PriceHistory()
+            if self.fetch_enabled:
+                self.hist.ensure(self.ex("spot"), ohlcv.assets(self.df), self.since_ms)
+            self.df["fee_usdt"] = ohlcv.fee_usdt(self.df, self.hist)
+
+    def aggregate(self):
+        if not self._once("aggregate"):
+            return
+        self.normalize()
+        df = self.df
+        # EUR je Tag (as-of) statt eines Tageskurses für die ganze Historie
+        with metrics.stage("fx"):
+            self.fx = fx.Rates()
+            if self.fetch_enabled:
+                self.fx.ensure(self.since_ms, self.ex("spot"))
+            if self.rate_eur is None:
+                self.rate_eur = self.fx.latest()
+        with metrics.stage("pnl"):
+            # + Funding (USDT-M Perps) und unrealisierter PnL offener Positionen je Tag
+            self.df_pnl = fx.to_eur(swap.add_daily(pnl_daily(df), self.con, self.since_ms), "pnl_usdt", self.fx)
+            # Tagesbewertung der gehandelten Bestände zum Schlusskurs
+            self.df_mtm = ohlcv.mark_to_market(df, self.hist)
+
+        # Realisierter PnL (FIFO/Ø-Kosten) – nur neue Fills, Lot-Zustand liegt im Store
+        with metrics.stage("realize"):
+            positions.update(self.con, prices=self.hist)
+            self.df_real = fx.to_eur(positions.realized_by(self.con, "date", self.since_ms), "pnl_usdt", self.fx)
+            self.df_real_copy = positions.realized_by(self.con, "copy_trader", self.since_ms)
+            self.realized = float(self.df_real["pnl_usdt"].sum())
+            self.realized_eur = float(self.df_real["pnl_eur"].sum())
+            # Copy-Trader-Index: von positions.update mitgeführt, hier nur gelesen
+            self.traders = traders.load(self.con)
+
+        self.refresh_equity()
+
+        # Copy-only Ansicht + Rollups (Tag/Woche/Monat, Symbol, Markt-Typ) für die Seite
+        self.df_copy = df[df["is_copy"]] if not df.empty else pd.DataFrame(columns=df.columns)
+        with metrics.stage("aggregate"):
+            self.rollup = rollups.build_rollups(df, self.fx)
+
+    def refresh_equity(self, eq_now=None):
+        """Equity, Bestand und Kurve neu aus dem Store; 'eq_now' (frische Bewertung, noch
+        nicht als Snapshot gespeichert) ersetzt die Equity des letzten Snapshots."""
+        with metrics.stage("equity_curve"):
+            _, self.eq_now = equity.latest(self.con)
+            self.pos = equity.assets_at(self.con, int(time.time() * 1000))
+            self.df_eq = equity.curve(self.con, self.since_ms)
+        if eq_now is not None:
+            self.eq_now = eq_now
+        if len(self.df_eq) < 2:
+            # erste Läufe: noch keine Historie -> wie bisher aus dem Cashflow zurückrechnen
+            self.df_eq = equity_curve(self.df_pnl, self.eq_now)
+        self.df_eq = fx.to_eur(swap.add_unrealized(self.df_eq, self.con, self.since_ms), "equity_usdt", self.fx)
+
+    def write_csv(self, outdir=None):
+        """CSVs (zum Download in Actions) + paginierte Einzel-Trades für die Seite.
+
+        Über das Manifest: unveränderte Dateien werden nicht neu geschrieben.
+        """
+        self.aggregate()
+        outdir = outdir or OUTDIR
+        os.makedirs(outdir, exist_ok=True)
+        m = self.manifest
+        with metrics.stage("export"):
+            m.write_csv(os.path.join(outdir, "positions_now.csv"), self.pos)
+            m.write_csv(os.path.join(outdir, "trades_all.csv"), self.df)
+            m.write_csv(os.path.join(outdir, "daily_pnl.csv"), self.df_pnl)
+            m.write_csv(os.path.join(outdir, "daily_mtm.csv"), self.df_mtm)
+            m.write_csv(os.path.join(outdir, "equity_curve.csv"), self.df_eq)
+            m.write_csv(os.path.join(outdir, "realized_pnl.csv"), self.df_real)
+            if not self.df_real_copy.empty:
+                m.write_csv(os.path.join(outdir, "realized_pnl_copy.csv"), self.df_real_copy)
+            if not self.df_copy.empty:
+                m.write_csv(os.path.join(outdir, "copytrades.csv"), self.df_copy)
+            # Trader-Index: kompakt als JSON (spaltenweise) + CSV
+            m.write_json(os.path.join(outdir, "traders.json"), traders.compact(self.traders))
+            m.write_csv(os.path.join(outdir, "traders.csv"), self.traders)
+            # Einzel-Trades für die Seite: paginiert, werden erst auf Klick geladen
+            rollups.write_trade_pages(self.df, os.path.join(outdir, "trades"), writer=m.write)
+            if EXPORT_COLUMNAR:
+                import columnar  # pyarrow nur in diesem Modus
+                # aus dem Store (ganze Historie, volle Tage); eigener Ordner neben den JSON-Seiten
+                columnar.export_store(self.con, os.path.join(outdir, "trades_columnar"), EXPORT_COLUMNAR)
+                columnar.export_frame(self.df_pnl, os.path.join(outdir, "daily_pnl"), EXPORT_COLUMNAR)
+                columnar.export_frame(self.df_eq, os.path.join(outdir, "equity_curve"), EXPORT_COLUMNAR)
+                columnar.export_frame(self.traders, os.path.join(outdir, "traders"), EXPORT_COLUMNAR)
+
+    def write_html(self, outdir=None):
+        self.aggregate()
+        with metrics.stage("render"):
+            page = render.write_dashboard(self.df_pnl, self.df_eq, self.eq_now, self.rate_eur, self.rollup,
+                                          self.realized, outdir or OUTDIR, days=self.days,
+                                          traders=traders.compact(self.traders), realized_eur=self.realized_eur,
+                                          writer=self.manifest.write)
+        print("OK:", page)
+        return page
+
+    def latest(self):
+        """latest.json-Inhalt: Equity, realisierter PnL (FIFO) + Funding je Tag + kumuliert, Swap-Positionen, Fills."""
+        self.aggregate()
+        by_day = dict(zip(self.df_real["date"], zip(self.df_real["pnl_usdt"], self.df_real["pnl_eur"])))
+        funding = dict(zip(self.df_pnl["date"], self.df_pnl["funding_usdt"]))
+        days = [(dt.datetime.utcnow() - dt.timedelta(days=i)).strftime("%Y-%m-%d")
+                for i in reversed(range(LATEST_DAYS))]
+        fund = np.array([float(funding.get(d, 0.0)) for d in days])
+        fund_eur = fund * self.fx.asof(days)
+        # Funding ist realisierter Cashflow -> im Tages-PnL enthalten, zusätzlich einzeln ausgewiesen
+        pnl_daily = [{"date": d, "pnl_usdt": float(by_day.get(d, (0.0, 0.0))[0]) + float(fund[i]),
+                      "pnl_eur": float(by_day.get(d, (0.0, 0.0))[1]) + float(fund_eur[i]),
+                      "funding_usdt": float(fund[i])} for i, d in enumerate(days)]
+        pnl_cum, run, run_eur = [], 0.0, 0.0
+        for r in pnl_daily:
+            run += r["pnl_usdt"]
+            run_eur += r["pnl_eur"]
+            pnl_cum.append({"date": r["date"], "pnl_usdt": run, "pnl_eur": run_eur})
+        eq = None if pd.isna(self.eq_now) else round(self.eq_now, 8)
+        upnl, open_pos = swap.unrealized_now(self.con)
+        incomplete = metrics.incomplete_since(self.mark)
+        return {
+            "updated_at": now_iso(),
+            # partial: einzelne Symbole/Teile auch nach allen Retries nicht vollständig
+            "status": "partial" if incomplete else "ok",
+            "incomplete": incomplete,
+            "equity_usdt": eq,
+            "equity_eur": None if eq is None else round(eq * self.rate_eur, 8),
+            "eur_per_usdt": self.rate_eur,
+            "pnl_daily": pnl_daily,
+            "pnl_cum": pnl_cum,
+            "swap": {"unrealized_usdt": round(upnl, 8), "positions": open_pos,
+                     "funding_usdt": round(float(self.df_pnl["funding_usdt"].sum()), 8)},
+            # nur die neuesten Fills inline; alle seitenweise (write_latest -> copytrades/)
+            "copytrades": [r for c in copytrade_chunks(self.con, self.since_ms, True, LATEST_COPYTRADES)
+                           for r in c][::-1],
+            "copytrades_total": int(self.con.execute("SELECT COUNT(*) FROM trades WHERE timestamp >= ?",
+                                                     (self.since_ms,)).fetchone()[0]),
+        }
+
+    def write_latest(self, path=None):
+        path = path or LATEST_PATH
+        with metrics.stage("latest"):
+            out = self.latest()
+            # alle Fills des Zeitraums (neueste zuerst) blockweise in Seiten neben latest.json
+            rows = ([[r[c] for c in COPYTRADE_COLUMNS] for r in c]
+                    for c in copytrade_chunks(self.con, self.since_ms, newest_first=True))
+            jsonout.write_pages(os.path.join(os.path.dirname(path), "copytrades"), rows, COPYTRADE_COLUMNS,
+                                writer=self.manifest.write)
+            out["copytrades_pages"] = "copytrades/index.json"
+            # updated_at zählt nicht als Änderung
+            self.manifest.write_json(path, out)
+        print("OK:", path)
+        return path
+
+    def summary(self):
+        """Kennzahlen für die Gesamtansicht mehrerer Konten (siehe consolidate)."""
+        self.aggregate()
+        return {"eq_now": self.eq_now, "df_pnl": self.df_pnl, "df_eq": self.df_eq,
+                "rollup": self.rollup, "realized": self.realized, "realized_eur": self.realized_eur,
+                "traders": traders.compact(self.traders)}
+
+def run_targets(targets, outdir=None, latest_path=None, force=False, **kw):
+    """Ein Konto: Run mit den gewünschten Ausgaben; gibt den Run zurück.
+
+    Ist der Datenstand (Run.state) seit der letzten Veröffentlichung dieser Ausgaben gleich
+    und jünger als manifest.PUBLISH_MAX_AGE_H, entfallen alle Ausgaben (r.changed = False).
+    """
+    r = Run(**kw)
+    r.changed = False
+    if not targets:
+        # nur Stufen ohne Ausgabe (z. B. --fetch-only: Store füllen)
+        r.fetch()
+        return r
+    scope = "|".join([",".join(sorted(targets)), os.path.normpath(outdir or OUTDIR),
+                      os.path.normpath(latest_path or LATEST_PATH)])
+    with metrics.stage("state"):
+        state = r.state()
+    if not force and r.manifest.unchanged(scope, state):
+        print("Unverändert seit der letzten Veröffentlichung – keine Ausgaben.")
+        return r
+    if "csv" in targets:
+        r.write_csv(outdir)
+    if "html" in targets:
+        r.write_html(outdir)
+    if "latest" in targets:
+        r.write_latest(latest_path)
+    r.changed = bool(r.manifest.changed)
+    print(f"Ausgaben: {len(r.manifest.changed)} geändert, {len(r.manifest.skipped)} unverändert")
+    r.manifest.published(scope, state)
+    r.manifest.save()
+    return r
+
+# ---- Mehrere Konten -------------------------------------------------------------
+
+def _account_job(acc, targets, outdir, rate_eur, fetch):
+    """Läuft im Kindprozess: eigene Metriken, Ausgaben unter <outdir>/<name>/."""
+    metrics.reset()
+    out = os.path.join(outdir, acc["name"])
+    try:
+        # force: die Gesamtansicht braucht die Kennzahlen jedes Kontos; unveränderte
+        # Dateien überspringt das Manifest trotzdem
+        r = run_targets(targets, out, os.path.join(out, "latest.json"), force=True, api_key=acc["key"],
+                        secret=acc["secret"], store_path=accounts.store_path(acc["name"]), rate_eur=rate_eur,
+                        fetch=fetch, manifest_path=accounts.manifest_path(acc["name"]))
+        return {**r.summary(), "changed": r.changed}
+    finally:
+        metrics.write(out)
+
+def consolidate(results, names, rates=None):
+    """Kennzahlen aller Konten -> Gesamtansicht (PnL je Tag, Equity-Kurve, Equity, Rollups,
+    Realisiert, Kontenzeilen, Trader-Index)."""
+    ok = [results[n] for n in names if n in results]
+    pnls = [r["df_pnl"] for r in ok if not r["df_pnl"].empty]
+    cols = [c for c in ("pnl_usdt", "pnl_eur", "funding_usdt", "unrealized_usdt") if all(c in p for p in pnls)]
+    df_pnl = (pd.concat(pnls).groupby("date", as_index=False, sort=True)[cols].sum() if pnls
+              else pd.DataFrame(columns=["date", "pnl_usdt", "pnl_eur"]))
+    # Summenkurve auf gemeinsamem Raster -> EUR je Punkt neu umrechnen
+    df_eq = fx.to_eur(equity.combine([r["df_eq"] for r in ok]), "equity_usdt", rates or fx.Rates())
+    rows = [{"name": n, "ok": n in results,
+             "eq_now_usdt": float(results[n]["eq_now"]) if n in results else 0.0,
+             "pnl_usdt": float(results[n]["df_pnl"]["pnl_usdt"].sum()) if n in results else 0.0,
+             "realized_usdt": float(results[n]["realized"]) if n in results else 0.0}
+            for n in names]
+    return {"df_pnl": df_pnl, "df_eq": df_eq, "eq_now": sum(r["eq_now_usdt"] for r in rows),
+            "rollup": rollups.merge([r["rollup"] for r in ok]),
+            "realized": sum(r["realized_usdt"] for r in rows),
+            "realized_eur": sum(r["realized_eur"] for r in ok),
+            "rows": rows, "traders": traders.merge([r["traders"] for r in ok])}
+
+def run_multi(accs, targets, outdir=None, fetch=True):
+    """Alle Konten parallel (accounts.fan_out), danach Gesamtansicht in 'outdir'.
+
+    Gibt (Ergebnisse, geändert) zurück – geändert, wenn ein Konto oder die Gesamtansicht
+    inhaltlich neue Ausgaben geschrieben hat.
+    """
+    outdir = outdir or OUTDIR
+    os.makedirs(outdir, exist_ok=True)
+    # Märkte einmal im Elternprozess laden – Kindprozesse übernehmen sie
+    with metrics.stage("load_markets"):
+        ex = exchange.get_exchange("spot")
+    # FX-Cache einmal hier auffüllen; die Konten lesen ihn nur noch
+    with metrics.stage("fx"):
+        rate_eur = eur_rate(ex if fetch else None)
+    with metrics.stage("accounts"):
+        results = accounts.fan_out(_account_job, accs, targets, outdir, rate_eur, fetch)
+    names = [a["name"] for a in accs]
+    m = manifest.Manifest()
+    with metrics.stage("consolidate"):
+        c = consolidate(results, names)
+        if "csv" in targets:
+            m.write_csv(os.path.join(outdir, "accounts.csv"), pd.DataFrame(c["rows"]).drop(columns="ok"))
+            m.write_csv(os.path.join(outdir, "daily_pnl.csv"), c["df_pnl"])
+            m.write_csv(os.path.join(outdir, "equity_curve.csv"), c["df_eq"])
+            m.write_json(os.path.join(outdir, "traders.json"), c["traders"])
+    if "html" in targets:
+        with metrics.stage("render"):
+            page = render.write_dashboard(c["df_pnl"], c["df_eq"], c["eq_now"], rate_eur, c["rollup"], c["realized"],
+                                          outdir, c["rows"], DAYS, c["traders"], c["realized_eur"], writer=m.write)
+        print(f"OK: {page} ({len(results)}/{len(accs)} Konten)")
+    m.save()
+    changed = bool(m.changed) or any(r.get("changed") for r in results.values())
+    return results, changed
+
+# ---- Einstieg -------------------------------------------------------------------
+
+def parse_args(argv=None, targets=TARGETS, outdir=None, latest_path=None, metrics_dir=None):
+    ap = argparse.ArgumentParser(description="MEXC-Pipeline: fetch -> normalize -> aggregate -> render")
+    ap.add_argument("--targets", default=",".join(targets),
+                    help="Ausgaben, kommagetrennt: csv, html, latest (leer = nur Store füllen)")
+    ap.add_argument("--outdir", default=outdir or OUTDIR, help="Ordner für CSVs + index.html")
+    ap.add_argument("--latest", default=latest_path or LATEST_PATH, help="Pfad für latest.json")
+    ap.add_argument("--metrics-dir", default=metrics_dir, help="Ordner für metrics.json (Standard: --outdir)")
+    ap.add_argument("--no-fetch", action="store_true", help="nur den vorhandenen Store auswerten")
+    ap.add_argument("--force", action="store_true", help="Ausgaben auch bei unverändertem Datenstand schreiben")
+    ap.add_argument("--exit-unchanged", action="store_true",
+                    help=f"Exit-Code {EXIT_UNCHANGED}, wenn sich keine Ausgabe inhaltlich geändert hat")
+    args = ap.parse_args(argv)
+    args.targets = tuple(t for t in (x.strip() for x in args.targets.split(",")) if t)
+    unknown = set(args.targets) - set(TARGETS)
+    if unknown:
+        ap.error(f"unbekannte Ausgabe: {', '.join(sorted(unknown))}")
+    return args
+
+def main(argv=None, **defaults):
+    """CLI; die Front-Ends rufen main() mit eigenen Standard-Ausgaben auf."""
+    args = parse_args(argv, **defaults)
+    try:
+        accs = accounts.load(API_KEY, API_SECRET)
+        if len(accs) > 1:
+            _, changed = run_multi(accs, args.targets, args.outdir, fetch=not args.no_fetch)
+        else:
+            acc = accs[0] if accs else {"key": API_KEY, "secret": API_SECRET}
+            changed = run_targets(args.targets, args.outdir, args.latest, force=args.force, api_key=acc["key"],
+                                  secret=acc["secret"], fetch=not args.no_fetch).changed
+    finally:
+        print("Metriken:", metrics.write(args.metrics_dir or args.outdir))
+    report_changed(changed)
+    if args.exit_unchanged and not changed:
+        sys.exit(EXIT_UNCHANGED)
+
+if __name__ == "__main__":
+    main()
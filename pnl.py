@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+# ========= Cashflow-PnL (vektorisiert) =========
+# Sell=+cost, Buy=-cost, Fees nur abziehen, wenn in USDT/USD bezahlt – oder, falls das
+# DataFrame eine Spalte 'fee_usdt' hat (ohlcv.fee_usdt), die umgerechneten Fees.
+# Gemeinsam genutzt von dashboard.py und report.py.
+FEE_CCYS = ("USDT", "USD")
+
+# Name -> Gruppierungsspalten; 'hour', 'week', 'month' und 'market_type' werden bei
+# Bedarf aus 'timestamp' bzw. 'symbol' abgeleitet
+GROUPINGS = {
+    "daily":  ("date",),
+    "hourly": ("hour",),
+    "weekly": ("week",),
+    "monthly": ("month",),
+    "symbol": ("symbol",),
+    "copy_trader": ("copy_trader",),
+    "market_type": ("market_type",),
+}
+DERIVED = ("hour", "week", "month", "market_type")
+
+def fees(df):
+    """Abzuziehende Fee je Fill in USDT; nicht umrechenbare Fees zählen 0."""
+    if "fee_usdt" in df.columns:
+        return np.nan_to_num(df["fee_usdt"].to_numpy(dtype=np.float64))
+    fee_mask = df["fee_ccy"].isin(FEE_CCYS).to_numpy()
+    return np.where(fee_mask, df["fee_cost"].to_numpy(dtype=np.float64), 0.0)
+
+def cashflow(df):
+    """Cashflow je Fill als float64-Array (eine Spaltenoperation statt Schleife)."""
+    if df.empty:
+        return np.zeros(0)
+    sign = np.where(df["side"].to_numpy() == "sell", 1.0, -1.0)
+    cost = df["cost"].to_numpy(dtype=np.float64)
+    return sign * cost - fees(df)
+
+def _market_type(symbol):
+    """ccxt-Symbole mit Settle-Teil ('BTC/USDT:USDT') sind Kontrakte – je Kategorie statt je Fill."""
+    if isinstance(symbol.dtype, pd.CategoricalDtype):
+        cats = np.array(["swap" if ":" in str(c) else "spot" for c in symbol.cat.categories], dtype=object)
+        codes = symbol.cat.codes.to_numpy()
+        return np.where(codes >= 0, cats[codes] if len(cats) else None, None)
+    return np.where(symbol.astype(str).str.contains(":", regex=False), "swap", "spot")
+
+def _keys(df, cols):
+    """Gruppierungsspalten; abgeleitete Buckets (DERIVED) als Ganzzahlen, formatiert wird
+    erst nach dem Gruppieren."""
+    out = {}
+    for c in cols:
+        if c in df.columns or c not in DERIVED:
+            out[c] = df[c].to_numpy()
+        elif c == "market_type":
+            out[c] = _market_type(df["symbol"])
+        else:
+            ts = df["timestamp"].to_numpy(dtype=np.int64)
+            if c == "hour":
+                out[c] = ts // 3600000 * 3600000
+            elif c == "week":
+                day = ts // 86400000
+                out[c] = day - (day + 3) % 7          # Montag der ISO-Woche (1970-01-01 = Do)
+            else:
+                out[c] = ts.astype("datetime64[ms]").astype("datetime64[M]").astype(np.int64)
+    return out
+
+def _format(g, cols):
+    if "hour" in cols:
+        g["hour"] = pd.to_datetime(g["hour"], unit="ms", utc=True).dt.strftime("%Y-%m-%dT%H:00Z")
+    if "week" in cols:
+        g["week"] = g["week"].to_numpy().astype("datetime64[D]").astype(str)
+    if "month" in cols:
+        g["month"] = g["month"].to_numpy().astype("datetime64[M]").astype(str)
+    return g
+
+def pnl_by(df, cols=("date",), cash=None, fills=False, dropna=True):
+    """PnL-Summe je Gruppe -> DataFrame [*cols, pnl_usdt(, fills)], sortiert nach den Schlüsseln.
+
+    dropna=False behält Fills ohne Schlüssel (z. B. Copytrades ohne Trader-ID) als eigene Gruppe.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=[*cols, "pnl_usdt", *(["fills"] if fills else [])])
+    if cash is None:
+        cash = cashflow(df)
+    frame = pd.DataFrame(_keys(df, cols))
+    frame["pnl_usdt"] = cash
+    grp = frame.groupby(list(cols), as_index=False, sort=True, observed=True, dropna=dropna)["pnl_usdt"]
+    g = grp.agg(pnl_usdt="sum", fills="size") if fills else grp.sum()
+    # erst nach dem Gruppieren formatieren (ein Wert je Bucket statt je Fill)
+    return _format(g, cols)
+
+def pnl_rollups(df, groupings=None, fills=False):
+    """Mehrere Gruppierungen in einem Durchgang (Cashflow wird nur einmal gerechnet)."""
+    groupings = groupings or GROUPINGS
+    cash = cashflow(df)
+    return {name: pnl_by(df, cols, cash, fills) for name, cols in groupings.items()}
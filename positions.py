@@ -0,0 +1,236 @@
+import os, json
+from array import array
+import numpy as np
+import pandas as pd
+
+import pnl
+import store
+import ohlcv
+import traders
+from normalize import df_from_trades
+
+# ========= Realisierter PnL (FIFO / Durchschnittskosten) =========
+# Pro Symbol eine Lot-Queue (Menge mit Vorzeichen + Einstandspreis) auf array('d').
+# Fills in Gegenrichtung schließen Lots -> realisierter PnL je Fill. Der Zustand
+# (offene Lots + Wasserstand) liegt im Store, jeder Lauf verarbeitet nur neue Fills.
+MODE = os.getenv("PNL_MODE", "fifo")     # "fifo" oder "avg"
+EPS  = 1e-12
+
+class Book:
+    """Offene Lots eines Symbols. Invariante: alle offenen Lots haben dasselbe Vorzeichen."""
+    __slots__ = ("mode", "qty", "price", "head", "allow_short")
+
+    def __init__(self, mode=MODE, qty=None, price=None, allow_short=False):
+        self.mode = mode
+        self.qty = qty if qty is not None else array("d")
+        self.price = price if price is not None else array("d")
+        self.head = 0
+        # Spot: Verkauf ohne bekannten Bestand (Historie vor dem Store) eröffnet keinen Short
+        self.allow_short = allow_short
+
+    def position(self):
+        return sum(self.qty[self.head:])
+
+    def fill(self, q, p):
+        """Fill mit Menge q (+Kauf / -Verkauf) zum Preis p -> (realisiert, Einstand der geschlossenen Menge)."""
+        qty, price = self.qty, self.price
+        h, n = self.head, len(qty)
+        realized = basis = 0.0
+        while h < n and q and (qty[h] > 0) != (q > 0):
+            lq = qty[h]
+            close = min(abs(q), abs(lq))
+            if lq > 0:                    # Long-Lot wird durch Verkauf geschlossen
+                realized += close * (p - price[h])
+                lq -= close
+                q += close
+            else:                         # Short-Lot wird durch Kauf geschlossen
+                realized += close * (price[h] - p)
+                lq += close
+                q -= close
+            basis += close * price[h]
+            if abs(lq) <= EPS:
+                h += 1
+            else:
+                qty[h] = lq
+        if abs(q) > EPS and (q > 0 or self.allow_short):
+            if self.mode == "avg" and h < n:
+                # Durchschnittskosten: alles in einem Lot zusammenfassen
+                tot = qty[h] + q
+                price[h] = (qty[h] * price[h] + q * p) / tot
+                qty[h] = tot
+            else:
+                qty.append(q)
+                price.append(p)
+        # verbrauchte Lots gelegentlich abschneiden (amortisiert O(1))
+        if h > 64 and h * 2 > len(qty):
+            del qty[:h]
+            del price[:h]
+            h = 0
+        self.head = h
+        return realized, basis
+
+    def lots(self):
+        return self.qty[self.head:], self.price[self.head:]
+
+def realize(df, books=None, mode=MODE):
+    """Realisierter PnL je Fill für ein DataFrame aus df_from_trades.
+
+    Verarbeitet die Fills je Symbol in Zeitreihenfolge; 'books' (Symbol -> Book) wird
+    fortgeschrieben. Rückgabe: (pnl_usdt, basis_usdt) als float64-Arrays in df-Reihenfolge.
+    """
+    books = {} if books is None else books
+    n = len(df)
+    realized = np.zeros(n)
+    basis = np.zeros(n)
+    if not n:
+        return realized, basis
+    order = np.lexsort((df["timestamp"].to_numpy(), df["symbol"].astype(str).to_numpy()))
+    sym = df["symbol"].astype(str).to_numpy()[order].tolist()
+    sign = np.where(df["side"].to_numpy() == "sell", -1.0, 1.0)[order]
+    price = df["price"].to_numpy(dtype=np.float64)[order]
+    cost = df["cost"].to_numpy(dtype=np.float64)[order]
+    # Basis-Menge aus cost/price (deckt Kontraktgrößen bei Swaps ab)
+    base = np.where(price > 0, cost / np.where(price > 0, price, 1.0), df["amount"].to_numpy(dtype=np.float64)[order])
+    q_list = (sign * base).tolist()
+    p_list = price.tolist()
+    r_out = [0.0] * n
+    b_out = [0.0] * n
+    book = None
+    last_sym = None
+    for i in range(n):
+        s = sym[i]
+        if s != last_sym:
+            book = books.get(s)
+            if book is None:
+                book = books[s] = Book(mode, allow_short=":" in s)
+            last_sym = s
+        r_out[i], b_out[i] = book.fill(q_list[i], p_list[i])
+    realized[order] = r_out
+    basis[order] = b_out
+    # Fees wie beim Cashflow-PnL: USDT/USD direkt, sonst umgerechnet (Spalte 'fee_usdt')
+    realized -= pnl.fees(df)
+    return realized, basis
+
+# ---- Persistenz ---------------------------------------------------------------
+
+def load_books(con, mode=MODE):
+    """Offene Lots + Wasserstand (letzter verarbeiteter Zeitstempel) je Symbol aus dem Store."""
+    books, marks = {}, {}
+    for sym, m, qty, price, last_ts in con.execute(
+            "SELECT symbol, mode, qty, price, last_ts FROM position_state"):
+        if m != mode:
+            continue
+        q, p = array("d"), array("d")
+        q.frombytes(qty)
+        p.frombytes(price)
+        books[sym] = Book(mode, q, p, allow_short=":" in sym)
+        marks[sym] = last_ts
+    return books, marks
+
+def _reset(con):
+    with con:
+        con.execute("DELETE FROM position_state")
+        con.execute("DELETE FROM realized_pnl")
+        con.execute("DELETE FROM trader_stats")
+
+def _unrealized_trades(con):
+    """Fills im Store ohne Eintrag in realized_pnl (Anti-Join über Symbol + ID), nach Zeit."""
+    rows = con.execute(
+        "SELECT t.raw FROM trades t WHERE NOT EXISTS "
+        "(SELECT 1 FROM realized_pnl r WHERE r.symbol = t.symbol AND r.id = t.id) ORDER BY t.timestamp"
+    )
+    return df_from_trades([json.loads(r[0]) for r in rows])
+
+def update(con, mode=MODE, prices=None):
+    """Neue Fills aus dem Store verarbeiten und realisierten PnL + Lot-Zustand speichern.
+
+    Neu ist jeder Fill ohne Eintrag in realized_pnl – auch später eingetroffene (Overlap,
+    nachgefüllte Lücken, Stream-Reconnect). Liegt ein solcher Fill vor dem Wasserstand
+    seines Symbols, wird das Symbol von vorn neu abgespielt (FIFO hängt von der Reihenfolge
+    ab); betrifft das Copytrades, wird alles neu aufgebaut, weil der Trader-Index nur
+    fortgeschrieben werden kann.
+
+    Mit 'prices' (ohlcv.PriceHistory) werden Fees in anderen Währungen zum Fill-Zeitpunkt
+    in USDT umgerechnet. Der Copy-Trader-Index (traders.py) wird in derselben Transaktion
+    fortgeschrieben. Gibt die neu realisierten Fills als DataFrame zurück.
+    """
+    books, marks = load_books(con, mode)
+    if (len(marks) < con.execute("SELECT COUNT(*) FROM position_state").fetchone()[0]
+            or not store.get_meta(con, traders.META_KEY)):
+        # Modus gewechselt (oder Trader-Index noch nie aus der vollen Historie gebaut)
+        # -> komplett neu aufbauen
+        books, marks = {}, {}
+        _reset(con)
+        store.set_meta(con, traders.META_KEY, 1)
+    df = _unrealized_trades(con)
+    if df.empty:
+        return df.assign(pnl_usdt=[], basis_usdt=[])
+
+    first = df.groupby("symbol", observed=True)["timestamp"].min()
+    late = sorted(s for s, ts in first.items() if s in marks and ts < marks[s])
+    if late:
+        # Nachzügler vor dem Wasserstand: betroffene Symbole komplett neu abspielen
+        marker = ",".join("?" * len(late))
+        replay = df_from_trades([json.loads(r[0]) for r in con.execute(
+            f"SELECT raw FROM trades WHERE symbol IN ({marker}) ORDER BY timestamp", late)])
+        if replay["is_copy"].any() or replay["copy_trader"].notna().any():
+            books, marks = {}, {}
+            _reset(con)
+            df = _unrealized_trades(con)
+        else:
+            with con:
+                con.execute(f"DELETE FROM realized_pnl WHERE symbol IN ({marker})", late)
+                con.execute(f"DELETE FROM position_state WHERE symbol IN ({marker})", late)
+            for s in late:
+                books.pop(s, None)
+                marks.pop(s, None)
+            df = pd.concat([df[~df["symbol"].isin(late)], replay], ignore_index=True)
+            df = df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+    if prices is not None:
+        df["fee_usdt"] = ohlcv.fee_usdt(df, prices)
+    df["pnl_usdt"], df["basis_usdt"] = realize(df, books, mode)
+
+    state = []
+    for sym, g in df.groupby("symbol", observed=True):
+        qty, price = books[sym].lots()
+        state.append((sym, mode, qty.tobytes(), price.tobytes(), max(int(g["timestamp"].max()), marks.get(sym, 0))))
+    with con:
+        con.executemany("INSERT OR REPLACE INTO position_state VALUES (?, ?, ?, ?, ?)", state)
+        con.executemany(
+            "INSERT OR REPLACE INTO realized_pnl VALUES (?, ?, ?, ?, ?, ?, ?)",
+            zip(df["symbol"].astype(str).tolist(), df["id"].tolist(), df["timestamp"].astype(int).tolist(),
+                df["date"].tolist(), df["copy_trader"].astype(object).where(df["copy_trader"].notna(), None).tolist(),
+                df["pnl_usdt"].tolist(), df["basis_usdt"].tolist()),
+        )
+        # Copy-Trader-Index mit denselben (nur neuen) Fills fortschreiben
+        traders.update(con, df)
+    return df
+
+def realized_by(con, col="date", since_ms=None):
+    """Realisierter PnL aus dem Store, gruppiert nach 'date', 'symbol' oder 'copy_trader'."""
+    if col not in ("date", "symbol", "copy_trader"):
+        raise ValueError(col)
+    return pd.read_sql_query(
+        f"SELECT {col}, SUM(pnl_usdt) AS pnl_usdt, COUNT(*) AS fills FROM realized_pnl "
+        f"WHERE timestamp >= ? AND {col} IS NOT NULL GROUP BY {col} ORDER BY {col}",
+        con, params=(int(since_ms or 0),),
+    )
+
+def realized_fills(con, since_ms=None, keys=None):
+    """Realisierter PnL je Fill ((symbol, id) -> (pnl_usdt, basis_usdt)); mit 'keys' nur für diese Fills.
+
+    Trade-IDs sind nur je Symbol eindeutig (wie der Schlüssel im Store), daher (symbol, id).
+    """
+    if keys is None:
+        rows = con.execute(
+            "SELECT symbol, id, pnl_usdt, basis_usdt FROM realized_pnl WHERE timestamp >= ?", (int(since_ms or 0),))
+        return {(r[0], r[1]): (r[2], r[3]) for r in rows}
+    keys, out = set(keys), {}
+    ids = sorted({k[1] for k in keys})
+    for lo in range(0, len(ids), 500):
+        part = ids[lo:lo + 500]
+        rows = con.execute(f"SELECT symbol, id, pnl_usdt, basis_usdt FROM realized_pnl WHERE timestamp >= ? "
+                           f"AND id IN ({','.join('?' * len(part))})", [int(since_ms or 0), *part])
+        out.update({(r[0], r[1]): (r[2], r[3]) for r in rows if (r[0], r[1]) in keys})
+    return out
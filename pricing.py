@@ -0,0 +1,50 @@
+import math
+
+# ========= Bewertung in USDT =========
+# Ein fetch_tickers()-Snapshot für alle Assets statt fetch_ticker je Coin;
+# ohne direktes /USDT-Paar wird über BTC bzw. ETH geroutet.
+STABLES = ("USDT", "USD", "BUSD", "USDC")
+BRIDGES = ("BTC", "ETH")
+
+def price_map(tickers):
+    """Symbol -> letzter Preis aus einem fetch_tickers()-Ergebnis (nur gültige Preise)."""
+    out = {}
+    for sym, t in (tickers or {}).items():
+        p = t.get("last") or t.get("close")
+        if not p and t.get("bid") and t.get("ask"):
+            p = (t["bid"] + t["ask"]) / 2
+        if p and float(p) > 0:
+            out[sym] = float(p)
+    return out
+
+def usdt_price(ccy, prices):
+    """USDT-Preis eines Assets oder None: direkt, invers oder über BTC/ETH."""
+    ccy = ccy.upper()
+    if ccy in STABLES:
+        return 1.0
+    if f"{ccy}/USDT" in prices:
+        return prices[f"{ccy}/USDT"]
+    if f"USDT/{ccy}" in prices:
+        return 1.0 / prices[f"USDT/{ccy}"]
+    for b in BRIDGES:
+        if f"{ccy}/{b}" in prices and f"{b}/USDT" in prices:
+            return prices[f"{ccy}/{b}"] * prices[f"{b}/USDT"]
+    return None
+
+def value_balance(typ, totals, prices):
+    """Bewertet ein 'total'-Dict -> (Summe USDT, Detailzeilen, nicht bewertbare Assets)."""
+    total = 0.0
+    details, unpriced = [], []
+    for ccy, qty in totals.items():
+        q = float(qty or 0.0)
+        if q == 0:
+            continue
+        pu = usdt_price(ccy, prices)
+        if pu is None:
+            unpriced.append(ccy)
+            pu = math.nan
+        val = q * pu if not math.isnan(pu) else 0.0
+        details.append({"type": typ, "asset": ccy, "qty": q, "price_usdt": pu, "value_usdt": val,
+                        "priced": ccy not in unpriced})
+        total += val
+    return total, details, unpriced
@@ -0,0 +1,305 @@
+import os, math
+
+import equity
+import jsonout
+import positions
+
+# ========= HTML-Dashboard (Render-Stufe der Pipeline) =========
+# Eine statische index.html: Kennzahlen, Equity-Kurve und vorberechnete Rollups als JSON
+# in der Seite, Plotly rendert im Browser. Einzel-Trades liegen paginiert daneben.
+DAYS = int(os.getenv("DAYS", "14"))        # Zeitraum für PnL (Text in der Zusammenfassung)
+OUTDIR = os.getenv("OUTDIR", "site")       # Ausgabeordner (für GitHub Pages)
+
+def roi(pnl_df, eq_now):
+    """Einfacher ROI: Sum(PnL) / StartEquity."""
+    if pnl_df.empty:
+        return float("nan")
+    total_pnl = pnl_df["pnl_usdt"].sum()
+    start_equity = eq_now - total_pnl
+    if start_equity <= 0:
+        return float("nan")
+    return 100.0 * (total_pnl / start_equity)
+
+def write_dashboard(df_pnl, df_eq, eq_now_usdt, eurusd, rollup, realized_usdt=0.0, outdir=None, accounts=None,
+                    days=None, traders=None, realized_eur=None, writer=None):
+    """index.html mit vorberechneten Rollups (rollups.build_rollups) und dem Copy-Trader-Index
+    (traders.compact); Einzel-Trades lädt die Seite bei Bedarf aus trades/*.json
+    (rollups.write_trade_pages).
+
+    Mit 'accounts' (Zeilen je Konto) wird die Seite zur Gesamtansicht: Kontentabelle mit
+    Links auf die Seiten der Konten, Einzel-Trades nur dort.
+
+    'writer(path, text)' ersetzt das Schreiben (z. B. Manifest.write: nur bei Änderung).
+
+    EUR: Zeitreihen und Rollups mit Spalte/Feld '*_eur' (fx.to_eur, Kurs je Tag) werden so
+    angezeigt; sonst und für aktuelle Bestände gilt der aktuelle Kurs 'eurusd'.
+    """
+    days = DAYS if days is None else days
+    # Texte oben – beide Währungen vorbereiten
+    eq_now_eur = eq_now_usdt * eurusd
+    total_pnl = float(df_pnl["pnl_usdt"].sum()) if not df_pnl.empty else 0.0
+    total_pnl_eur = (float(df_pnl["pnl_eur"].sum()) if "pnl_eur" in df_pnl and not df_pnl.empty
+                     else total_pnl * eurusd)
+    realized_eur = realized_usdt * eurusd if realized_eur is None else realized_eur
+    if "drawdown_pct" in df_eq:
+        # Kurve aus Balance-Snapshots
+        roi_pct, dd_pct = equity.roi(df_eq), equity.max_drawdown(df_eq)
+    else:
+        roi_pct, dd_pct = roi(df_pnl, eq_now_usdt), float("nan")
+    roi_txt = f"{roi_pct:.2f} %" if not (math.isnan(roi_pct)) else "–"
+    dd_txt = f"{dd_pct:.2f} %" if not (math.isnan(dd_pct)) else "–"
+
+    # Charts (Plotly) – wir geben Daten + Layout in JS weiter (Dropdown steuert Währung)
+    data = {
+        "equity": df_eq.to_dict(orient="list"),
+        "eq_now_usdt": eq_now_usdt,
+        "eurusd": eurusd,
+        "rollups": rollup,
+        "traders": traders or {"key": []},
+        "accounts": accounts or [],
+        "trades": accounts is None,
+        "summary": {
+            "eq_now_usdt": eq_now_usdt,
+            "eq_now_eur": eq_now_eur,
+            "total_pnl_usdt": total_pnl,
+            "total_pnl_eur": total_pnl_eur,
+            "roi_pct": roi_txt,
+            "max_dd_pct": dd_txt,
+            "realized_usdt": realized_usdt,
+            "realized_eur": realized_eur,
+        }
+    }
+    html = f"""<!doctype html>
+<html>
+<head>
+<meta charset="utf-8"/>
+<title>MEXC Dashboard</title>
+<script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script>
+<style>
+body{{font-family:system-ui,-apple-system,Segoe UI,Roboto,Ubuntu,"Helvetica Neue",Arial,sans-serif;margin:24px;}}
+h1,h2,h3{{margin:0 0 8px 0;}}
+.card{{border:1px solid #e5e7eb;border-radius:12px;padding:16px;margin:12px 0;box-shadow:0 1px 3px rgba(0,0,0,0.03)}}
+.row{{display:flex;gap:12px;flex-wrap:wrap}}
+.col{{flex:1 1 320px}}
+.badge{{display:inline-block;padding:4px 8px;border-radius:999px;background:#eef2ff;color:#1e40af;font-weight:600}}
+table{{border-collapse:collapse;width:100%}}
+th,td{{border-bottom:1px solid #eee;padding:8px;text-align:left;font-size:14px}}
+select{{padding:6px 10px;border:1px solid #ddd;border-radius:8px}}
+.mono{{font-family:ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,"Liberation Mono","Courier New",monospace}}
+</style>
+</head>
+<body>
+<h1>📊 MEXC Dashboard</h1>
+<div class="row">
+  <div class="card col">
+    <div class="badge">Zusammenfassung</div>
+    <div id="summary"></div>
+    <div style="margin-top:8px">
+      💱 Währung:
+      <select id="currency">
+        <option value="USDT">USDT</option>
+        <option value="EUR">EUR</option>
+      </select>
+    </div>
+  </div>
+</div>
+
+<div class="row">
+  <div class="card col">
+    <h3>Equity-Kurve</h3>
+    <div id="equity"></div>
+  </div>
+  <div class="card col">
+    <h3>PnL je
+      <select id="resolution">
+        <option value="day">Tag</option>
+        <option value="week">Woche</option>
+        <option value="month">Monat</option>
+      </select>
+    </h3>
+    <div id="pnl"></div>
+  </div>
+</div>
+
+<div class="row">
+  <div class="card col">
+    <h3>Nach Symbol</h3>
+    <div id="symboltable"></div>
+  </div>
+  <div class="card col">
+    <h3>Nach Markt-Typ</h3>
+    <div id="markettable"></div>
+  </div>
+</div>
+
+<div class="card" id="accountcard" style="display:none">
+  <h3>Konten</h3>
+  <div id="accounttable"></div>
+</div>
+
+<div class="card">
+  <h3>Copytrades</h3>
+  <div id="copytable"></div>
+  <div style="font-size:12px;color:#6b7280;margin-top:6px">
+    Realisierter PnL (nach Fees) seit Beginn des Trade-Stores; Win-Rate = Anteil der schließenden Fills mit Gewinn.
+    Hinweis: Copytrades werden aus Trade-Metadaten erkannt (z. B. traderId/strategyId in der API-Antwort).
+    Falls MEXC diese Felder im jeweiligen Segment nicht liefert, bleibt die Tabelle leer.
+  </div>
+</div>
+
+<div class="card">
+  <h3>Trades</h3>
+  <button id="loadtrades">Trades laden</button>
+  <span id="tradepager"></span>
+  <div id="tradetable"></div>
+</div>
+
+<script>
+const DATA = {jsonout.dumps(data).decode("utf-8")};
+
+function fmt(n, cur) {{
+  if (cur==="EUR") return new Intl.NumberFormat('de-DE', {{ style:'currency', currency:'EUR' }}).format(n);
+  return new Intl.NumberFormat('en-US', {{ maximumFractionDigits: 2 }}).format(n) + " USDT";
+}}
+
+function renderSummary(cur) {{
+  const s = DATA.summary;
+  const eq = (cur==="EUR") ? s.eq_now_eur : s.eq_now_usdt;
+  const pnl = (cur==="EUR") ? s.total_pnl_eur : s.total_pnl_usdt;
+  const real = (cur==="EUR") ? s.realized_eur : s.realized_usdt;
+  const html = `
+    <div>Kontostand: <b>${{fmt(eq, cur)}}</b></div>
+    <div>Summe PnL (${days} Tage): <b>${{fmt(pnl, cur)}}</b></div>
+    <div>Realisiert ({positions.MODE.upper()}): <b>${{fmt(real, cur)}}</b></div>
+    <div>ROI (einfach): <b>${{s.roi_pct}}</b></div>
+    <div>Max. Drawdown: <b>${{s.max_dd_pct}}</b></div>
+  `;
+  document.getElementById("summary").innerHTML = html;
+}}
+
+function renderEquity(cur) {{
+  const eq = DATA.equity;
+  if (!eq.date || eq.date.length===0) {{
+    document.getElementById("equity").innerHTML = "<i>Keine Daten</i>"; return;
+  }}
+  const y = (cur==="EUR") ? (eq.equity_eur || eq.equity_usdt.map(v => v * DATA.eurusd)) : eq.equity_usdt;
+  const fig = {{
+    data: [{{ x: eq.date, y: y, mode:'lines', name:'Equity' }}],
+    layout: {{ margin:{{l:40,r:20,t:10,b:60}}, xaxis:{{tickangle:45}}, yaxis:{{title:cur}} }}
+  }};
+  Plotly.newPlot('equity', fig.data, fig.layout, {{displayModeBar:false}});
+}}
+
+// EUR je Tag (Python, fx.py) – ältere Daten ohne pnl_eur: aktueller Kurs
+function eurOf(r) {{
+  return r.pnl_eur || r.pnl.map(v => v * DATA.eurusd);
+}}
+
+function renderPnL(cur) {{
+  const res = document.getElementById("resolution").value;
+  const p = DATA.rollups[res];
+  if (!p.key || p.key.length===0) {{
+    document.getElementById("pnl").innerHTML = "<i>Keine Daten</i>"; return;
+  }}
+  const y = (cur==="EUR") ? eurOf(p) : p.pnl;
+  const fig = {{
+    data: [{{ x: p.key, y: y, type:'bar', name:'PnL' }}],
+    layout: {{ margin:{{l:40,r:20,t:10,b:60}}, xaxis:{{tickangle:45}}, yaxis:{{title:cur}} }}
+  }};
+  Plotly.newPlot('pnl', fig.data, fig.layout, {{displayModeBar:false}});
+}}
+
+// Rollup-Tabelle (vorberechnet in Python), sortiert nach PnL, höchstens 'limit' Zeilen
+function renderRollup(id, r, label, cur, limit, empty) {{
+  if (!r.key || r.key.length===0) {{
+    document.getElementById(id).innerHTML = `<i>${{empty}}</i>`; return;
+  }}
+  const idx = r.key.map((_, i) => i).sort((a, b) => r.pnl[b] - r.pnl[a]).slice(0, limit);
+  const pnl = (cur==="EUR") ? eurOf(r) : r.pnl;
+  let html = `<table><thead><tr><th>${{label}}</th><th>Trades</th><th>PnL (${{cur}})</th></tr></thead><tbody>`;
+  idx.forEach(i => {{
+    const v = pnl[i];
+    html += `<tr><td>${{r.key[i] ?? "(unbekannt)"}}</td><td>${{r.n[i]}}</td><td class="mono">${{v.toFixed(2)}}</td></tr>`;
+  }});
+  html += "</tbody></table>";
+  document.getElementById(id).innerHTML = html;
+}}
+
+// Copy-Trader-Index (traders.py): laufende Summen seit Beginn des Stores, nach realisiertem PnL
+function renderTraders(cur, limit) {{
+  const t = DATA.traders;
+  if (!t.key || t.key.length===0) {{
+    document.getElementById("copytable").innerHTML = "<i>Keine Copytrade-Metadaten gefunden.</i>"; return;
+  }}
+  const conv = v => (cur==="EUR") ? v * DATA.eurusd : v;
+  let html = `<table><thead><tr><th>Trader</th><th>Fills</th><th>Volumen (${{cur}})</th><th>Fees (${{cur}})</th>` +
+             `<th>Realisiert (${{cur}})</th><th>Win-Rate</th><th>Max. DD (${{cur}})</th></tr></thead><tbody>`;
+  t.key.slice(0, limit).forEach((k, i) => {{
+    const wr = t.closes[i] ? (100 * t.wins[i] / t.closes[i]).toFixed(1) + " %" : "–";
+    html += `<tr><td>${{k ?? "(unbekannt)"}}</td><td>${{t.n[i]}}</td><td class="mono">${{conv(t.volume[i]).toFixed(2)}}</td>` +
+            `<td class="mono">${{conv(t.fees[i]).toFixed(2)}}</td><td class="mono">${{conv(t.pnl[i]).toFixed(2)}}</td>` +
+            `<td class="mono">${{wr}}</td><td class="mono">${{conv(t.max_dd[i]).toFixed(2)}}</td></tr>`;
+  }});
+  document.getElementById("copytable").innerHTML = html + "</tbody></table>";
+}}
+
+// Gesamtansicht: eine Zeile je Konto, Link auf dessen eigene Seite
+function renderAccounts(cur) {{
+  if (!DATA.accounts.length) return;
+  document.getElementById("accountcard").style.display = "";
+  const conv = v => (cur==="EUR") ? v * DATA.eurusd : v;
+  let html = `<table><thead><tr><th>Konto</th><th>Kontostand (${{cur}})</th><th>PnL (${{cur}})</th><th>Realisiert (${{cur}})</th></tr></thead><tbody>`;
+  DATA.accounts.forEach(a => {{
+    const name = a.ok ? `<a href="${{a.name}}/index.html">${{a.name}}</a>` : `${{a.name}} (Fehler)`;
+    html += `<tr><td>${{name}}</td><td class="mono">${{conv(a.eq_now_usdt).toFixed(2)}}</td>` +
+            `<td class="mono">${{conv(a.pnl_usdt).toFixed(2)}}</td><td class="mono">${{conv(a.realized_usdt).toFixed(2)}}</td></tr>`;
+  }});
+  document.getElementById("accounttable").innerHTML = html + "</tbody></table>";
+}}
+
+// Einzel-Trades: erst auf Klick, seitenweise aus trades/index.json + trades/pNNNNN.json
+let TRADES = null, PAGE = 0;
+async function loadTrades(page) {{
+  if (!TRADES) TRADES = await (await fetch("trades/index.json")).json();
+  PAGE = Math.max(0, Math.min(page, TRADES.pages - 1));
+  const p = await (await fetch(`trades/p${{String(PAGE).padStart(5, "0")}}.json`)).json();
+  let html = "<table><thead><tr>" + p.columns.map(c => `<th>${{c}}</th>`).join("") + "</tr></thead><tbody>";
+  p.rows.forEach(r => {{
+    const cells = r.slice();
+    cells[0] = new Date(cells[0]).toISOString().replace("T", " ").slice(0, 19);
+    html += "<tr>" + cells.map(v => `<td>${{v ?? ""}}</td>`).join("") + "</tr>";
+  }});
+  document.getElementById("tradetable").innerHTML = html + "</tbody></table>";
+  document.getElementById("tradepager").innerHTML =
+    ` <button onclick="loadTrades(PAGE-1)">◀</button> Seite ${{PAGE+1}} / ${{TRADES.pages}} (${{TRADES.total}} Trades) <button onclick="loadTrades(PAGE+1)">▶</button>`;
+}}
+
+function renderAll() {{
+  const cur = document.getElementById("currency").value;
+  renderSummary(cur);
+  renderEquity(cur);
+  renderPnL(cur);
+  renderRollup("symboltable", DATA.rollups.symbol, "Symbol", cur, 20, "Keine Daten");
+  renderRollup("markettable", DATA.rollups.market_type, "Markt-Typ", cur, 10, "Keine Daten");
+  renderTraders(cur, 50);
+  renderAccounts(cur);
+}}
+
+document.getElementById("currency").addEventListener("change", renderAll);
+document.getElementById("resolution").addEventListener("change", renderAll);
+if (DATA.trades) {{
+  document.getElementById("loadtrades").addEventListener("click", () => loadTrades(0));
+}} else {{
+  document.getElementById("loadtrades").style.display = "none";
+  document.getElementById("tradetable").innerHTML = "<i>Einzel-Trades auf den Seiten der Konten.</i>";
+}}
+renderAll();
+</script>
+
+</body>
+</html>"""
+    outdir = outdir or OUTDIR
+    os.makedirs(outdir, exist_ok=True)
+    out_path = os.path.join(outdir, "index.html")
+    (writer or jsonout.write_file)(out_path, html)
+    return out_path
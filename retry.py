@@ -0,0 +1,133 @@
+import os, time, random, asyncio
+import email.utils
+
+import ccxt
+
+import metrics
+
+# ========= Retries / Backoff =========
+# Einheitliche Fehlerbehandlung für Exchange-Aufrufe statt 'except Exception: pass'.
+# ccxt-Fehler werden eingeordnet:
+#   throttle   RateLimitExceeded, DDoSProtection (429/418) -> Retry-After abwarten, Rate senken
+#   transient  übrige NetworkError (Timeout, 5xx, Wartung)  -> Backoff mit Jitter
+#   fatal      AuthenticationError, PermissionDenied, ...   -> sofort weiterreichen (Lauf bricht ab)
+#   error      sonstige ExchangeError (BadSymbol, ...)      -> kein Retry, Aufrufer entscheidet
+RETRY_MAX    = int(os.getenv("RETRY_MAX", "5"))          # Wiederholungen nach dem ersten Versuch
+RETRY_BASE_S = float(os.getenv("RETRY_BASE_S", "0.5"))   # Backoff-Basis (verdoppelt je Versuch)
+RETRY_CAP_S  = float(os.getenv("RETRY_CAP_S", "30"))     # längste Einzelpause
+MAX_RATE_LIMIT_MS = 10000   # synchrone Instanzen: ccxt-Abstand höchstens so weit strecken
+# ... und danach wieder annähern: je RECOVER_CALLS Erfolge + RECOVER_STEP der Ausgangsrate
+RECOVER_CALLS = int(os.getenv("RETRY_RECOVER_CALLS", "10"))
+RECOVER_STEP  = float(os.getenv("RETRY_RECOVER_STEP", "0.1"))
+
+def classify(exc):
+    if isinstance(exc, (ccxt.RateLimitExceeded, ccxt.DDoSProtection)):
+        return "throttle"
+    if isinstance(exc, ccxt.AuthenticationError):
+        return "fatal"
+    if isinstance(exc, (ccxt.NetworkError, asyncio.TimeoutError, ConnectionError)):
+        return "transient"
+    return "error"
+
+def retry_after(ex):
+    """Retry-After der letzten Antwort (Sekunden oder HTTP-Datum) -> Sekunden bzw. None.
+
+    Bei parallelen Async-Anfragen ist das die zuletzt eingetroffene Antwort – als Hinweis gut genug.
+    """
+    headers = getattr(ex, "last_response_headers", None) or {}
+    raw = next((v for k, v in headers.items() if str(k).lower() == "retry-after"), None)
+    if raw is None:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(raw).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def delay(attempt, kind, ex=None):
+    """Pause vor Versuch attempt+1: Retry-After, sonst exponentiell mit Jitter (halb fest, halb zufällig)."""
+    hint = retry_after(ex) if kind == "throttle" else None
+    if hint is not None:
+        return min(hint, RETRY_CAP_S) + random.uniform(0, RETRY_BASE_S)
+    step = min(RETRY_CAP_S, RETRY_BASE_S * 2 ** attempt)
+    return step / 2 + random.uniform(0, step / 2)
+
+def slow_down(ex):
+    """Synchrone ccxt-Instanz nach Drosselung langsamer takten (rateLimit verdoppeln)."""
+    if getattr(ex, "rateLimit", None):
+        if getattr(ex, "_base_rate_limit", None) is None:
+            ex._base_rate_limit = ex.rateLimit
+        ex.rateLimit = min(MAX_RATE_LIMIT_MS, ex.rateLimit * 2)
+        ex._rate_ok = 0
+
+def speed_up(ex):
+    """Nach Erfolgen additiv zurück zum ursprünglichen Takt (wie TokenBucket.succeeded, fetch_async.py).
+
+    Gerechnet in Requests/s: je RECOVER_CALLS Erfolge + RECOVER_STEP der Ausgangsrate, bis
+    rateLimit wieder beim Wert vor der ersten Drosselung ist.
+    """
+    base = getattr(ex, "_base_rate_limit", None)
+    if not base or ex.rateLimit <= base:
+        return
+    ex._rate_ok = getattr(ex, "_rate_ok", 0) + 1
+    if ex._rate_ok < RECOVER_CALLS:
+        return
+    ex._rate_ok = 0
+    rate = 1000.0 / ex.rateLimit + RECOVER_STEP * 1000.0 / base
+    ex.rateLimit = max(base, 1000.0 / rate)
+
+def _should_retry(exc, attempt, tries):
+    kind = classify(exc)
+    return kind if kind in ("throttle", "transient") and attempt < tries else None
+
+def call(fn, *args, ex=None, tries=None, on_throttle=None, **kw):
+    """fn(*args, **kw) mit Retries; nach dem letzten Versuch wird der Fehler weitergereicht.
+
+    'ex' liefert die Antwort-Header (Retry-After), 'on_throttle(pause)' meldet Drosselung
+    an einen Rate-Limiter (Standard: ccxt-Takt von 'ex' strecken, siehe slow_down; Erfolge
+    nähern ihn wieder an, siehe speed_up).
+    """
+    tries = RETRY_MAX if tries is None else tries
+    if on_throttle is None and ex is not None:
+        on_throttle = lambda pause: slow_down(ex)
+    for attempt in range(tries + 1):
+        try:
+            out = fn(*args, **kw)
+        except Exception as e:
+            kind = _should_retry(e, attempt, tries)
+            if kind is None:
+                raise
+            pause = delay(attempt, kind, ex)
+            if kind == "throttle":
+                metrics.add_wait(pause)
+                if on_throttle:
+                    on_throttle(pause)
+            metrics.add_retry()
+            time.sleep(pause)
+            continue
+        if ex is not None:
+            speed_up(ex)
+        return out
+
+async def acall(fn, *args, ex=None, tries=None, on_throttle=None, gate=None, **kw):
+    """Async-Pendant zu call(); 'gate()' (z. B. Token-Bucket) wird vor jedem Versuch erwartet."""
+    tries = RETRY_MAX if tries is None else tries
+    for attempt in range(tries + 1):
+        if gate is not None:
+            await gate()
+        try:
+            return await fn(*args, **kw)
+        except Exception as e:
+            kind = _should_retry(e, attempt, tries)
+            if kind is None:
+                raise
+            pause = delay(attempt, kind, ex)
+            if kind == "throttle":
+                metrics.add_wait(pause)
+                if on_throttle:
+                    on_throttle(pause)
+            metrics.add_retry()
+            await asyncio.sleep(pause)
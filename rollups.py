@@ -0,0 +1,85 @@
+import os
+import numpy as np
+
+import pnl
+import jsonout
+
+# ========= Vorberechnete Aggregate fürs Dashboard =========
+# Die Seite bekommt nur kompakte Rollups (Tag/Woche/Monat, Symbol, Markt-Typ)
+# als parallele Arrays; Einzel-Trades liegen paginiert in trades/*.json
+# und werden erst auf Klick nachgeladen. Seitengröße wächst so nicht mit der Historie.
+PAGE_SIZE = int(os.getenv("TRADES_PAGE_SIZE", "500"))
+
+# Rollup-Name -> Gruppierung aus pnl.GROUPINGS
+VIEWS = {"day": "daily", "week": "weekly", "month": "monthly", "symbol": "symbol",
+         "market_type": "market_type"}
+
+# Spalten der Trade-Seiten (Reihenfolge = Array-Position im JSON)
+PAGE_COLUMNS = ["timestamp", "symbol", "side", "price", "amount", "cost", "fee_cost", "fee_ccy", "copy_trader"]
+
+def _compact(g, col):
+    """DataFrame [col, pnl_usdt, fills] -> {'key': [...], 'pnl': [...], 'n': [...]}."""
+    keys = g[col].astype(object).where(g[col].notna(), None).tolist() if len(g) else []
+    return {"key": keys,
+            "pnl": np.round(g["pnl_usdt"].to_numpy(dtype=np.float64), 4).tolist(),
+            "n": g["fills"].to_numpy(dtype=np.int64).tolist() if len(g) else []}
+
+def build_rollups(df, rates=None):
+    """Alle Rollups in einem Durchgang (ein Cashflow-Array für alle Gruppierungen).
+
+    Mit 'rates' (fx.Rates) zusätzlich 'pnl_eur': jeder Fill zum EUR-Kurs seines Tages.
+    Copy-Trader stehen nicht hier, sondern im inkrementellen Index (traders.py).
+    """
+    cash = pnl.cashflow(df)
+    cash_eur = cash * rates.asof(df["date"].to_numpy()) if rates is not None and len(df) else None
+    out = {}
+    for name, grouping in VIEWS.items():
+        cols = pnl.GROUPINGS[grouping]
+        out[name] = _compact(pnl.pnl_by(df, cols, cash, fills=True), cols[0])
+        if cash_eur is not None:
+            g = pnl.pnl_by(df, cols, cash_eur)
+            out[name]["pnl_eur"] = np.round(g["pnl_usdt"].to_numpy(dtype=np.float64), 4).tolist()
+    return out
+
+def merge(parts):
+    """Rollups mehrerer Konten zusammenführen (PnL, PnL in EUR und Fills je Schlüssel summiert)."""
+    out = {}
+    for name in VIEWS:
+        acc = {}
+        eur = all("pnl_eur" in (r.get(name) or {}) for r in parts) and bool(parts)
+        for r in parts:
+            v = r.get(name) or {"key": [], "pnl": [], "n": []}
+            for i, (k, p, n) in enumerate(zip(v["key"], v["pnl"], v["n"])):
+                row = acc.setdefault(k, [0.0, 0, 0.0])
+                row[0] += p
+                row[1] += n
+                if eur:
+                    row[2] += v["pnl_eur"][i]
+        # gleiche Reihenfolge wie pnl_by: nach Schlüssel, ohne Schlüssel (None) am Ende
+        keys = sorted(acc, key=lambda k: (k is None, str(k)))
+        out[name] = {"key": keys, "pnl": [round(acc[k][0], 4) for k in keys], "n": [acc[k][1] for k in keys]}
+        if eur:
+            out[name]["pnl_eur"] = [round(acc[k][2], 4) for k in keys]
+    return out
+
+def _page_rows(df, order, chunk):
+    """Zeilen (Listen in PAGE_COLUMNS-Reihenfolge) blockweise; umgewandelt wird nur der jeweilige Block."""
+    present = [c for c in PAGE_COLUMNS if c in df.columns]
+    for lo in range(0, len(order), chunk):
+        part = df[present].iloc[order[lo:lo + chunk]]
+        cols = [part[c].astype(object).where(part[c].notna(), None).tolist() if c in present
+                else [None] * len(part) for c in PAGE_COLUMNS]
+        yield zip(*cols)
+
+def write_trade_pages(df, root, page_size=None, writer=None):
+    """Trades (neueste zuerst) als index.json + pNNNNN.json unter 'root'; gibt den Index zurück.
+
+    Jede Seite ist spaltenweise ({'columns': [...], 'rows': [[...], ...]}); Seiten enden nach
+    'page_size' Zeilen oder jsonout.PAGE_BYTES Bytes, alte, überzählige Seiten werden gelöscht.
+    Umgewandelt und kodiert wird blockweise -> Speicher unabhängig von der Zahl der Trades.
+    'writer(path, bytes)' ersetzt das Schreiben (z. B. Manifest.write: unveränderte Seiten bleiben liegen).
+    """
+    page_size = page_size or PAGE_SIZE
+    order = np.argsort(-df["timestamp"].to_numpy(dtype=np.int64), kind="stable") if len(df) else np.zeros(0, dtype=np.int64)
+    return jsonout.write_pages(root, _page_rows(df, order, max(page_size, 5000)), PAGE_COLUMNS,
+                               writer=writer, page_rows=page_size)
@@ -0,0 +1,248 @@
+"""Dauerbetrieb ohne Kaltstart: warme Exchange-Instanzen, Jobs mit eigenem Takt.
+
+Statt je Cron-Lauf Python, pandas und ccxt neu zu starten und die Märkte neu zu laden,
+läuft ein Prozess durch und plant unabhängige Jobs (Takte per Umgebung):
+
+    equity   DAEMON_EQUITY_SEC   (60)     Balance + Bewertung; Snapshot höchstens alle DAEMON_SNAPSHOT_SEC
+    trades   DAEMON_TRADES_SEC   (300)    neue Fills ab Cursor (Spot + Swap)
+    fx       DAEMON_FX_SEC       (86400)  EUR-Tageskurse (fx.py)
+    markets  DAEMON_MARKETS_SEC  (86400)  Marktliste (exchange.reload_markets)
+    render   DAEMON_RENDER_SEC   (30)     Ausgaben – nur für geänderte Datensätze
+
+Neue Trades/FX (oder ein neuer Tag) bauen den Lauf neu auf und schreiben alle Ausgaben;
+reine Equity-Änderungen erneuern nur Kurve, latest.json und index.html am warmen Lauf.
+Unveränderte Dateien überspringt das Ausgabe-Manifest (manifest.py).
+
+Status lokal unter http://DAEMON_HOST:DAEMON_PORT/status (JSON: letzte Läufe, Dauer,
+Fehler je Job) und /metrics (Prometheus-Text); DAEMON_PORT=0 schaltet ihn ab.
+
+    python scripts/daemon_mexc.py --targets csv,html,latest
+    python scripts/daemon_mexc.py --once     # jeden Job einmal, dann Ende
+
+Ein Konto (MEXC_KEY/MEXC_SECRET); mehrere Konten weiter über dashboard.py.
+"""
+import os, sys, json, time, signal, argparse, threading, datetime as dt
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import store
+import metrics
+import exchange
+import equity
+import fx
+import pipeline
+
+EQUITY_SEC   = float(os.getenv("DAEMON_EQUITY_SEC", "60"))
+TRADES_SEC   = float(os.getenv("DAEMON_TRADES_SEC", "300"))
+FX_SEC       = float(os.getenv("DAEMON_FX_SEC", "86400"))
+MARKETS_SEC  = float(os.getenv("DAEMON_MARKETS_SEC", "86400"))
+RENDER_SEC   = float(os.getenv("DAEMON_RENDER_SEC", "30"))
+SNAPSHOT_SEC = float(os.getenv("DAEMON_SNAPSHOT_SEC", "300"))   # Equity-Snapshots im Store
+HOST = os.getenv("DAEMON_HOST", "127.0.0.1")
+PORT = int(os.getenv("DAEMON_PORT", "8765"))
+
+class Job:
+    """Ein periodischer Job; merkt sich Zeitpunkte, Dauer und Fehler für /status."""
+
+    def __init__(self, name, every, fn, first=0.0):
+        self.name = name
+        self.every = every
+        self.fn = fn
+        self.next_run = time.monotonic() + first
+        self.runs = self.errors = 0
+        self.last_run = self.last_ok = None     # Unix-Zeit
+        self.duration_s = None
+        self.last_error = None
+
+    def due(self, now):
+        return now >= self.next_run
+
+    def run(self):
+        t0 = time.perf_counter()
+        self.last_run = time.time()
+        try:
+            with metrics.stage(f"daemon_{self.name}"):
+                self.fn()
+            self.last_ok = self.last_run
+            self.last_error = None
+        except Exception as e:
+            # Job-Fehler halten den Daemon nicht an; nächster Versuch im nächsten Takt
+            metrics.add_error(e)
+            self.errors += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"Job {self.name} fehlgeschlagen:", self.last_error)
+        finally:
+            self.runs += 1
+            self.duration_s = round(time.perf_counter() - t0, 4)
+            self.next_run = time.monotonic() + self.every
+
+    def status(self):
+        iso = lambda t: None if t is None else dt.datetime.fromtimestamp(t, dt.timezone.utc).isoformat(timespec="seconds")
+        return {"every_s": self.every, "runs": self.runs, "errors": self.errors,
+                "last_run": iso(self.last_run), "last_ok": iso(self.last_ok), "duration_s": self.duration_s,
+                "next_in_s": round(max(0.0, self.next_run - time.monotonic()), 1), "last_error": self.last_error}
+
+class Daemon:
+    """Warmer Zustand (Exchanges, Store, letzter Lauf) + Jobs; step() führt fällige Jobs aus."""
+
+    def __init__(self, targets=pipeline.TARGETS, outdir=None, latest_path=None, con=None,
+                 api_key=None, secret=None):
+        self.targets = targets
+        self.outdir = outdir or pipeline.OUTDIR
+        self.latest_path = latest_path or pipeline.LATEST_PATH
+        self.con = con or store.open_store()
+        # einmal laden, danach warm – auch Run nutzt dieselben Instanzen
+        self.ex = {t: pipeline.make_ex(t, api_key, secret) for t in ("spot", "swap")}
+        self.run = None                 # warmer Pipeline-Lauf (DataFrames, Rollups, Manifest)
+        self.built_day = None
+        self.dirty = set()              # geänderte Datensätze seit dem letzten Rendern
+        self.mark = metrics.mark()      # Lücken ab dem letzten Trades-Job (-> latest.json 'incomplete')
+        self.eq_now = None
+        self.last_snapshot = 0.0
+        self.started_at = time.time()
+        self.jobs = [Job("equity", EQUITY_SEC, self.refresh_equity),
+                     Job("trades", TRADES_SEC, self.refresh_trades),
+                     Job("fx", FX_SEC, self.refresh_fx),
+                     # Märkte kommen beim Start aus dem Datei-Cache
+                     Job("markets", MARKETS_SEC, self.refresh_markets, first=MARKETS_SEC),
+                     Job("render", RENDER_SEC, self.render)]
+
+    def since_ms(self):
+        return pipeline.ts_ms(pipeline.now_utc() - dt.timedelta(days=pipeline.DAYS))
+
+    # --- Jobs ----------------------------------------------------------------
+
+    def refresh_equity(self):
+        eq, pos = pipeline.current_equity_usdt(self.ex["spot"], self.ex["swap"])
+        if time.time() - self.last_snapshot >= SNAPSHOT_SEC:
+            if equity.record(self.con, pos, eq) is not None:
+                self.last_snapshot = time.time()
+        if eq != self.eq_now:
+            self.eq_now = eq
+            self.dirty.add("equity")
+
+    def _trades_state(self):
+        return self.con.execute("SELECT COUNT(*), MAX(timestamp) FROM trades").fetchone()
+
+    def refresh_trades(self):
+        self.mark = metrics.mark()
+        before = self._trades_state()
+        since = self.since_ms()
+        pipeline.fetch_all_trades_spot(self.ex["spot"], since, self.con)
+        pipeline.fetch_all_trades_swap(self.ex["swap"], since, self.con)
+        store.set_meta(self.con, "last_fetch", int(time.time() * 1000))
+        if self._trades_state() != before:
+            self.dirty.add("trades")
+
+    def refresh_fx(self):
+        if fx.Rates().ensure(self.since_ms(), self.ex["spot"]):
+            self.dirty.add("fx")
+
+    def refresh_markets(self):
+        exchange.reload_markets()
+
+    def render(self):
+        """Ausgaben für die geänderten Datensätze; ohne Änderung nichts."""
+        today = pipeline.now_utc().strftime("%Y-%m-%d")
+        if not self.dirty and self.built_day == today:
+            return
+        if self.run is None or self.built_day != today or self.dirty - {"equity"}:
+            # neue Fills/Kurse oder neuer Tag: Lauf neu aufbauen, alle Ausgaben
+            run = pipeline.Run(con=self.con, exchanges=self.ex, fetched=True, mark=self.mark)
+            run.aggregate()
+            if self.eq_now is not None:
+                run.refresh_equity(self.eq_now)
+            # erst nach erfolgreichem Aufbau übernehmen (kein halber Lauf für spätere Equity-Updates)
+            self.run, self.built_day = run, today
+            targets = self.targets
+        else:
+            # nur Equity: Kurve + Kennzahlen am warmen Lauf, keine Trade-Exporte
+            self.run.refresh_equity(self.eq_now)
+            targets = [t for t in self.targets if t != "csv"]
+        m = self.run.manifest
+        m.changed, m.skipped = [], []
+        if "csv" in targets:
+            self.run.write_csv(self.outdir)
+        if "html" in targets:
+            self.run.write_html(self.outdir)
+        if "latest" in targets:
+            self.run.write_latest(self.latest_path)
+        m.save()
+        # erst jetzt: schlägt eine Ausgabe fehl, bleiben die Änderungen für den nächsten Takt vorgemerkt
+        self.dirty.clear()
+        metrics.write(self.outdir)
+        # Lücken vor dem letzten Trades-Job sind veröffentlicht bzw. überholt -> nicht endlos sammeln
+        self.mark = self.run.mark = metrics.trim(self.mark)
+
+    # --- Ablauf --------------------------------------------------------------
+
+    def step(self):
+        """Fällige Jobs der Reihe nach; gibt die Sekunden bis zum nächsten fälligen Job zurück."""
+        for job in self.jobs:
+            if job.due(time.monotonic()):
+                job.run()
+        return max(0.0, min(j.next_run for j in self.jobs) - time.monotonic())
+
+    def status(self):
+        return {"started_at": dt.datetime.fromtimestamp(self.started_at, dt.timezone.utc).isoformat(timespec="seconds"),
+                "uptime_s": round(time.time() - self.started_at, 1),
+                "equity_usdt": self.eq_now, "dirty": sorted(self.dirty),
+                "jobs": {j.name: j.status() for j in self.jobs}}
+
+def serve_status(daemon, host=HOST, port=PORT):
+    """/status (JSON) und /metrics (Prometheus) in einem Hintergrund-Thread."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/status"):
+                body, ctype = json.dumps(daemon.status(), indent=1).encode(), "application/json"
+            elif self.path.startswith("/metrics"):
+                body, ctype = metrics.to_prometheus().encode(), "text/plain; version=0.0.4"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="daemon-status", daemon=True).start()
+    return server
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--targets", default=",".join(pipeline.TARGETS), help="Ausgaben: csv, html, latest")
+    ap.add_argument("--outdir", default=pipeline.OUTDIR)
+    ap.add_argument("--latest", default=pipeline.LATEST_PATH)
+    ap.add_argument("--port", type=int, default=PORT, help="Status-Port (0 = aus)")
+    ap.add_argument("--once", action="store_true", help="jeden Job einmal ausführen, dann beenden")
+    args = ap.parse_args(argv)
+    targets = tuple(t for t in (x.strip() for x in args.targets.split(",")) if t)
+
+    d = Daemon(targets, args.outdir, args.latest)
+    if args.once:
+        for job in d.jobs:
+            job.run()
+        print(json.dumps(d.status(), indent=1))
+        return d
+    server = serve_status(d, port=args.port) if args.port else None
+    if server:
+        print(f"Status: http://{HOST}:{server.server_address[1]}/status")
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    while not stop.is_set():
+        stop.wait(d.step())
+    if server:
+        server.shutdown()
+    return d
+
+if __name__ == "__main__":
+    if not pipeline.API_KEY or not pipeline.API_SECRET:
+        raise SystemExit("MEXC_API_KEY/MEXC_API_SECRET (oder MEXC_KEY/MEXC_SECRET) fehlen.")
+    main()
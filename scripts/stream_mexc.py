@@ -0,0 +1,204 @@
+"""Dauerbetrieb: private MEXC-Fills + Balance per WebSocket statt Cron-Polling.
+
+Fills landen sofort im Trade-Store (gleiche ccxt-Dicts wie fetch_my_trades, also direkt
+für df_from_trades nutzbar); alle STREAM_FLUSH_SEC werden latest.json und die CSVs neu
+geschrieben – nur wenn seitdem etwas passiert ist. Nach jedem (Re-)Connect werden Lücken
+per REST ab dem Store-Cursor (= letzter gesehener Fill) nachgeladen.
+
+    python scripts/stream_mexc.py
+    python bench/fake_ws.py          # offline gegen lokalen Fake-Server
+
+Nur Spot: der Kontrakt-WebSocket braucht ein eigenes Login-Protokoll, Swap-Fills kommen
+weiter über die REST-Läufe.
+"""
+import os, sys, json, time, asyncio, datetime as dt
+import websockets
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import store
+import metrics
+import exchange
+import fetch_async
+import retry
+import equity
+import pricing
+import pipeline
+
+WS_URL     = os.getenv("MEXC_WS_URL", "wss://wbs.mexc.com/ws")
+FLUSH_SEC  = float(os.getenv("STREAM_FLUSH_SEC", "60"))
+OUTDIR     = os.getenv("STREAM_OUTDIR", "data")
+SINCE_DAYS = int(os.getenv("DAYS", "14"))
+ACTIVE_TTL_DAYS = float(os.getenv("ACTIVE_TTL_DAYS", "30"))
+
+CHANNELS = ["spot@private.deals.v3.api", "spot@private.account.v3.api"]
+PING_SEC = 20
+LISTEN_KEY_KEEPALIVE_SEC = 30 * 60
+
+def deal_to_trade(msg, markets_by_id):
+    """Deal-Push ('spot@private.deals.v3.api') -> ccxt-artiges Trade-Dict."""
+    d = msg["d"]
+    mid = msg.get("s")
+    m = markets_by_id.get(mid)
+    if isinstance(m, list):  # ccxt 4: markets_by_id -> Liste von Märkten
+        m = m[0] if m else None
+    price = float(d["p"])
+    amount = float(d["v"])
+    return {
+        "id": str(d.get("t")),
+        "order": d.get("i"),
+        "symbol": m["symbol"] if m else mid,
+        "timestamp": int(d.get("T") or msg.get("t")),
+        "side": "buy" if int(d.get("S", 1)) == 1 else "sell",
+        "takerOrMaker": "maker" if d.get("m") else "taker",
+        "price": price,
+        "amount": amount,
+        "cost": float(d.get("a") or price * amount),
+        "fee": {"cost": float(d.get("n") or 0.0), "currency": d.get("N")},
+        "info": d,
+    }
+
+class Streamer:
+    """WebSocket-Verbindung + Store + periodischer Export."""
+
+    def __init__(self, con, rest, ws_url=WS_URL, listen_key=None, markets_by_id=None,
+                 since_ms=None, outdir=OUTDIR, flush_sec=FLUSH_SEC):
+        self.con = con
+        self.rest = rest                # async ccxt-Instanz (oder Attrappe) für Gap-Fill/Balance
+        self.ws_url = ws_url
+        self.listen_key = listen_key
+        self.markets_by_id = markets_by_id if markets_by_id is not None else rest.markets_by_id
+        self.since_ms = since_ms or int((time.time() - SINCE_DAYS * 86400) * 1000)
+        self.outdir = outdir
+        self.flush_sec = flush_sec
+        self.balances = {}              # Asset -> Gesamtmenge (free + locked)
+        self.prices = {}                # Symbol -> Preis (fetch_tickers beim Gap-Fill)
+        self.rate_eur = None            # einmal holen, nicht bei jedem Flush
+        self.seen_symbols = set()
+        self.dirty = True
+        self.fills = 0
+        self.connects = 0
+
+    # --- Nachrichten ---------------------------------------------------------
+
+    def handle(self, msg):
+        ch = msg.get("c") or ""
+        if ch.startswith("spot@private.deals"):
+            t = deal_to_trade(msg, self.markets_by_id)
+            # kein scanned_until: Cursor = letzter Fill, Gap-Fill startet genau dort
+            self.fills += store.add_trades(self.con, "spot", t["symbol"], [t])
+            self.seen_symbols.add(t["symbol"])
+            self.dirty = True
+        elif ch.startswith("spot@private.account"):
+            d = msg["d"]
+            self.balances[d["a"]] = float(d.get("f") or 0.0) + float(d.get("l") or 0.0)
+            self.dirty = True
+
+    async def gap_fill(self):
+        """Fills seit dem letzten gesehenen Fill je Symbol per REST nachholen (dedupliziert über die ID)."""
+        min_ts = int((time.time() - ACTIVE_TTL_DAYS * 86400) * 1000)
+        symbols = sorted(store.active_symbols(self.con, "spot", min_ts) | self.seen_symbols)
+        with metrics.stage("gap_fill"):
+            if symbols:
+                await fetch_async.fetch_symbols_async(self.rest, "spot", symbols, self.since_ms, self.con)
+            try:
+                bal = await retry.acall(self.rest.fetch_balance, ex=self.rest)
+                self.balances.update({k: float(v or 0.0) for k, v in (bal.get("total") or {}).items()})
+                self.prices = pricing.price_map(await retry.acall(self.rest.fetch_tickers, ex=self.rest))
+            except Exception as e:
+                metrics.add_error(e)
+        self.dirty = True
+
+    # --- Export --------------------------------------------------------------
+
+    def equity_usdt(self):
+        """Gestreamte Spot-Bestände bewertet + Swap-Anteil des letzten Snapshots; None, wenn
+        Kurse fehlen oder ein Asset nicht bewertbar ist (dann gilt der Wert der Pipeline)."""
+        if not self.balances or not self.prices:
+            return None
+        spot, _, unpriced = pricing.value_balance("spot", self.balances, self.prices)
+        if unpriced:
+            return None
+        pos = equity.assets_at(self.con, int(time.time() * 1000))
+        return spot + float(pos.loc[pos["market_type"] == "swap", "value_usdt"].sum())
+
+    def flush(self):
+        """latest.json + CSVs (+ metrics.json) aus dem Store schreiben (Pipeline ohne Fetch)."""
+        os.makedirs(self.outdir, exist_ok=True)
+        with metrics.stage("flush"):
+            r = pipeline.Run(con=self.con, since_ms=self.since_ms, rate_eur=self.rate_eur, fetch=False)
+            out = r.latest()
+            self.rate_eur = r.rate_eur
+            out["status"] = "stream"
+            eq = self.equity_usdt()
+            if eq is not None:
+                out["equity_usdt"] = round(eq, 8)
+                out["equity_eur"] = round(eq * self.rate_eur, 8)
+            pipeline.write_json(os.path.join(self.outdir, "latest.json"), out)
+            r.df.to_csv(os.path.join(self.outdir, "trades_all.csv"), index=False)
+            r.df_pnl.to_csv(os.path.join(self.outdir, "daily_pnl.csv"), index=False)
+        metrics.write(self.outdir)
+        self.dirty = False
+
+    async def flusher(self):
+        while True:
+            await asyncio.sleep(self.flush_sec)
+            if self.dirty:
+                self.flush()
+
+    # --- Verbindung ----------------------------------------------------------
+
+    async def _ping(self, ws):
+        while True:
+            await asyncio.sleep(PING_SEC)
+            await ws.send(json.dumps({"method": "PING"}))
+
+    async def connect_once(self):
+        url = self.ws_url + (f"?listenKey={self.listen_key}" if self.listen_key else "")
+        async with websockets.connect(url, ping_interval=None) as ws:
+            self.connects += 1
+            await ws.send(json.dumps({"method": "SUBSCRIPTION", "params": CHANNELS}))
+            # erst abonnieren, dann Lücke füllen -> kein Fill fällt dazwischen durch
+            await self.gap_fill()
+            pinger = asyncio.create_task(self._ping(ws))
+            try:
+                async for raw in ws:
+                    msg = json.loads(raw)
+                    if "c" in msg:
+                        self.handle(msg)
+            finally:
+                pinger.cancel()
+
+    async def run(self, max_backoff=60):
+        backoff = 1
+        while True:
+            started = time.monotonic()
+            try:
+                await self.connect_once()
+            except (OSError, asyncio.TimeoutError, websockets.WebSocketException) as e:
+                print("WebSocket getrennt:", type(e).__name__, e)
+            # stabile Verbindung -> Backoff zurücksetzen
+            backoff = 1 if time.monotonic() - started > 60 else min(backoff * 2, max_backoff)
+            await asyncio.sleep(backoff)
+
+async def keep_listen_key(rest, key):
+    while True:
+        await asyncio.sleep(LISTEN_KEY_KEEPALIVE_SEC)
+        try:
+            await rest.spotPrivatePutUserDataStream({"listenKey": key})
+        except Exception as e:
+            print("listenKey-Verlängerung fehlgeschlagen:", type(e).__name__)
+
+async def main_async():
+    ex = exchange.get_exchange("spot", pipeline.API_KEY, pipeline.API_SECRET)
+    rest = fetch_async.make_async_ex(ex)
+    try:
+        key = (await rest.spotPrivatePostUserDataStream())["listenKey"]
+        s = Streamer(store.open_store(), rest, listen_key=key)
+        await asyncio.gather(s.run(), s.flusher(), keep_listen_key(rest, key))
+    finally:
+        await rest.close()
+
+if __name__ == "__main__":
+    if not pipeline.API_KEY or not pipeline.API_SECRET:
+        raise SystemExit("MEXC_API_KEY/MEXC_API_SECRET (oder MEXC_KEY/MEXC_SECRET) fehlen.")
+    asyncio.run(main_async())
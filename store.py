@@ -0,0 +1,200 @@
+import os, json, sqlite3
+
+# ========= Lokaler Trade-Store =========
+# Append-only SQLite-Datei: Trades dedupliziert über (Markt-Typ, Symbol, Trade-ID),
+# dazu ein Cursor (High-Water-Mark) je Markt-Typ/Symbol. Jeder Lauf holt nur noch
+# Fills ab dem Cursor; PnL/Equity/CSVs werden danach aus dem Store gerechnet.
+STORE_PATH = os.getenv("STORE_PATH", "data/trades.sqlite")
+# Sicherheitsabstand beim Cursor für "leere" Symbole (Uhrzeit-Drift, späte Fills)
+OVERLAP_MS = int(os.getenv("STORE_OVERLAP_MS", "60000"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    market_type TEXT    NOT NULL,
+    symbol      TEXT    NOT NULL,
+    id          TEXT    NOT NULL,
+    timestamp   INTEGER NOT NULL,
+    raw         TEXT    NOT NULL,
+    PRIMARY KEY (market_type, symbol, id)
+);
+CREATE INDEX IF NOT EXISTS trades_ts ON trades (timestamp);
+CREATE TABLE IF NOT EXISTS cursors (
+    market_type TEXT    NOT NULL,
+    symbol      TEXT    NOT NULL,
+    last_ts     INTEGER NOT NULL,
+    PRIMARY KEY (market_type, symbol)
+);
+CREATE TABLE IF NOT EXISTS active_symbols (
+    market_type TEXT    NOT NULL,
+    symbol      TEXT    NOT NULL,
+    last_seen   INTEGER NOT NULL,
+    PRIMARY KEY (market_type, symbol)
+);
+CREATE TABLE IF NOT EXISTS position_state (
+    symbol    TEXT    PRIMARY KEY,
+    mode      TEXT    NOT NULL,
+    qty       BLOB    NOT NULL,
+    price     BLOB    NOT NULL,
+    last_ts   INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS realized_pnl (
+    symbol      TEXT    NOT NULL,
+    id          TEXT    NOT NULL,
+    timestamp   INTEGER NOT NULL,
+    date        TEXT    NOT NULL,
+    copy_trader TEXT,
+    pnl_usdt    REAL    NOT NULL,
+    basis_usdt  REAL    NOT NULL,
+    PRIMARY KEY (symbol, id)
+);
+CREATE INDEX IF NOT EXISTS realized_ts ON realized_pnl (timestamp);
+CREATE INDEX IF NOT EXISTS realized_pnl_id ON realized_pnl (id);
+CREATE TABLE IF NOT EXISTS trader_stats (
+    trader        TEXT    PRIMARY KEY,
+    fills         INTEGER NOT NULL,
+    volume_usdt   REAL    NOT NULL,
+    fees_usdt     REAL    NOT NULL,
+    realized_usdt REAL    NOT NULL,
+    wins          INTEGER NOT NULL,
+    closes        INTEGER NOT NULL,
+    cum_pnl       REAL    NOT NULL,
+    peak_pnl      REAL    NOT NULL,
+    max_dd_usdt   REAL    NOT NULL,
+    first_ts      INTEGER NOT NULL,
+    last_ts       INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    ts          INTEGER PRIMARY KEY,
+    equity_usdt REAL    NOT NULL,
+    unpriced    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshot_assets (
+    ts          INTEGER NOT NULL,
+    market_type TEXT    NOT NULL,
+    asset       TEXT    NOT NULL,
+    qty         REAL    NOT NULL,
+    price_usdt  REAL,
+    value_usdt  REAL    NOT NULL,
+    PRIMARY KEY (ts, market_type, asset)
+);
+CREATE TABLE IF NOT EXISTS funding (
+    symbol      TEXT    NOT NULL,
+    id          TEXT    NOT NULL,
+    timestamp   INTEGER NOT NULL,
+    date        TEXT    NOT NULL,
+    amount_usdt REAL    NOT NULL,
+    PRIMARY KEY (symbol, id)
+);
+CREATE INDEX IF NOT EXISTS funding_ts ON funding (timestamp);
+CREATE TABLE IF NOT EXISTS swap_unrealized (
+    ts              INTEGER PRIMARY KEY,
+    unrealized_usdt REAL    NOT NULL,
+    positions       TEXT    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def open_store(path=None):
+    """Öffnet (bzw. erzeugt) den Store und legt das Schema an."""
+    path = path or STORE_PATH
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    con = sqlite3.connect(path)
+    con.executescript(SCHEMA)
+    return con
+
+def trade_key(t):
+    """Eindeutiger Schlüssel je Fill – Trade-ID, sonst Ersatzschlüssel aus Order/Zeit/Menge."""
+    if t.get("id"):
+        return str(t["id"])
+    return f'{t.get("timestamp")}:{t.get("order")}:{t.get("side")}:{t.get("price")}:{t.get("amount")}'
+
+def get_cursor(con, market_type, symbol, default=None):
+    """Letzter gesicherter Zeitstempel (ms) für Markt/Symbol – oder 'default'."""
+    row = con.execute(
+        "SELECT last_ts FROM cursors WHERE market_type=? AND symbol=?",
+        (market_type, symbol),
+    ).fetchone()
+    return row[0] if row else default
+
+def set_cursor(con, market_type, symbol, ts):
+    """Cursor nur vorwärts bewegen."""
+    con.execute(
+        "INSERT INTO cursors (market_type, symbol, last_ts) VALUES (?, ?, ?) "
+        "ON CONFLICT (market_type, symbol) DO UPDATE SET last_ts=MAX(last_ts, excluded.last_ts)",
+        (market_type, symbol, int(ts)),
+    )
+
+def add_trades(con, market_type, symbol, trades, scanned_until=None):
+    """Schreibt neue Fills (Duplikate werden ignoriert) und rückt den Cursor vor.
+
+    'scanned_until' (ms) = Zeitpunkt, bis zu dem das Symbol vollständig abgefragt wurde;
+    damit wandert der Cursor auch bei Symbolen ohne neue Fills weiter.
+    Gibt die Anzahl tatsächlich neu gespeicherter Trades zurück.
+    """
+    rows = [
+        (market_type, t.get("symbol") or symbol, trade_key(t), int(t.get("timestamp") or 0), json.dumps(t))
+        for t in trades
+    ]
+    with con:
+        cur = con.executemany("INSERT OR IGNORE INTO trades VALUES (?, ?, ?, ?, ?)", rows)
+        # Cursor = letzter Fill (inklusive – gleiche Millisekunde wird beim nächsten Lauf
+        # erneut geholt und über die ID dedupliziert)
+        last = max((r[3] for r in rows), default=None)
+        if scanned_until is not None:
+            last = max(last or 0, int(scanned_until) - OVERLAP_MS)
+        if last is not None:
+            set_cursor(con, market_type, symbol, last)
+        if rows:
+            touch_active(con, market_type, {r[1] for r in rows}, max(r[3] for r in rows))
+    return max(cur.rowcount, 0)
+
+def load_trades(con, since_ms=None, market_type=None):
+    """Alle gespeicherten Trades (ccxt-Dicts) ab 'since_ms', nach Zeit sortiert."""
+    sql = "SELECT raw FROM trades WHERE timestamp >= ?"
+    args = [int(since_ms or 0)]
+    if market_type:
+        sql += " AND market_type = ?"
+        args.append(market_type)
+    sql += " ORDER BY timestamp"
+    return [json.loads(r[0]) for r in con.execute(sql, args)]
+
+def iter_trades(con, since_ms=None, newest_first=False, chunk=5000, limit=None):
+    """Wie load_trades, aber blockweise (Listen mit höchstens 'chunk' Trades) über einen Cursor."""
+    sql = f"SELECT raw FROM trades WHERE timestamp >= ? ORDER BY timestamp {'DESC' if newest_first else 'ASC'}"
+    args = [int(since_ms or 0)]
+    if limit is not None:
+        sql += " LIMIT ?"
+        args.append(int(limit))
+    cur = con.execute(sql, args)
+    while True:
+        rows = cur.fetchmany(chunk)
+        if not rows:
+            return
+        yield [json.loads(r[0]) for r in rows]
+
+def touch_active(con, market_type, symbols, ts):
+    """Symbole im Aktiv-Index als 'gesehen' markieren (Zeitpunkt in ms)."""
+    con.executemany(
+        "INSERT INTO active_symbols (market_type, symbol, last_seen) VALUES (?, ?, ?) "
+        "ON CONFLICT (market_type, symbol) DO UPDATE SET last_seen=MAX(last_seen, excluded.last_seen)",
+        [(market_type, s, int(ts)) for s in symbols],
+    )
+
+def active_symbols(con, market_type, min_ts):
+    """Aktiv-Index lesen; Einträge älter als 'min_ts' werden dabei gelöscht."""
+    with con:
+        con.execute("DELETE FROM active_symbols WHERE market_type=? AND last_seen < ?", (market_type, int(min_ts)))
+    rows = con.execute("SELECT symbol FROM active_symbols WHERE market_type=?", (market_type,))
+    return {r[0] for r in rows}
+
+def get_meta(con, key, default=None):
+    row = con.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+    return row[0] if row else default
+
+def set_meta(con, key, value):
+    with con:
+        con.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
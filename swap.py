@@ -0,0 +1,168 @@
+import os, json, time
+import numpy as np
+import pandas as pd
+
+import store
+import retry
+import metrics
+import discovery
+
+# ========= Swap (USDT-M Perps): Bulk-Ingestion =========
+# Statt jeden linearen Kontrakt per fetch_my_trades abzufragen, bestimmen Bulk-Endpunkte,
+# welche Kontrakte in diesem Lauf überhaupt neue Fills haben können:
+#   fetch_positions          offene Positionen (ein Call) – dazu ihr unrealisierter PnL
+#   fetch_positions_history  seit dem Cursor geschlossene Positionen
+#   fetch_funding_history    Funding-Zahlungen seit dem Cursor (paginiert, Tabelle funding)
+# Nur diese Kontrakte (+ offene Orders, Aktiv-Index) werden paginiert; ohne Positions-Historie
+# gilt wie bisher discovery.discover mit periodischem Voll-Durchlauf.
+# Funding fließt in den Tages-PnL, der unrealisierte PnL als Spalte in Tages-PnL und Equity-Kurve.
+FUNDING_PAGE = 100
+FUNDING_MAX_PAGES = int(os.getenv("FUNDING_MAX_PAGES", "50"))
+HISTORY_PAGE = 100
+HISTORY_MAX_PAGES = int(os.getenv("POSITIONS_HISTORY_MAX_PAGES", "50"))
+HISTORY_OVERLAP_MS = 3600000        # Positions-Historie überlappend abfragen (nur Symbolmenge)
+
+def _call(ex, name, *args):
+    """Bulk-Endpunkt mit Retries; nicht vorhanden oder ausgefallen -> None (Auth-Fehler abbrechen)."""
+    fn = getattr(ex, name, None)
+    if fn is None:
+        return None
+    try:
+        return retry.call(fn, *args, ex=ex)
+    except Exception as e:
+        if retry.classify(e) == "fatal":
+            raise
+        metrics.add_error(e)
+        metrics.add_incomplete("swap", name, type(e).__name__)
+        return None
+
+def record_positions(con, positions, ts_ms=None):
+    """Offene Positionen + Summe des unrealisierten PnL als Snapshot (Tabelle swap_unrealized)."""
+    ts_ms = int(ts_ms or time.time() * 1000)
+    rows = [{"symbol": p.get("symbol"), "side": p.get("side"), "contracts": float(p.get("contracts") or 0.0),
+             "entry": p.get("entryPrice"), "mark": p.get("markPrice"),
+             "upnl": float(p.get("unrealizedPnl") or 0.0)}
+            for p in positions if float(p.get("contracts") or 0.0) != 0]
+    with con:
+        con.execute("INSERT OR REPLACE INTO swap_unrealized VALUES (?, ?, ?)",
+                    (ts_ms, sum(r["upnl"] for r in rows), json.dumps(rows, separators=(",", ":"))))
+    return rows
+
+def _history_symbols(ex, con, since_ms, now_ms):
+    """Kontrakte mit seit dem Cursor geschlossenen Positionen; None, wenn die Quelle fehlt.
+
+    MEXC ignoriert 'since' und liefert seitenweise (page_num/page_size), neueste zuerst –
+    Ende bei einer kurzen Seite oder sobald Positionen vor dem Cursor auftauchen.
+    """
+    start = max(int(store.get_meta(con, "swap_history_cursor", 0)), since_ms)
+    symbols = set()
+    for page in range(1, HISTORY_MAX_PAGES + 1):
+        got = _call(ex, "fetch_positions_history", None, None, HISTORY_PAGE,
+                    {"page_num": page, "page_size": HISTORY_PAGE})
+        if got is None:
+            return None
+        new = [p for p in got if int(p.get("timestamp") or p.get("lastUpdateTimestamp") or 0) >= start]
+        symbols |= {p.get("symbol") for p in new if p.get("symbol")}
+        if len(got) < HISTORY_PAGE or len(new) < len(got):
+            break
+    else:
+        metrics.add_truncated("swap", "positions_history", start, now_ms, "max_pages")
+        return None     # unvollständig -> Voll-Erkennung statt verpasster Kontrakte
+    store.set_meta(con, "swap_history_cursor", now_ms - HISTORY_OVERLAP_MS)
+    return symbols
+
+def _funding_symbol(ex, f):
+    """Einheitliches Symbol einer Funding-Zahlung – ohne Symbol-Filter liefert ccxt 'symbol': None."""
+    if f.get("symbol"):
+        return f["symbol"]
+    mid = (f.get("info") or {}).get("symbol")
+    return ex.safe_market(mid, None, "_", "swap")["symbol"] if mid else ""
+
+def fetch_funding(ex, con, since_ms, now_ms=None):
+    """Funding seit dem Cursor in den Store (dedupliziert über die ID); gibt die Symbole neuer Zahlungen zurück.
+
+    MEXC liefert seitenweise (page_num/page_size), neueste zuerst – Ende bei einer kurzen
+    Seite oder sobald Einträge vor dem Cursor auftauchen.
+    """
+    now_ms = now_ms or int(time.time() * 1000)
+    start = max(int(store.get_meta(con, "funding_cursor", 0)), since_ms)
+    rows = []
+    for page in range(1, FUNDING_MAX_PAGES + 1):
+        got = _call(ex, "fetch_funding_history", None, start, FUNDING_PAGE,
+                    {"page_num": page, "page_size": FUNDING_PAGE})
+        if got is None:
+            return None
+        new = [f for f in got if int(f.get("timestamp") or 0) >= start]
+        rows += new
+        if len(got) < FUNDING_PAGE or len(new) < len(got):
+            break
+    else:
+        metrics.add_truncated("swap", "funding", start, now_ms, "max_pages")
+    out = []
+    for f in rows:
+        sym = _funding_symbol(ex, f)
+        out.append((sym, str(f.get("id") or f"{sym}:{f['timestamp']}"), int(f["timestamp"]),
+                    time.strftime("%Y-%m-%d", time.gmtime(int(f["timestamp"]) / 1000)), float(f.get("amount") or 0.0)))
+    with con:
+        con.executemany("INSERT OR IGNORE INTO funding VALUES (?, ?, ?, ?, ?)", out)
+    if out:
+        store.set_meta(con, "funding_cursor", max(r[2] for r in out))
+    return {r[0] for r in out if r[0]}
+
+def ingest(ex, con, candidates, since_ms, now_ms=None):
+    """Swap-Stufe: Positionen, Funding und Positions-Historie holen; gibt die zu paginierenden Kontrakte zurück."""
+    now_ms = now_ms or int(time.time() * 1000)
+    positions = _call(ex, "fetch_positions")
+    if positions is not None:
+        record_positions(con, positions, now_ms)
+    funded = fetch_funding(ex, con, since_ms, now_ms)
+    closed = _history_symbols(ex, con, since_ms, now_ms)
+    if positions is None or closed is None:
+        # Bulk-Quellen unvollständig -> bisherige Erkennung inkl. Voll-Durchlauf
+        return discovery.discover(ex, con, "swap", candidates, now_ms)
+    known = {p.get("symbol") for p in positions if float(p.get("contracts") or 0.0) != 0}
+    known |= closed | (funded or set())
+    return discovery.discover(ex, con, "swap", candidates, now_ms, known=known)
+
+# ---- Auswertung ------------------------------------------------------------------
+
+def funding_daily(con, since_ms=None):
+    """Funding je Tag -> DataFrame [date, funding_usdt] (positiv = erhalten)."""
+    return pd.read_sql_query("SELECT date, SUM(amount_usdt) AS funding_usdt FROM funding WHERE timestamp >= ? "
+                             "GROUP BY date ORDER BY date", con, params=(int(since_ms or 0),))
+
+def unrealized_series(con, since_ms=None):
+    """Unrealisierter PnL je Snapshot -> DataFrame [ts, unrealized_usdt]."""
+    return pd.read_sql_query("SELECT ts, unrealized_usdt FROM swap_unrealized WHERE ts >= ? ORDER BY ts",
+                             con, params=(int(since_ms or 0),))
+
+def unrealized_now(con):
+    """Letzter Positions-Snapshot als (Summe, Positionen) – ohne Snapshot (0.0, [])."""
+    row = con.execute("SELECT unrealized_usdt, positions FROM swap_unrealized ORDER BY ts DESC LIMIT 1").fetchone()
+    return (float(row[0]), json.loads(row[1])) if row else (0.0, [])
+
+def add_daily(df_pnl, con, since_ms=None):
+    """Tages-PnL um Funding (im pnl_usdt enthalten) und unrealisierten PnL am Tagesende ergänzen."""
+    fund = funding_daily(con, since_ms)
+    up = unrealized_series(con, since_ms)
+    up["date"] = pd.to_datetime(up["ts"], unit="ms", utc=True).dt.strftime("%Y-%m-%d")
+    up = up.groupby("date", as_index=False)["unrealized_usdt"].last()
+    out = df_pnl.merge(fund, on="date", how="outer").merge(up, on="date", how="outer").sort_values("date")
+    out["funding_usdt"] = out["funding_usdt"].fillna(0.0)
+    out["unrealized_usdt"] = out["unrealized_usdt"].ffill().fillna(0.0)
+    out["pnl_usdt"] = out["pnl_usdt"].fillna(0.0) + out["funding_usdt"]
+    return out.reset_index(drop=True)
+
+def add_unrealized(df_eq, con, since_ms=None):
+    """Equity-Kurve um den unrealisierten PnL zum jeweiligen Zeitpunkt (as-of) ergänzen."""
+    up = unrealized_series(con, since_ms)
+    if df_eq.empty or up.empty:
+        return df_eq.assign(unrealized_usdt=0.0)
+    dates = df_eq["date"].astype(str)
+    when = pd.to_datetime(dates, utc=True).to_numpy(dtype="datetime64[ms]").astype(np.int64)
+    # Punkte gelten bis Minuten- bzw. Tagesende (Snapshots: 'YYYY-MM-DD HH:MM', Rückfall: 'YYYY-MM-DD')
+    when = when + np.where(dates.str.len().to_numpy() > 10, 59999, 86399999)
+    ts = up["ts"].to_numpy(dtype=np.int64)
+    i = np.searchsorted(ts, when, side="right") - 1
+    vals = up["unrealized_usdt"].to_numpy(dtype=np.float64)
+    return df_eq.assign(unrealized_usdt=np.where(i >= 0, vals[np.maximum(i, 0)], 0.0))
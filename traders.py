@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+import pnl
+
+# ========= Copy-Trader-Index =========
+# Laufende Kennzahlen je Trader im Store (Tabelle trader_stats): Fills, Volumen, Fees,
+# realisierter PnL, Gewinn-/Verlust-Schließungen und Drawdown des kumulierten PnL.
+# positions.update reicht jeden neu realisierten Fill genau einmal herein -> Aufwand
+# proportional zu den neuen Fills, nicht zur Historie. Copytrades ohne Trader-ID
+# landen unter '' (auf der Seite "(unbekannt)").
+META_KEY = "trader_index"      # gesetzt, sobald der Index aus der vollen Historie aufgebaut ist
+COLUMNS = ["trader", "fills", "volume_usdt", "fees_usdt", "realized_usdt", "wins", "closes",
+           "cum_pnl", "peak_pnl", "max_dd_usdt", "first_ts", "last_ts"]
+
+def _copy_rows(df):
+    if df.empty:
+        return df
+    mask = df["is_copy"].to_numpy(dtype=bool) | df["copy_trader"].notna().to_numpy()
+    return df[mask]
+
+def update(con, df):
+    """Neu realisierte Fills (positions.update: pnl_usdt, basis_usdt) in den Index einrechnen.
+
+    Drawdown = größter Rückgang des kumulierten realisierten PnL vom bisherigen Hoch;
+    Fills werden in Verarbeitungsreihenfolge (je Lauf nach Zeit) fortgeschrieben.
+    Läuft innerhalb der Transaktion des Aufrufers.
+    """
+    rows = _copy_rows(df)
+    if rows.empty:
+        return 0
+    rows = rows.assign(trader=rows["copy_trader"].astype(object).where(rows["copy_trader"].notna(), ""),
+                       fee_usdt=pnl.fees(rows)).sort_values("timestamp", kind="stable")
+    keys = rows["trader"].unique().tolist()
+    old = {r[0]: list(r) for r in con.execute(
+        f"SELECT {', '.join(COLUMNS)} FROM trader_stats WHERE trader IN ({','.join('?' * len(keys))})", keys)}
+    out = []
+    for trader, g in rows.groupby("trader", sort=False):
+        p = g["pnl_usdt"].to_numpy(dtype=np.float64)
+        closing = g["basis_usdt"].to_numpy(dtype=np.float64) > 0
+        ts = g["timestamp"].to_numpy(dtype=np.int64)
+        (_, fills, vol, fees, real, wins, closes, cum0, peak0, dd0, first, last) = old.get(
+            trader, [trader, 0, 0.0, 0.0, 0.0, 0, 0, 0.0, 0.0, 0.0, int(ts[0]), int(ts[-1])])
+        cum = cum0 + np.cumsum(p)
+        peak = np.maximum(peak0, np.maximum.accumulate(cum))
+        out.append((trader, fills + len(g), vol + float(np.abs(g["cost"].to_numpy(dtype=np.float64)).sum()),
+                    fees + float(g["fee_usdt"].sum()), real + float(p.sum()),
+                    wins + int((closing & (p > 0)).sum()), closes + int(closing.sum()),
+                    float(cum[-1]), float(peak[-1]), max(dd0, float((peak - cum).max())),
+                    min(first, int(ts[0])), max(last, int(ts[-1]))))
+    con.executemany(f"INSERT OR REPLACE INTO trader_stats VALUES ({','.join('?' * len(COLUMNS))})", out)
+    return len(out)
+
+def load(con):
+    """Index als DataFrame (nach realisiertem PnL absteigend) inkl. Win-Rate."""
+    df = pd.read_sql_query(f"SELECT {', '.join(COLUMNS)} FROM trader_stats ORDER BY realized_usdt DESC", con)
+    df["win_rate"] = df["wins"] / df["closes"].replace(0, np.nan)
+    return df
+
+def compact(df):
+    """Index -> parallele Arrays für die Seite/traders.json (Trader '' -> null)."""
+    r4 = lambda c: np.round(df[c].to_numpy(dtype=np.float64), 4).tolist()
+    return {"key": [t or None for t in df["trader"].tolist()],
+            "n": df["fills"].astype(int).tolist(), "volume": r4("volume_usdt"), "fees": r4("fees_usdt"),
+            "pnl": r4("realized_usdt"), "wins": df["wins"].astype(int).tolist(),
+            "closes": df["closes"].astype(int).tolist(), "max_dd": r4("max_dd_usdt")}
+
+def merge(parts):
+    """Indizes mehrerer Konten (compact) zusammenführen; Drawdown = größter Einzelwert."""
+    acc = {}
+    for c in parts:
+        for i, k in enumerate(c["key"]):
+            row = acc.setdefault(k, {"n": 0, "volume": 0.0, "fees": 0.0, "pnl": 0.0, "wins": 0, "closes": 0,
+                                     "max_dd": 0.0})
+            for f in ("n", "volume", "fees", "pnl", "wins", "closes"):
+                row[f] += c[f][i]
+            row["max_dd"] = max(row["max_dd"], c["max_dd"][i])
+    keys = sorted(acc, key=lambda k: -acc[k]["pnl"])
+    out = {"key": keys}
+    for f in ("n", "volume", "fees", "pnl", "wins", "closes", "max_dd"):
+        out[f] = [round(acc[k][f], 4) if isinstance(acc[k][f], float) else acc[k][f] for k in keys]
+    return out